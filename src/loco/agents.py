@@ -1,17 +1,59 @@
 """Subagents system for loco - isolated AI assistants for complex tasks."""
 
+import logging
 import os
-import re
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 from loco.config import Config, get_config_dir
+from loco.discovery import RediscoverMixin
 from loco.telemetry import track_agent, OperationType, track_operation
 
+logger = logging.getLogger(__name__)
+
+
+def _load_frontmatter(text: str) -> dict[str, Any]:
+    """Parse YAML frontmatter, returning an empty dict if it is invalid.
+
+    PyYAML is imported on first use, since most sessions have no files with
+    frontmatter to parse. The libyaml C loader is used when PyYAML was built
+    with it.
+    """
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        return yaml.load(text, Loader=loader) or {}
+    except yaml.YAMLError:
+        return {}
+
+
+def _split_frontmatter(content: str) -> tuple[str | None, str]:
+    """Split a markdown file into (frontmatter, body).
+
+    The frontmatter is the block between an opening ``---`` line and the next
+    ``---`` line; it is None (and the body is the whole file) if there is no
+    such block. Uses plain string searches rather than a DOTALL regex.
+    """
+    if not content.startswith("---"):
+        return None, content
+
+    start = content.find("\n")
+    if start == -1 or content[3:start].strip():
+        return None, content
+
+    end = content.find("\n---", start + 1)
+    while end != -1:
+        line_end = content.find("\n", end + 4)
+        if line_end == -1:
+            break
+        if not content[end + 4:line_end].strip():
+            return content[start + 1:end], content[line_end + 1:]
+        end = content.find("\n---", end + 1)
+
+    return None, content
+
 
 @dataclass
 class Agent:
@@ -41,11 +83,17 @@ class Agent:
 
 
 @dataclass
-class AgentRegistry:
+class AgentRegistry(RediscoverMixin):
     """Registry for discovering and managing agents."""
 
     agents: dict[str, Agent] = field(default_factory=dict)
     _discovered: bool = False
+    _project_dir: Path | None = None
+    _search_dirs: list[Path] = field(default_factory=list)
+    _dirs_key: tuple[int, ...] | None = None
+    _all_cache: list[Agent] | None = None
+    # Parsed agents per file, keyed on the file's (mtime_ns, size) when parsed
+    _file_cache: dict[Path, tuple[int, int, Agent | None]] = field(default_factory=dict)
 
     def discover(self, project_dir: Path | None = None) -> None:
         """Discover agents from all locations.
@@ -75,21 +123,36 @@ class AgentRegistry:
         loco_agents_dir = search_dir / ".loco" / "agents"
         self._load_agents_from_dir(loco_agents_dir)
 
+        self._project_dir = search_dir
+        self._search_dirs = [user_agents_dir, claude_agents_dir, loco_agents_dir]
+        self._dirs_key = self._get_dirs_key()
         self._discovered = True
 
     def _load_agents_from_dir(self, agents_dir: Path) -> None:
         """Load all agents from a directory."""
+        self._all_cache = None
         if not agents_dir.exists():
             return
 
         # Agents are markdown files: agents/agent-name.md
         for agent_file in agents_dir.glob("*.md"):
             try:
-                agent = self._parse_agent_file(agent_file)
+                agent = self._load_agent_file(agent_file)
                 if agent:
                     self.agents[agent.name] = agent
             except Exception as e:
-                print(f"Warning: Failed to load agent from {agent_file}: {e}")
+                logger.warning("Failed to load agent from %s: %s", agent_file, e)
+
+    def _load_agent_file(self, path: Path) -> Agent | None:
+        """Load an agent file, reusing the agent parsed last time if the file is unchanged."""
+        st = os.stat(path)
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        agent = self._parse_agent_file(path)
+        self._file_cache[path] = (st.st_mtime_ns, st.st_size, agent)
+        return agent
 
     def _parse_agent_file(self, path: Path) -> Agent | None:
         """Parse an agent markdown file into an Agent object."""
@@ -97,16 +160,10 @@ class AgentRegistry:
 
         # Parse YAML frontmatter
         frontmatter: dict[str, Any] = {}
-        body = content
+        frontmatter_text, body = _split_frontmatter(content)
 
-        if content.startswith("---"):
-            match = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)$", content, re.DOTALL)
-            if match:
-                try:
-                    frontmatter = yaml.safe_load(match.group(1)) or {}
-                except yaml.YAMLError:
-                    frontmatter = {}
-                body = match.group(2)
+        if frontmatter_text is not None:
+            frontmatter = _load_frontmatter(frontmatter_text)
 
         # Extract fields
         name = frontmatter.get("name", path.stem)
@@ -141,15 +198,15 @@ class AgentRegistry:
 
     def get(self, name: str) -> Agent | None:
         """Get an agent by name."""
-        if not self._discovered:
-            self.discover()
+        self._ensure_discovered()
         return self.agents.get(name)
 
     def get_all(self) -> list[Agent]:
         """Get all discovered agents."""
-        if not self._discovered:
-            self.discover()
-        return list(self.agents.values())
+        self._ensure_discovered()
+        if self._all_cache is None:
+            self._all_cache = list(self.agents.values())
+        return self._all_cache
 
     def match_agent(self, task_description: str) -> Agent | None:
         """Find an agent that matches the task description.
@@ -157,8 +214,7 @@ class AgentRegistry:
         Uses simple keyword matching. For better results,
         you could use embeddings or LLM-based matching.
         """
-        if not self._discovered:
-            self.discover()
+        self._ensure_discovered()
 
         task_lower = task_description.lower()
         best_match: tuple[int, Agent | None] = (0, None)
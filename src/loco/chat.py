@@ -22,6 +22,10 @@ RETRY_DELAY = 1.0  # seconds
 RETRY_BACKOFF = 2.0  # multiplier for exponential backoff
 
 
+# Shared compact encoder for serializing tool calls in token estimates and summaries
+_TOOL_CALLS_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
 class APIError(Exception):
     """Raised when API call fails after retries."""
     pass
@@ -40,6 +44,11 @@ class Message:
     tool_call_id: str | None = None
     name: str | None = None
 
+    def tool_calls_json(self) -> str:
+        """Get the tool calls serialized as compact JSON."""
+        # Not cached: tool_calls is a plain list that callers may change
+        return _TOOL_CALLS_ENCODER.encode(self.tool_calls)
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to LiteLLM message format."""
         msg: dict[str, Any] = {"role": self.role}
@@ -55,6 +64,17 @@ class Message:
 
         return msg
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Message":
+        """Create from a dictionary produced by to_dict()."""
+        return cls(
+            role=data["role"],
+            content=data.get("content"),
+            tool_calls=data.get("tool_calls"),
+            tool_call_id=data.get("tool_call_id"),
+            name=data.get("name"),
+        )
+
 
 @dataclass
 class ToolCall:
@@ -73,13 +93,20 @@ class Conversation:
     model: str = ""
     config: Config | None = None
     usage: Any = None  # SessionUsage from loco.usage
+    # Token estimate for the system message it was computed from
+    _system_tokens: tuple[Message | None, int] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def add_system_message(self, content: str) -> None:
         """Add or update the system message."""
-        # Remove existing system message if present
-        self.messages = [m for m in self.messages if m.role != "system"]
-        # Add new system message at the beginning
-        self.messages.insert(0, Message(role="system", content=content))
+        system_msg = Message(role="system", content=content)
+        # The system message always lives at index 0: replace it or add it there
+        if self.system_message is not None:
+            self.messages[0] = system_msg
+        else:
+            self.messages.insert(0, system_msg)
+        self._system_tokens = (system_msg, len(content) // 4 + 15)
 
     def add_user_message(self, content: str) -> None:
         """Add a user message."""
@@ -106,16 +133,49 @@ class Conversation:
             name=name,
         ))
 
+    @property
+    def system_message(self) -> Message | None:
+        """The system message, if any.
+
+        add_system_message keeps the system message at index 0, so this
+        doesn't need to scan the history.
+        """
+        if self.messages and self.messages[0].role == "system":
+            return self.messages[0]
+        return None
+
+    @property
+    def non_system_count(self) -> int:
+        """Number of non-system messages in the conversation."""
+        if self.system_message is not None:
+            return len(self.messages) - 1
+        return len(self.messages)
+
+    @property
+    def system_tokens(self) -> int:
+        """Estimated tokens for the system message, including format overhead.
+
+        Cached per system message, so it is only recomputed after the system
+        prompt is replaced.
+        """
+        system_msg = self.system_message
+        if self._system_tokens is None or self._system_tokens[0] is not system_msg:
+            content = system_msg.content if system_msg else None
+            self._system_tokens = (system_msg, (len(content) // 4 if content else 0) + 15)
+        return self._system_tokens[1]
+
     def get_messages(self) -> list[dict[str, Any]]:
         """Get messages in LiteLLM format."""
         return [m.to_dict() for m in self.messages]
 
     def clear(self) -> None:
         """Clear conversation history, keeping system message."""
-        system_msg = next((m for m in self.messages if m.role == "system"), None)
-        self.messages = []
-        if system_msg:
-            self.messages.append(system_msg)
+        self.truncate(0)
+
+    def truncate(self, message_index: int) -> None:
+        """Drop messages from message_index onward, keeping the system message."""
+        keep = 1 if self.system_message is not None else 0
+        del self.messages[max(message_index, keep):]
 
 
 def get_default_system_prompt(cwd: str, commands_section: str = "") -> str:
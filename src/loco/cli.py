@@ -1,32 +1,59 @@
 """CLI entry point for loco."""
 
+import asyncio
+import codecs
+import heapq
+import itertools
+import json
 import os
+import re
+import selectors
 import sys
 import subprocess
+from datetime import datetime
 from pathlib import Path
+from typing import Callable
 
 import click
-from rich.console import Console as RichConsole
+from pydantic import ValidationError
+from rich.console import Console as RichConsole, Group
+from rich.markdown import Markdown
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
 
 from loco import __version__
-from loco.chat import Conversation, ToolCall, chat_turn, get_default_system_prompt
+from loco.chat import (
+    Conversation,
+    Message,
+    ToolCall,
+    chat_turn,
+    get_default_system_prompt,
+    stream_response,
+)
 from loco.config import (
     Config,
+    MCPServerConfig,
     get_config_path,
+    mcp_server_config_dict,
     load_config,
     resolve_model,
     save_config,
 )
-from loco.tools import tool_registry
-from loco.ui.console import get_console, Console
-from loco.history import save_conversation, load_conversation, list_sessions
+from loco.tools import (
+    tool_registry,
+    ReadTool, WriteTool, EditTool, BashTool, GlobTool, GrepTool,
+)
+from loco.ui.components import StreamingText
+from loco.ui.console import get_console, Console, InputMode
+from loco.history import generate_session_id, save_conversation, load_conversation, list_sessions
 from loco.commands import command_registry, get_commands_system_prompt_section, Command
 from loco.hooks import HookConfig
 from loco.agents import agent_registry, run_agent
 from loco.planner import (
     create_plan, save_plan, load_plan, list_plans,
     format_plan_for_display, PLANNING_SYSTEM_PROMPT,
-    PlanStatus, StepStatus,
+    PlanStatus, StepStatus, plan_writer,
 )
 from loco.git import (
     get_git_status, get_all_diff, get_staged_diff,
@@ -34,8 +61,9 @@ from loco.git import (
     get_commit_history, get_branch_diff, get_current_branch,
     create_commit, stage_all_changes,
 )
-from loco.telemetry import get_tracker, CostTracker, CostProfile
+from loco.telemetry import get_tracker, generate_report, CostTracker, CostProfile
 from loco.rewind import RewindManager, set_rewind_manager, get_rewind_manager
+from loco.usage import get_model_context_window, estimate_conversation_tokens
 
 
 # Track current session ID for auto-save
@@ -44,15 +72,29 @@ _current_session_id: str | None = None
 # Track active command for current conversation
 _active_command: Command | None = None
 
+# Pre-rendered /profile cost bars, indexed by filled length (0-20)
+_BAR_CACHE = ["[green]" + "█" * i + "░" * (20 - i) + "[/green]" for i in range(21)]
+
+# Messages printed repeatedly, parsed from markup once
+_MSG_GOODBYE = Text.from_markup("\n[dim]Goodbye![/dim]")
+_MSG_QUIT = Text.from_markup("[dim]Goodbye![/dim]")
+_MSG_INTERRUPTED = Text.from_markup("\n[dim]Interrupted[/dim]")
+_MSG_HELP_HINT = Text.from_markup("[dim]Type /help for available commands[/dim]")
+_MSG_CANCELLED = Text.from_markup("[dim]Cancelled.[/dim]")
+_MSG_REWIND_DISABLED = Text.from_markup(
+    "[yellow]REWIND is not enabled for this session.[/yellow]\n"
+    "[dim]Enable with rewind.enabled = true in config[/dim]"
+)
+_MSG_REWIND_FAILED = Text.from_markup("[red]Rewind failed.[/red]")
+_MSG_INVALID_TURN = Text.from_markup("[red]Invalid turn number.[/red]")
+_MSG_NO_MCP_SERVERS = Text.from_markup("[yellow]No MCP servers configured.[/yellow]")
+
 
 def _display_cost_profile(console: Console, profile: CostProfile) -> None:
     """Display cost profile dashboard."""
-    from rich.table import Table
-    from rich.panel import Panel
-    from datetime import datetime
 
-    duration = datetime.now() - profile.start_time
-    duration_str = f"{int(duration.total_seconds() // 60)}m {int(duration.total_seconds() % 60)}s"
+    elapsed = int((datetime.now() - profile.start_time).total_seconds())
+    duration_str = f"{elapsed // 60}m {elapsed % 60}s"
 
     # Header panel
     header = f"""[bold]Session:[/bold] {profile.session_id}  [bold]Duration:[/bold] {duration_str}
@@ -63,25 +105,22 @@ def _display_cost_profile(console: Console, profile: CostProfile) -> None:
 
     # Cost by operation
     console.print("\n[bold]Cost by Operation:[/bold]")
-    op_costs = profile.cost_by_operation()
+    op_costs, agent_costs, duplicates = profile.compute_aggregates()
     total = profile.total_cost or 1  # avoid division by zero
 
-    for op, cost in list(op_costs.items())[:8]:  # top 8
+    for op, cost in itertools.islice(op_costs.items(), 8):  # top 8
         pct = (cost / total) * 100
-        bar_len = int(pct / 5)  # scale to ~20 chars max
-        bar = "[green]" + "█" * bar_len + "░" * (20 - bar_len) + "[/green]"
+        bar = _BAR_CACHE[min(20, int(pct / 5))]  # scale to 20 chars max
         console.print(f"  {op:24} {bar} ${cost:.4f} ({pct:.1f}%)")
 
     # Cost by agent
-    agent_costs = profile.cost_by_agent()
     if len(agent_costs) > 1:  # only show if multiple agents
         console.print("\n[bold]Cost by Agent:[/bold]")
-        for agent, cost in list(agent_costs.items())[:5]:
+        for agent, cost in itertools.islice(agent_costs.items(), 5):
             pct = (cost / total) * 100
             console.print(f"  {agent:24} ${cost:.4f} ({pct:.1f}%)")
 
     # Duplicate file reads
-    duplicates = profile.duplicate_file_reads()
     if duplicates:
         console.print("\n[bold yellow]Duplicate File Reads (potential waste):[/bold yellow]")
         wasted = 0
@@ -99,8 +138,6 @@ def _replay_conversation(conversation: Conversation, console: Console) -> None:
     This displays user messages and assistant responses in a format
     similar to how they appear during a live conversation.
     """
-    from rich.markdown import Markdown
-    from rich.panel import Panel
 
     for msg in conversation.messages:
         if msg.role == "system":
@@ -116,22 +153,56 @@ def _replay_conversation(conversation: Conversation, console: Console) -> None:
             console.console.print(md)
         # Skip tool messages for cleaner display
 
+def _run_shell_command(command: str, console: Console) -> None:
+    """Run a shell command, streaming its output to the console as it arrives.
 
-def handle_slash_command(
-    command: str,
+    Output is read in chunks from both pipes, so memory use stays bounded and
+    Ctrl+C terminates the command instead of waiting for it to finish.
+    """
+    with subprocess.Popen(
+        command,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ) as process:
+        with selectors.DefaultSelector() as selector:
+            selector.register(process.stdout, selectors.EVENT_READ, False)
+            selector.register(process.stderr, selectors.EVENT_READ, True)
+            decoders = {
+                False: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+                True: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            }
+            try:
+                while selector.get_map():
+                    for key, _ in selector.select():
+                        chunk = os.read(key.fd, 65536)
+                        if not chunk:
+                            selector.unregister(key.fileobj)
+                        text = decoders[key.data].decode(chunk, final=not chunk)
+                        if not text:
+                            continue
+                        if key.data:
+                            console.print(f"[red]{text}[/red]", end="")
+                        else:
+                            console.print(text, end="")
+            except KeyboardInterrupt:
+                process.terminate()
+                console.print("\n[yellow]Interrupted[/yellow]")
+        returncode = process.wait()
+
+    # Show exit code if non-zero
+    if returncode != 0:
+        console.print(f"[dim]Exit code: {returncode}[/dim]")
+
+
+def _handle_help(
+    args: str,
     conversation: Conversation,
     config: Config,
     console: Console,
 ) -> bool:
-    """Handle slash commands. Returns True if command was handled."""
-    global _current_session_id, _active_command
-
-    parts = command.strip().split(maxsplit=1)
-    cmd = parts[0].lower()
-    args = parts[1] if len(parts) > 1 else ""
-
-    if cmd == "/help":
-        console.print("""
+    """Show the help message."""
+    console.print("""
 [bold]Available Commands:[/bold]
 
   [cyan]/help[/cyan]             Show this help message
@@ -173,72 +244,85 @@ def handle_slash_command(
 - Commands are loaded from .loco/commands/, .claude/commands/, and ~/.config/loco/commands/
 - Agents are loaded from .loco/agents/, .claude/agents/, and ~/.config/loco/agents/
 """)
-        return True
+    return True
 
-    elif cmd == "/clear":
-        conversation.clear()
-        conversation.usage = None
-        _current_session_id = None
-        _active_command = None
-        # Reset rewind state
-        rewind_manager = get_rewind_manager()
-        if rewind_manager:
-            rewind_manager.cleanup()
-            set_rewind_manager(None)
-        console.print("[dim]Conversation cleared.[/dim]")
-        return True
 
-    elif cmd == "/compact":
-        from loco.usage import estimate_conversation_tokens
-        from loco.chat import stream_response
+def _handle_clear(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Clear conversation history and reset session state."""
+    global _current_session_id, _active_command
 
-        # Check if there's enough conversation to compact
-        non_system_messages = [m for m in conversation.messages if m.role != "system"]
-        if len(non_system_messages) < 4:
-            console.print("[yellow]Not enough conversation history to compact.[/yellow]")
-            console.print("[dim]Need at least 4 messages (2 exchanges). Use /clear to reset instead.[/dim]")
-            return True
+    conversation.clear()
+    conversation.usage = None
+    _current_session_id = None
+    _active_command = None
+    # Reset rewind state
+    rewind_manager = get_rewind_manager()
+    if rewind_manager:
+        rewind_manager.cleanup()
+        set_rewind_manager(None)
+    console.print("[dim]Conversation cleared.[/dim]")
+    return True
+
+
+def _handle_compact(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Summarize the conversation to reduce token usage."""
 
-        # Show current state
-        current_tokens = estimate_conversation_tokens(conversation)
-        console.print(f"[bold]Compact Conversation[/bold]\n")
-        console.print(f"  Current messages: {len(non_system_messages)} messages")
-        console.print(f"  Estimated tokens: {current_tokens:,} tokens")
-        console.print()
-        console.print("[yellow]This will summarize the conversation to reduce token usage.[/yellow]")
-        console.print("[dim]The last 2 messages will be preserved for context.[/dim]")
-        console.print()
-        console.print("[bold]Continue?[/bold] [dim](yes/no)[/dim]")
+    # Check if there's enough conversation to compact
+    non_system_messages = [m for m in conversation.messages if m.role != "system"]
+    if len(non_system_messages) < 4:
+        console.print("[yellow]Not enough conversation history to compact.[/yellow]")
+        console.print("[dim]Need at least 4 messages (2 exchanges). Use /clear to reset instead.[/dim]")
+        return True
 
-        response, _ = console.get_input("> ")
-        if not response or response.lower() not in ["yes", "y"]:
-            console.print("[dim]Compaction cancelled.[/dim]")
-            return True
+    # Show current state
+    current_tokens = estimate_conversation_tokens(conversation)
+    console.print(f"[bold]Compact Conversation[/bold]\n")
+    console.print(f"  Current messages: {len(non_system_messages)} messages")
+    console.print(f"  Estimated tokens: {current_tokens:,} tokens")
+    console.print()
+    console.print("[yellow]This will summarize the conversation to reduce token usage.[/yellow]")
+    console.print("[dim]The last 2 messages will be preserved for context.[/dim]")
+    console.print()
+    console.print("[bold]Continue?[/bold] [dim](yes/no)[/dim]")
+
+    response, _ = console.get_input("> ")
+    if not response or response.lower() not in ["yes", "y"]:
+        console.print("[dim]Compaction cancelled.[/dim]")
+        return True
 
-        console.print()
-        console.print("[dim]Generating summary...[/dim]")
+    console.print()
+    console.print("[dim]Generating summary...[/dim]")
 
-        # Create a temporary conversation for compaction
-        compact_conv = Conversation(model=conversation.model, config=config)
+    # Create a temporary conversation for compaction
+    compact_conv = Conversation(model=conversation.model, config=config)
 
-        # Build compaction prompt
-        messages_to_compact = non_system_messages[:-2] if len(non_system_messages) > 2 else non_system_messages
+    # Build compaction prompt
+    messages_to_compact = non_system_messages[:-2] if len(non_system_messages) > 2 else non_system_messages
 
-        # Format conversation history
-        history = []
-        for msg in messages_to_compact:
-            role_label = msg.role.upper()
-            content = msg.content or ""
+    # Format conversation history
+    history = []
+    for msg in messages_to_compact:
+        role_label = msg.role.upper()
+        content = msg.content or ""
 
-            if msg.tool_calls:
-                import json
-                content += f"\n[Used tools: {json.dumps(msg.tool_calls)}]"
+        if msg.tool_calls:
+            content += f"\n[Used tools: {msg.tool_calls_json()}]"
 
-            history.append(f"{role_label}: {content[:500]}")  # Limit each message to 500 chars
+        history.append(f"{role_label}: {content[:500]}")  # Limit each message to 500 chars
 
-        conversation_text = "\n\n".join(history)
+    conversation_text = "\n\n".join(history)
 
-        compact_prompt = f"""I need you to create a concise summary of this conversation that preserves all essential context for continuing our work.
+    compact_prompt = f"""I need you to create a concise summary of this conversation that preserves all essential context for continuing our work.
 
 CONVERSATION TO SUMMARIZE:
 {conversation_text}
@@ -257,287 +341,339 @@ Omit:
 
 Format the summary as a clear, organized narrative that I can use to continue the conversation effectively."""
 
-        compact_conv.add_user_message(compact_prompt)
+    compact_conv.add_user_message(compact_prompt)
 
-        # Get summary from LLM
-        try:
-            summary = ""
-            with console.console.status("[dim]Summarizing...[/dim]"):
-                for item in stream_response(compact_conv, tools=None):
-                    if isinstance(item, str):
-                        summary += item
-
-            if not summary:
-                console.print("[red]Failed to generate summary.[/red]")
-                return True
-
-            # Replace conversation history
-            system_msg = next((m for m in conversation.messages if m.role == "system"), None)
-            last_messages = non_system_messages[-2:] if len(non_system_messages) > 2 else []
-
-            conversation.messages = []
-
-            # Add back system message
-            if system_msg:
-                conversation.messages.append(system_msg)
-
-            # Add compacted summary as assistant message
-            from loco.chat import Message
-            conversation.messages.append(Message(
-                role="assistant",
-                content=f"[Previous conversation summary]\n\n{summary}\n\n[End of summary - continuing from here]"
-            ))
-
-            # Add back last 2 messages for immediate context
-            for msg in last_messages:
-                conversation.messages.append(msg)
-
-            # Calculate new token count
-            new_tokens = estimate_conversation_tokens(conversation)
-            saved_tokens = current_tokens - new_tokens
-            saved_percent = (saved_tokens / current_tokens * 100) if current_tokens > 0 else 0
+    # Get summary from LLM
+    try:
+        summary_parts: list[str] = []
+        with console.console.status("[dim]Summarizing...[/dim]"):
+            for item in stream_response(compact_conv, tools=None):
+                if isinstance(item, str):
+                    summary_parts.append(item)
+        summary = "".join(summary_parts)
 
-            console.print()
-            console.print(f"[green]✓[/green] Conversation compacted successfully")
-            console.print(f"  New messages: {len([m for m in conversation.messages if m.role != 'system'])} messages")
-            console.print(f"  New estimated tokens: {new_tokens:,} tokens")
-            console.print(f"  Saved: [green]{saved_tokens:,}[/green] tokens ([green]{saved_percent:.1f}%[/green] reduction)")
+        if not summary:
+            console.print("[red]Failed to generate summary.[/red]")
+            return True
 
-        except Exception as e:
-            console.print(f"[red]Error during compaction: {e}[/red]")
+        # Replace conversation history
+        system_msg = conversation.system_message
+        last_messages = non_system_messages[-2:] if len(non_system_messages) > 2 else []
 
-        return True
+        conversation.messages = []
 
-    elif cmd == "/model":
-        if args:
-            # Switch model
-            new_model = resolve_model(args, config)
-            conversation.model = new_model
-            console.print(f"[dim]Switched to model: {new_model}[/dim]")
-        else:
-            # Show current model
-            console.print(f"[dim]Current model: {conversation.model}[/dim]")
-            console.print("\n[dim]Available aliases:[/dim]")
-            for alias, model in config.models.items():
-                marker = " [green]<-- current[/green]" if model == conversation.model else ""
-                console.print(f"  [cyan]{alias}[/cyan]: {model}{marker}")
+        # Add back system message
+        if system_msg:
+            conversation.messages.append(system_msg)
+
+        # Add compacted summary as assistant message
+        conversation.messages.append(Message(
+            role="assistant",
+            content=f"[Previous conversation summary]\n\n{summary}\n\n[End of summary - continuing from here]"
+        ))
+
+        # Add back last 2 messages for immediate context
+        for msg in last_messages:
+            conversation.messages.append(msg)
+
+        # Calculate new token count
+        new_tokens = estimate_conversation_tokens(conversation)
+        saved_tokens = current_tokens - new_tokens
+        saved_percent = (saved_tokens / current_tokens * 100) if current_tokens > 0 else 0
+
+        console.print()
+        console.print(f"[green]✓[/green] Conversation compacted successfully")
+        console.print(f"  New messages: {conversation.non_system_count} messages")
+        console.print(f"  New estimated tokens: {new_tokens:,} tokens")
+        console.print(f"  Saved: [green]{saved_tokens:,}[/green] tokens ([green]{saved_percent:.1f}%[/green] reduction)")
+
+    except Exception as e:
+        console.print(f"[red]Error during compaction: {e}[/red]")
+
+    return True
+
+
+def _handle_model(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Show or switch the current model."""
+    if args:
+        # Switch model
+        new_model = resolve_model(args, config)
+        conversation.model = new_model
+        console.print(f"[dim]Switched to model: {new_model}[/dim]")
+    else:
+        # Show current model
+        console.print(f"[dim]Current model: {conversation.model}[/dim]")
+        console.print("\n[dim]Available aliases:[/dim]")
+        for alias, model in config.models.items():
+            marker = " [green]<-- current[/green]" if model == conversation.model else ""
+            console.print(f"  [cyan]{alias}[/cyan]: {model}{marker}")
+    return True
+
+
+def _handle_save(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Save the current conversation."""
+    global _current_session_id
+
+    name = args if args else None
+    session_id = save_conversation(conversation, _current_session_id, name)
+    _current_session_id = session_id
+    console.print(f"[dim]Saved as session: {session_id}[/dim]")
+    return True
+
+
+def _handle_load(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Load a saved conversation."""
+    global _current_session_id
+
+    if not args:
+        console.print("[yellow]Usage: /load <session_id>[/yellow]")
+        console.print("[dim]Use /sessions to see available sessions[/dim]")
         return True
 
-    elif cmd == "/save":
-        name = args if args else None
-        session_id = save_conversation(conversation, _current_session_id, name)
-        _current_session_id = session_id
-        console.print(f"[dim]Saved as session: {session_id}[/dim]")
+    loaded = load_conversation(args)
+    if loaded is None:
+        console.print(f"[red]Session not found: {args}[/red]")
         return True
 
-    elif cmd == "/load":
-        if not args:
-            console.print("[yellow]Usage: /load <session_id>[/yellow]")
-            console.print("[dim]Use /sessions to see available sessions[/dim]")
-            return True
+    # Replace conversation content
+    conversation.messages = loaded.messages
+    if loaded.model:
+        conversation.model = loaded.model
+    if loaded.usage:
+        conversation.usage = loaded.usage
+    _current_session_id = args
+
+    # Try to load rewind state if it exists
+    loaded_rewind = RewindManager.load(args)
+    if loaded_rewind:
+        set_rewind_manager(loaded_rewind)
+        console.print(f"[dim]Loaded session: {args} ({len(conversation.messages)} messages, {loaded_rewind.state.current_turn} turns)[/dim]")
+    else:
+        set_rewind_manager(None)
+        console.print(f"[dim]Loaded session: {args} ({len(conversation.messages)} messages)[/dim]")
+    return True
 
-        loaded = load_conversation(args)
-        if loaded is None:
-            console.print(f"[red]Session not found: {args}[/red]")
-            return True
 
-        # Replace conversation content
-        conversation.messages = loaded.messages
-        if loaded.model:
-            conversation.model = loaded.model
-        if loaded.usage:
-            conversation.usage = loaded.usage
-        _current_session_id = args
-
-        # Try to load rewind state if it exists
-        loaded_rewind = RewindManager.load(args)
-        if loaded_rewind:
-            set_rewind_manager(loaded_rewind)
-            console.print(f"[dim]Loaded session: {args} ({len(conversation.messages)} messages, {loaded_rewind.state.current_turn} turns)[/dim]")
-        else:
-            set_rewind_manager(None)
-            console.print(f"[dim]Loaded session: {args} ({len(conversation.messages)} messages)[/dim]")
+def _handle_sessions(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """List saved sessions."""
+    sessions = list_sessions()
+    if not sessions:
+        console.print("[dim]No saved sessions found.[/dim]")
         return True
 
-    elif cmd == "/sessions":
-        sessions = list_sessions()
-        if not sessions:
-            console.print("[dim]No saved sessions found.[/dim]")
-            return True
+    console.print("[bold]Saved Sessions:[/bold]\n")
+    for s in sessions:
+        name_str = f" ({s['name']})" if s.get('name') else ""
+        console.print(
+            f"  [cyan]{s['session_id']}[/cyan]{name_str} - "
+            f"{s['message_count']} msgs, {s.get('model', 'unknown')}"
+        )
+    return True
+
 
-        console.print("[bold]Saved Sessions:[/bold]\n")
-        for s in sessions:
-            name_str = f" ({s['name']})" if s.get('name') else ""
+def _handle_stats(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Show token usage and cost statistics."""
+    if conversation.usage is None or conversation.usage.get_call_count() == 0:
+        console.print("[dim]No usage data yet. Make some API calls first![/dim]")
+        return True
+    
+    usage = conversation.usage
+    console.print("[bold]Session Statistics:[/bold]\n")
+    console.print(f"  Model: [cyan]{conversation.model}[/cyan]")
+    console.print(f"  API Calls: {usage.get_call_count()}")
+    console.print(f"  Total Tokens: {usage.get_total_tokens():,}")
+    console.print(f"    • Input: {usage.get_prompt_tokens():,} tokens")
+    console.print(f"    • Output: {usage.get_completion_tokens():,} tokens")
+    console.print(f"  Estimated Cost: [green]${usage.get_total_cost():.4f}[/green]")
+    
+    # Show per-call breakdown if there are multiple calls
+    if usage.get_call_count() > 1:
+        console.print("\n[dim]Recent calls:[/dim]")
+        for i, stat in enumerate(usage.stats[-5:], start=max(1, len(usage.stats) - 4)):
             console.print(
-                f"  [cyan]{s['session_id']}[/cyan]{name_str} - "
-                f"{s['message_count']} msgs, {s.get('model', 'unknown')}"
+                f"    {i}. {stat.total_tokens:,} tokens → ${stat.cost:.4f}"
             )
-        return True
     
-    elif cmd == "/stats":
-        if conversation.usage is None or conversation.usage.get_call_count() == 0:
-            console.print("[dim]No usage data yet. Make some API calls first![/dim]")
-            return True
-        
-        usage = conversation.usage
-        console.print("[bold]Session Statistics:[/bold]\n")
-        console.print(f"  Model: [cyan]{conversation.model}[/cyan]")
-        console.print(f"  API Calls: {usage.get_call_count()}")
-        console.print(f"  Total Tokens: {usage.get_total_tokens():,}")
-        console.print(f"    • Input: {usage.get_prompt_tokens():,} tokens")
-        console.print(f"    • Output: {usage.get_completion_tokens():,} tokens")
-        console.print(f"  Estimated Cost: [green]${usage.get_total_cost():.4f}[/green]")
-        
-        # Show per-call breakdown if there are multiple calls
-        if usage.get_call_count() > 1:
-            console.print("\n[dim]Recent calls:[/dim]")
-            for i, stat in enumerate(usage.stats[-5:], start=max(1, len(usage.stats) - 4)):
-                console.print(
-                    f"    {i}. {stat.total_tokens:,} tokens → ${stat.cost:.4f}"
-                )
-        
-        console.print("\n[dim]Note: Costs are estimates based on standard pricing[/dim]")
-        return True
+    console.print("\n[dim]Note: Costs are estimates based on standard pricing[/dim]")
+    return True
 
-    elif cmd == "/context":
-        from loco.usage import get_model_context_window, estimate_conversation_tokens
 
-        console.print("[bold]Context Usage[/bold]\n")
-        console.print(f"  Model: [cyan]{conversation.model}[/cyan]")
+def _handle_context(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Show context window usage and estimates."""
 
-        # Get context window
-        context_window = get_model_context_window(conversation.model)
-        if context_window:
-            console.print(f"  Context Window: [cyan]{context_window:,}[/cyan] tokens")
-        else:
-            console.print(f"  Context Window: [yellow]Unknown[/yellow]")
+    console.print("[bold]Context Usage[/bold]\n")
+    console.print(f"  Model: [cyan]{conversation.model}[/cyan]")
 
-        console.print()
+    # Get context window
+    context_window = get_model_context_window(conversation.model)
+    if context_window:
+        console.print(f"  Context Window: [cyan]{context_window:,}[/cyan] tokens")
+    else:
+        console.print(f"  Context Window: [yellow]Unknown[/yellow]")
+
+    console.print()
+
+    # Estimate current conversation tokens
+    estimated_tokens = estimate_conversation_tokens(conversation)
 
-        # Estimate current conversation tokens
-        estimated_tokens = estimate_conversation_tokens(conversation)
-
-        # Calculate message breakdown
-        system_tokens = 0
-        message_tokens = 0
-
-        for msg in conversation.messages:
-            if msg.role == "system":
-                if msg.content:
-                    system_tokens += len(msg.content) // 4
-            else:
-                if msg.content:
-                    message_tokens += len(msg.content) // 4
-                if msg.tool_calls:
-                    import json
-                    message_tokens += len(json.dumps(msg.tool_calls)) // 4
-
-        # Add overhead
-        system_tokens += 15  # Format overhead
-        message_tokens += (len([m for m in conversation.messages if m.role != "system"]) * 15)
-
-        console.print("  [bold]Current Conversation:[/bold]")
-        console.print(f"    • System Prompt: [cyan]{system_tokens:,}[/cyan] tokens")
-        console.print(f"    • Messages: [cyan]{message_tokens:,}[/cyan] tokens")
-        console.print(f"    • Total Estimated: [cyan]{estimated_tokens:,}[/cyan] tokens", end="")
-
-        # Show percentage if we know the context window
-        if context_window:
-            percentage = (estimated_tokens / context_window) * 100
-            remaining = context_window - estimated_tokens
-
-            # Color code based on usage
-            if percentage >= 80:
-                percent_color = "red"
-                status = "⚠️"
-            elif percentage >= 60:
-                percent_color = "yellow"
-                status = ""
-            else:
-                percent_color = "green"
-                status = ""
-
-            console.print(f" [{percent_color}]({percentage:.1f}%)[/{percent_color}] {status}")
-            console.print(f"    • Remaining: [cyan]{remaining:,}[/cyan] tokens [{percent_color}]({100-percentage:.1f}%)[/{percent_color}]")
-
-            if percentage >= 80:
-                console.print()
-                console.print("  [yellow]⚠️  Warning: Approaching context window limit[/yellow]")
-                console.print("  [dim]Consider using /clear to reset the conversation[/dim]")
+    # Calculate message breakdown
+    system_tokens = conversation.system_tokens
+    message_tokens = 0
+
+    for msg in conversation.messages:
+        if msg.role == "system":
+            continue
+        if msg.content:
+            message_tokens += len(msg.content) // 4
+        if msg.tool_calls:
+            message_tokens += len(msg.tool_calls_json()) // 4
+
+    # Add overhead
+    message_tokens += conversation.non_system_count * 15
+
+    console.print("  [bold]Current Conversation:[/bold]")
+    console.print(f"    • System Prompt: [cyan]{system_tokens:,}[/cyan] tokens")
+    console.print(f"    • Messages: [cyan]{message_tokens:,}[/cyan] tokens")
+    console.print(f"    • Total Estimated: [cyan]{estimated_tokens:,}[/cyan] tokens", end="")
+
+    # Show percentage if we know the context window
+    if context_window:
+        percentage = (estimated_tokens / context_window) * 100
+        remaining = context_window - estimated_tokens
+
+        # Color code based on usage
+        if percentage >= 80:
+            percent_color = "red"
+            status = "⚠️"
+        elif percentage >= 60:
+            percent_color = "yellow"
+            status = ""
         else:
-            console.print()
+            percent_color = "green"
+            status = ""
 
+        console.print(f" [{percent_color}]({percentage:.1f}%)[/{percent_color}] {status}")
+        console.print(f"    • Remaining: [cyan]{remaining:,}[/cyan] tokens [{percent_color}]({100-percentage:.1f}%)[/{percent_color}]")
+
+        if percentage >= 80:
+            console.print()
+            console.print("  [yellow]⚠️  Warning: Approaching context window limit[/yellow]")
+            console.print("  [dim]Consider using /clear to reset the conversation[/dim]")
+    else:
         console.print()
-        console.print("[dim]Note: Token estimates are approximate and may vary from actual usage[/dim]")
+
+    console.print()
+    console.print("[dim]Note: Token estimates are approximate and may vary from actual usage[/dim]")
+    return True
+
+
+# A numbered plan step: "1. Step description" or "1) Step description"
+_PLAN_STEP_RE = re.compile(r"^\d+[\.)]\s+(.+)$")
+
+
+def _handle_plan(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Create, approve, and execute a step-by-step plan for a task."""
+    if not args:
+        console.print("[yellow]Usage: /plan <task description>[/yellow]")
+        console.print("[dim]Example: /plan Add user authentication with JWT[/dim]")
         return True
 
-    elif cmd == "/plan":
-        if not args:
-            console.print("[yellow]Usage: /plan <task description>[/yellow]")
-            console.print("[dim]Example: /plan Add user authentication with JWT[/dim]")
+    task = args
+    console.print(f"[bold]Creating plan for:[/bold] {task}\n")
+    console.print("[dim]Analyzing codebase and generating steps...[/dim]")
+
+    # Create a planning conversation
+    planning_conv = Conversation(
+        model=conversation.model,
+        config=conversation.config,
+    )
+    planning_conv.add_system_message(PLANNING_SYSTEM_PROMPT)
+    planning_conv.add_user_message(
+        f"Task: {task}\n\n"
+        f"Working directory: {os.getcwd()}\n\n"
+        "Analyze the codebase and create a detailed step-by-step plan for this task."
+    )
+
+    # Get plan from LLM
+    try:
+        plan_parts: list[str] = []
+        with console.console.status("[dim]Planning...[/dim]"):
+            for item in stream_response(planning_conv, tools=tool_registry.get_openai_tools()):
+                if isinstance(item, str):
+                    plan_parts.append(item)
+        plan_text = "".join(plan_parts)
+
+        # Parse steps from response (expecting numbered list)
+        steps = []
+        for line in plan_text.split("\n"):
+            line = line.strip()
+            match = _PLAN_STEP_RE.match(line)
+            if match:
+                steps.append(match.group(1))
+
+        if not steps:
+            console.print("[red]Failed to generate plan steps[/red]")
             return True
 
-        task = args
-        console.print(f"[bold]Creating plan for:[/bold] {task}\n")
-        console.print("[dim]Analyzing codebase and generating steps...[/dim]")
+        # Create and save plan
+        plan = create_plan(task, steps)
+        save_plan(plan)
 
-        # Create a planning conversation
-        planning_conv = Conversation(
-            model=conversation.model,
-            config=conversation.config,
-        )
-        planning_conv.add_system_message(PLANNING_SYSTEM_PROMPT)
-        planning_conv.add_user_message(
-            f"Task: {task}\n\n"
-            f"Working directory: {os.getcwd()}\n\n"
-            "Analyze the codebase and create a detailed step-by-step plan for this task."
-        )
+        # Display plan
+        console.print("\n" + format_plan_for_display(plan))
+        console.print(f"\n[dim]Plan saved as: {plan.id}[/dim]")
+        console.print("\n[bold]Approve this plan?[/bold] [dim](yes/no)[/dim]")
 
-        # Get plan from LLM
-        try:
-            plan_text = ""
-            with console.console.status("[dim]Planning...[/dim]"):
-                from loco.chat import stream_response
-                for item in stream_response(planning_conv, tools=tool_registry.get_openai_tools()):
-                    if isinstance(item, str):
-                        plan_text += item
-
-            # Parse steps from response (expecting numbered list)
-            steps = []
-            for line in plan_text.split("\n"):
-                line = line.strip()
-                # Match "1. Step description" or "1) Step description"
-                import re
-                match = re.match(r"^\d+[\.)]\s+(.+)$", line)
-                if match:
-                    steps.append(match.group(1))
-
-            if not steps:
-                console.print("[red]Failed to generate plan steps[/red]")
-                return True
-
-            # Create and save plan
-            plan = create_plan(task, steps)
-            save_plan(plan)
-
-            # Display plan
-            console.print("\n" + format_plan_for_display(plan))
-            console.print(f"\n[dim]Plan saved as: {plan.id}[/dim]")
-            console.print("\n[bold]Approve this plan?[/bold] [dim](yes/no)[/dim]")
-
-            # Get user approval
-            approval, _ = console.get_input("> ")
-            if approval and approval.lower() in ["yes", "y"]:
-                plan.status = PlanStatus.APPROVED
-                plan.status = PlanStatus.EXECUTING
-                save_plan(plan)
-
-                console.print("[green]Plan approved! Executing steps...[/green]\n")
+        # Get user approval
+        approval, _ = console.get_input("> ")
+        if approval and approval.lower() in ["yes", "y"]:
+            plan.status = PlanStatus.APPROVED
+            plan.status = PlanStatus.EXECUTING
+            plan_writer.enqueue(plan)
 
+            console.print("[green]Plan approved! Executing steps...[/green]\n")
+
+            # Queued plan states are written even if execution is interrupted
+            try:
                 # Execute each step
                 for step in plan.steps:
                     step.status = StepStatus.IN_PROGRESS
-                    save_plan(plan)
+                    plan_writer.enqueue(plan)
 
                     console.print(f"[yellow]●[/yellow] Executing: {step.description}")
 
@@ -564,416 +700,531 @@ Format the summary as a clear, organized narrative that I can use to continue th
                         if not continue_resp or continue_resp.lower() not in ["yes", "y"]:
                             break
 
-                    save_plan(plan)
+                    plan_writer.enqueue(plan)
 
                 plan.status = PlanStatus.COMPLETED
-                save_plan(plan)
-                console.print("[green]Plan execution completed![/green]")
-            else:
-                console.print("[dim]Plan cancelled.[/dim]")
+                plan_writer.enqueue(plan)
+            finally:
+                plan_writer.flush()
+            console.print("[green]Plan execution completed![/green]")
+        else:
+            console.print("[dim]Plan cancelled.[/dim]")
 
-        except Exception as e:
-            console.print(f"[red]Error creating plan: {e}[/red]")
+    except Exception as e:
+        console.print(f"[red]Error creating plan: {e}[/red]")
 
-        return True
+    return True
 
-    elif cmd in ("/command", "/commands"):
-        commands = command_registry.get_user_invocable()
 
-        if not args or cmd == "/commands":
-            # List available commands
-            if not commands:
-                console.print("[dim]No commands found.[/dim]")
-                console.print("[dim]Add commands to .loco/commands/, .claude/commands/, or ~/.config/loco/commands/[/dim]")
-                return True
+def _handle_command(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Activate a command, or list available commands when no name is given."""
+    global _active_command
 
-            console.print("[bold]Available Commands:[/bold]\n")
-            for command in commands:
-                active_marker = " [green]<-- active[/green]" if _active_command and _active_command.name == command.name else ""
-                console.print(f"  [cyan]{command.name}[/cyan]: {command.description}{active_marker}")
+    commands = command_registry.get_user_invocable()
 
-            if _active_command:
-                console.print(f"\n[dim]Active command: {_active_command.name}[/dim]")
-                console.print("[dim]Use /command off to deactivate[/dim]")
+    if not args:
+        # List available commands
+        if not commands:
+            console.print("[dim]No commands found.[/dim]")
+            console.print("[dim]Add commands to .loco/commands/, .claude/commands/, or ~/.config/loco/commands/[/dim]")
             return True
 
-        # Activate or deactivate a command
-        if args.lower() == "off":
-            if _active_command:
-                console.print(f"[dim]Deactivated command: {_active_command.name}[/dim]")
-                _active_command = None
-                # Rebuild system prompt without command
-                conversation.add_system_message(
-                    get_default_system_prompt(os.getcwd(), get_commands_system_prompt_section())
-                )
-            else:
-                console.print("[dim]No active command to deactivate[/dim]")
-            return True
+        console.print("[bold]Available Commands:[/bold]\n")
+        for command in commands:
+            active_marker = " [green]<-- active[/green]" if _active_command and _active_command.name == command.name else ""
+            console.print(f"  [cyan]{command.name}[/cyan]: {command.description}{active_marker}")
 
-        # Find and activate the command
-        command = command_registry.get(args)
-        if command is None:
-            console.print(f"[red]Command not found: {args}[/red]")
-            console.print("[dim]Use /commands to see available commands[/dim]")
-            return True
+        if _active_command:
+            console.print(f"\n[dim]Active command: {_active_command.name}[/dim]")
+            console.print("[dim]Use /command off to deactivate[/dim]")
+        return True
 
-        _active_command = command
-        # Update system prompt with command content
-        commands_section = get_commands_system_prompt_section()
-        commands_section += command.get_system_prompt_addition()
-        conversation.add_system_message(
-            get_default_system_prompt(os.getcwd(), commands_section)
-        )
-        console.print(f"[dim]Activated command: {command.name}[/dim]")
+    # Activate or deactivate a command
+    if args.lower() == "off":
+        if _active_command:
+            console.print(f"[dim]Deactivated command: {_active_command.name}[/dim]")
+            _active_command = None
+            # Rebuild system prompt without command
+            conversation.add_system_message(
+                get_default_system_prompt(os.getcwd(), get_commands_system_prompt_section())
+            )
+        else:
+            console.print("[dim]No active command to deactivate[/dim]")
         return True
 
-    elif cmd in ("/agent", "/agents"):
-        agents = agent_registry.get_all()
+    # Find and activate the command
+    command = command_registry.get(args)
+    if command is None:
+        console.print(f"[red]Command not found: {args}[/red]")
+        console.print("[dim]Use /commands to see available commands[/dim]")
+        return True
 
-        if cmd == "/agents" or not args:
-            # List available agents
-            if not agents:
-                console.print("[dim]No agents found.[/dim]")
-                console.print("[dim]Add agents to .loco/agents/, .claude/agents/, or ~/.config/loco/agents/[/dim]")
-                return True
+    _active_command = command
+    # Update system prompt with command content
+    commands_section = get_commands_system_prompt_section()
+    commands_section += command.get_system_prompt_addition()
+    conversation.add_system_message(
+        get_default_system_prompt(os.getcwd(), commands_section)
+    )
+    console.print(f"[dim]Activated command: {command.name}[/dim]")
+    return True
 
-            console.print("[bold]Available Agents:[/bold]\n")
-            for agent in agents:
-                tools_info = ""
-                if agent.allowed_tools:
-                    tools_info = f" [dim](tools: {', '.join(agent.allowed_tools)})[/dim]"
-                console.print(f"  [cyan]{agent.name}[/cyan]: {agent.description}{tools_info}")
 
-            console.print("\n[dim]Usage: /agent <name> <task>[/dim]")
+def _handle_agent(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Run a subagent with a task, or list available agents when no task is given."""
+    agents = agent_registry.get_all()
+
+    if not args:
+        # List available agents
+        if not agents:
+            console.print("[dim]No agents found.[/dim]")
+            console.print("[dim]Add agents to .loco/agents/, .claude/agents/, or ~/.config/loco/agents/[/dim]")
             return True
 
-        # Parse agent name and task
-        agent_parts = args.split(maxsplit=1)
-        agent_name = agent_parts[0]
-        task = agent_parts[1] if len(agent_parts) > 1 else ""
+        console.print("[bold]Available Agents:[/bold]\n")
+        for agent in agents:
+            tools_info = ""
+            if agent.allowed_tools:
+                tools_info = f" [dim](tools: {', '.join(agent.allowed_tools)})[/dim]"
+            console.print(f"  [cyan]{agent.name}[/cyan]: {agent.description}{tools_info}")
 
-        if not task:
-            console.print("[yellow]Usage: /agent <name> <task>[/yellow]")
-            console.print("[dim]Example: /agent explorer find all API endpoints[/dim]")
-            return True
+        console.print("\n[dim]Usage: /agent <name> <task>[/dim]")
+        return True
 
-        # Find the agent
-        agent = agent_registry.get(agent_name)
-        if agent is None:
-            console.print(f"[red]Agent not found: {agent_name}[/red]")
-            console.print("[dim]Use /agents to see available agents[/dim]")
-            return True
+    # Parse agent name and task
+    agent_parts = args.split(maxsplit=1)
+    agent_name = agent_parts[0]
+    task = agent_parts[1] if len(agent_parts) > 1 else ""
 
-        # Run the agent
-        try:
-            result = run_agent(
-                agent=agent,
-                task=task,
-                config=config,
-                tool_registry=tool_registry,
-                console=console,
-            )
-            # Add a summary to the main conversation
-            conversation.add_user_message(f"[Agent '{agent_name}' completed task: {task}]")
-            conversation.add_assistant_message(f"Agent result:\n\n{result}")
-        except Exception as e:
-            console.print(f"[red]Agent error: {e}[/red]")
+    if not task:
+        console.print("[yellow]Usage: /agent <name> <task>[/yellow]")
+        console.print("[dim]Example: /agent explorer find all API endpoints[/dim]")
+        return True
 
+    # Find the agent
+    agent = agent_registry.get(agent_name)
+    if agent is None:
+        console.print(f"[red]Agent not found: {agent_name}[/red]")
+        console.print("[dim]Use /agents to see available agents[/dim]")
         return True
 
-    elif cmd == "/profile":
-        tracker = get_tracker()
-        args_list = args.split() if args else []
+    # Run the agent
+    try:
+        result = run_agent(
+            agent=agent,
+            task=task,
+            config=config,
+            tool_registry=tool_registry,
+            console=console,
+        )
+        # Add a summary to the main conversation
+        conversation.add_user_message(f"[Agent '{agent_name}' completed task: {task}]")
+        conversation.add_assistant_message(f"Agent result:\n\n{result}")
+    except Exception as e:
+        console.print(f"[red]Agent error: {e}[/red]")
 
-        if args_list and args_list[0] == "on":
-            tracker.enable()
-            console.print("[green]Cost profiling enabled[/green]")
-            return True
-        elif args_list and args_list[0] == "off":
-            tracker.disable()
-            console.print("[yellow]Cost profiling disabled[/yellow]")
-            return True
-        elif args_list and args_list[0] == "save":
-            path = tracker.save_profile(Path.home() / ".config" / "loco" / "profiles")
-            if path:
-                console.print(f"[green]Profile saved to {path}[/green]")
-            return True
-        elif args_list and args_list[0] == "report":
-            from loco.telemetry import generate_report
-            profile = tracker.profile
-            if profile is None:
-                console.print("[yellow]No profile data[/yellow]")
-                return True
-
-            report = generate_report(profile)
-
-            # Save to file if path provided
-            if len(args_list) > 1:
-                path = Path(args_list[1])
-                path.write_text(report)
-                console.print(f"[green]Report saved to {path}[/green]")
-            else:
-                console.print(report)
-            return True
+    return True
 
-        if not tracker.enabled:
-            console.print("[yellow]Cost profiling is not enabled.[/yellow]")
-            console.print("Run with --profile flag or use /profile on")
-            return True
 
+def _handle_profile(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Show the cost profiling dashboard or toggle/save/report profiling."""
+    tracker = get_tracker()
+    args_list = args.split() if args else []
+
+    if args_list and args_list[0] == "on":
+        tracker.enable()
+        console.print("[green]Cost profiling enabled[/green]")
+        return True
+    elif args_list and args_list[0] == "off":
+        tracker.disable()
+        console.print("[yellow]Cost profiling disabled[/yellow]")
+        return True
+    elif args_list and args_list[0] == "save":
+        path = tracker.save_profile(Path.home() / ".config" / "loco" / "profiles")
+        if path:
+            console.print(f"[green]Profile saved to {path}[/green]")
+        return True
+    elif args_list and args_list[0] == "report":
         profile = tracker.profile
-        if profile is None or not profile.calls:
-            console.print("[yellow]No data yet. Make some LLM calls first.[/yellow]")
+        if profile is None:
+            console.print("[yellow]No profile data[/yellow]")
             return True
 
-        # Display dashboard
-        _display_cost_profile(console, profile)
+        report = generate_report(profile)
+
+        # Save to file if path provided
+        if len(args_list) > 1:
+            path = Path(args_list[1])
+            path.write_text(report)
+            console.print(f"[green]Report saved to {path}[/green]")
+        else:
+            console.print(report)
         return True
 
-    elif cmd == "/config":
-        console.print(f"[dim]Config file: {get_config_path()}[/dim]")
+    if not tracker.enabled:
+        console.print("[yellow]Cost profiling is not enabled.[/yellow]")
+        console.print("Run with --profile flag or use /profile on")
         return True
 
-    elif cmd == "/turns":
-        rewind_manager = get_rewind_manager()
-        if not rewind_manager:
-            console.print("[yellow]REWIND is not enabled for this session.[/yellow]")
-            console.print("[dim]Enable with rewind.enabled = true in config[/dim]")
-            return True
+    profile = tracker.profile
+    if profile is None or not profile.calls:
+        console.print("[yellow]No data yet. Make some LLM calls first.[/yellow]")
+        return True
 
-        if rewind_manager.state.current_turn == 0:
-            console.print("[dim]No turns recorded yet.[/dim]")
-            return True
+    # Display dashboard
+    _display_cost_profile(console, profile)
+    return True
 
-        console.print("[bold]Conversation Turns:[/bold]\n")
-        for checkpoint in rewind_manager.state.checkpoints:
-            # Format turn info
-            summary = checkpoint.summary or "[No summary]"
-            if len(summary) > 60:
-                summary = summary[:57] + "..."
 
-            current_marker = " [green]← current[/green]" if checkpoint.turn_number == rewind_manager.state.current_turn else ""
-            files_changed = len(checkpoint.file_changes)
-            files_info = f" [dim]({files_changed} file{'s' if files_changed != 1 else ''} changed)[/dim]" if files_changed > 0 else ""
+def _handle_config(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Show the configuration file path."""
+    console.print(f"[dim]Config file: {get_config_path()}[/dim]")
+    return True
 
-            console.print(f"  [cyan]Turn {checkpoint.turn_number}:[/cyan] {summary}{files_info}{current_marker}")
 
-        # Show modified files summary
-        all_files = set()
-        for checkpoint in rewind_manager.state.checkpoints:
-            for change in checkpoint.file_changes:
-                all_files.add(change.path)
+def _handle_turns(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """List conversation turns recorded for REWIND."""
+    rewind_manager = get_rewind_manager()
+    if not rewind_manager:
+        console.print(_MSG_REWIND_DISABLED)
+        return True
+
+    if rewind_manager.state.current_turn == 0:
+        console.print("[dim]No turns recorded yet.[/dim]")
+        return True
+
+    # Build the whole listing and render it in one print
+    lines = [Text.from_markup("[bold]Conversation Turns:[/bold]\n")]
+    for checkpoint in rewind_manager.state.checkpoints:
+        # Format turn info
+        summary = checkpoint.summary or "[No summary]"
+        if len(summary) > 60:
+            summary = summary[:57] + "..."
+
+        current_marker = " [green]← current[/green]" if checkpoint.turn_number == rewind_manager.state.current_turn else ""
+        files_changed = len(checkpoint.file_changes)
+        files_info = f" [dim]({files_changed} file{'s' if files_changed != 1 else ''} changed)[/dim]" if files_changed > 0 else ""
+
+        lines.append(Text.from_markup(f"  [cyan]Turn {checkpoint.turn_number}:[/cyan] {summary}{files_info}{current_marker}"))
+
+    # Show modified files summary
+    all_files = frozenset().union(
+        *(checkpoint.file_changes_paths for checkpoint in rewind_manager.state.checkpoints)
+    )
+
+    if all_files:
+        files_summary = f"\nFiles modified this session: {', '.join(heapq.nsmallest(5, all_files))}"
+        if len(all_files) > 5:
+            files_summary += f"\n  ... and {len(all_files) - 5} more"
+        lines.append(Text(files_summary, style="dim"))
+
+    lines.append(Text.from_markup("\n[dim]Use /rewind <n> to rewind to turn N[/dim]"))
+    console.print(Group(*lines))
+    return True
 
-        if all_files:
-            console.print(f"\n[dim]Files modified this session: {', '.join(sorted(all_files)[:5])}")
-            if len(all_files) > 5:
-                console.print(f"  ... and {len(all_files) - 5} more[/dim]")
-            else:
-                console.print("[/dim]", end="")
 
-        console.print("\n[dim]Use /rewind <n> to rewind to turn N[/dim]")
+def _handle_rewind(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Rewind the conversation (and optionally files) to an earlier turn."""
+    rewind_manager = get_rewind_manager()
+    if not rewind_manager:
+        console.print(_MSG_REWIND_DISABLED)
         return True
 
-    elif cmd == "/rewind":
-        rewind_manager = get_rewind_manager()
-        if not rewind_manager:
-            console.print("[yellow]REWIND is not enabled for this session.[/yellow]")
-            console.print("[dim]Enable with rewind.enabled = true in config[/dim]")
-            return True
+    if rewind_manager.state.current_turn == 0:
+        console.print("[dim]No turns to rewind to.[/dim]")
+        return True
 
-        if rewind_manager.state.current_turn == 0:
-            console.print("[dim]No turns to rewind to.[/dim]")
-            return True
+    # Handle subcommands
+    if args == "cleanup":
+        # Cleanup rewind state
+        console.print("[bold]Clean up REWIND storage?[/bold]")
+        console.print(f"[dim]This will remove all snapshots for session {rewind_manager.state.session_id}[/dim]")
+        console.print("\n[bold]Continue?[/bold] [dim](yes/no)[/dim]")
 
-        # Handle subcommands
-        if args == "cleanup":
-            # Cleanup rewind state
-            console.print("[bold]Clean up REWIND storage?[/bold]")
-            console.print(f"[dim]This will remove all snapshots for session {rewind_manager.state.session_id}[/dim]")
-            console.print("\n[bold]Continue?[/bold] [dim](yes/no)[/dim]")
-
-            response, _ = console.get_input("> ")
-            if response and response.lower() in ["yes", "y"]:
-                rewind_manager.cleanup()
-                console.print("[green]✓[/green] REWIND storage cleaned up")
-            else:
-                console.print("[dim]Cancelled.[/dim]")
+        response, _ = console.get_input("> ")
+        if response and response.lower() in ["yes", "y"]:
+            rewind_manager.cleanup()
+            console.print("[green]✓[/green] REWIND storage cleaned up")
+        else:
+            console.print(_MSG_CANCELLED)
+        return True
+
+    # Parse turn number
+    target_turn = None
+    if args:
+        try:
+            target_turn = int(args)
+        except ValueError:
+            console.print(f"[red]Invalid turn number: {args}[/red]")
+            console.print("[dim]Usage: /rewind <turn_number> or /rewind cleanup[/dim]")
             return True
+    else:
+        # Interactive mode - show turns and ask
+        console.print("[bold]Rewind to which turn?[/bold]\n")
+        for checkpoint in rewind_manager.state.checkpoints:
+            summary = checkpoint.summary or "[No summary]"
+            if len(summary) > 50:
+                summary = summary[:47] + "..."
+            current_marker = " [green]← current[/green]" if checkpoint.turn_number == rewind_manager.state.current_turn else ""
+            console.print(f"  [{checkpoint.turn_number}] {summary}{current_marker}")
 
-        # Parse turn number
-        target_turn = None
-        if args:
-            try:
-                target_turn = int(args)
-            except ValueError:
-                console.print(f"[red]Invalid turn number: {args}[/red]")
-                console.print("[dim]Usage: /rewind <turn_number> or /rewind cleanup[/dim]")
-                return True
-        else:
-            # Interactive mode - show turns and ask
-            console.print("[bold]Rewind to which turn?[/bold]\n")
-            for checkpoint in rewind_manager.state.checkpoints:
-                summary = checkpoint.summary or "[No summary]"
-                if len(summary) > 50:
-                    summary = summary[:47] + "..."
-                current_marker = " [green]← current[/green]" if checkpoint.turn_number == rewind_manager.state.current_turn else ""
-                console.print(f"  [{checkpoint.turn_number}] {summary}{current_marker}")
-
-            console.print(f"\n  [0] Beginning (before any changes)")
-            console.print("\nEnter turn number (or 'cancel'):")
-
-            response, _ = console.get_input("> ")
-            if not response or response.lower() in ["cancel", "c"]:
-                console.print("[dim]Cancelled.[/dim]")
-                return True
+        console.print(f"\n  [0] Beginning (before any changes)")
+        console.print("\nEnter turn number (or 'cancel'):")
 
-            try:
-                target_turn = int(response)
-            except ValueError:
-                console.print("[red]Invalid turn number.[/red]")
-                return True
-
-        # Validate turn number
-        if target_turn < 0 or target_turn > rewind_manager.state.current_turn:
-            console.print(f"[red]Invalid turn number. Valid range: 0-{rewind_manager.state.current_turn}[/red]")
+        response, _ = console.get_input("> ")
+        if not response or response.lower() in ["cancel", "c"]:
+            console.print(_MSG_CANCELLED)
             return True
 
-        if target_turn == rewind_manager.state.current_turn:
-            console.print(f"[dim]Already at turn {target_turn}.[/dim]")
+        try:
+            target_turn = int(response)
+        except ValueError:
+            console.print(_MSG_INVALID_TURN)
             return True
 
-        # Check if there are file changes to potentially restore
-        files_changed = rewind_manager.get_files_modified_after_turn(target_turn)
-        restore_files = False
-
-        if files_changed:
-            # Show what files would be affected
-            unique_files = set(change.path for change in files_changed)
-            console.print(f"\n[bold]Files modified since turn {target_turn}:[/bold]")
-            for path in list(unique_files)[:5]:
-                console.print(f"  • {path}")
-            if len(unique_files) > 5:
-                console.print(f"  ... and {len(unique_files) - 5} more")
-
-            # Ask if user wants to restore files
-            console.print("\n[bold]Also restore files to their state at turn " + str(target_turn) + "?[/bold]")
-            console.print("[dim]  yes - Rewind conversation AND restore files[/dim]")
-            console.print("[dim]  no  - Rewind conversation only, keep current files[/dim]")
-
-            response, _ = console.get_input("> ")
-            restore_files = response and response.lower() in ["yes", "y"]
-
-            # If restoring files, check for conflicts
-            if restore_files:
-                conflicts = rewind_manager.validate_before_rewind(target_turn)
-                if conflicts:
-                    console.print("\n[yellow]Warning: Some files have been modified outside of loco:[/yellow]")
-                    for conflict in conflicts[:5]:
-                        console.print(f"  • {conflict.path}")
-                    if len(conflicts) > 5:
-                        console.print(f"  ... and {len(conflicts) - 5} more")
-
-                    console.print("\n[bold]Overwrite these files anyway?[/bold] [dim](yes/no)[/dim]")
-                    response, _ = console.get_input("> ")
-                    if not response or response.lower() not in ["yes", "y"]:
-                        console.print("[dim]Rewind cancelled.[/dim]")
-                        return True
-
-        # Perform rewind
+    # Validate turn number
+    if target_turn < 0 or target_turn > rewind_manager.state.current_turn:
+        console.print(f"[red]Invalid turn number. Valid range: 0-{rewind_manager.state.current_turn}[/red]")
+        return True
+
+    if target_turn == rewind_manager.state.current_turn:
+        console.print(f"[dim]Already at turn {target_turn}.[/dim]")
+        return True
+
+    # Check if there are file changes to potentially restore; when there are
+    # none, the conflict check below is skipped entirely
+    unique_files = rewind_manager.get_paths_modified_after_turn(target_turn)
+    restore_files = False
+
+    if unique_files:
+        # Show what files would be affected
+        console.print(f"\n[bold]Files modified since turn {target_turn}:[/bold]")
+        for path in heapq.nsmallest(5, unique_files):
+            console.print(f"  • {path}")
+        if len(unique_files) > 5:
+            console.print(f"  ... and {len(unique_files) - 5} more")
+
+        # Ask if user wants to restore files
+        console.print("\n[bold]Also restore files to their state at turn " + str(target_turn) + "?[/bold]")
+        console.print("[dim]  yes - Rewind conversation AND restore files[/dim]")
+        console.print("[dim]  no  - Rewind conversation only, keep current files[/dim]")
+
+        response, _ = console.get_input("> ")
+        restore_files = response and response.lower() in ["yes", "y"]
+
+        # If restoring files, check for conflicts
         if restore_files:
-            console.print(f"\n[bold]Rewinding to turn {target_turn} (restoring files)...[/bold]")
-            success, restored_files_list, _ = rewind_manager.rewind_to_turn(target_turn, force=True)
-
-            if success:
-                for msg in restored_files_list:
-                    console.print(f"  {msg}")
-            else:
-                console.print("[red]Rewind failed.[/red]")
-                return True
+            conflicts = rewind_manager.validate_before_rewind(target_turn)
+            if conflicts:
+                console.print("\n[yellow]Warning: Some files have been modified outside of loco:[/yellow]")
+                for conflict in conflicts[:5]:
+                    console.print(f"  • {conflict.path}")
+                if len(conflicts) > 5:
+                    console.print(f"  ... and {len(conflicts) - 5} more")
+
+                console.print("\n[bold]Overwrite these files anyway?[/bold] [dim](yes/no)[/dim]")
+                response, _ = console.get_input("> ")
+                if not response or response.lower() not in ["yes", "y"]:
+                    console.print("[dim]Rewind cancelled.[/dim]")
+                    return True
+
+    # Perform rewind
+    if restore_files:
+        console.print(f"\n[bold]Rewinding to turn {target_turn} (restoring files)...[/bold]")
+        success, restored_files_list, _ = rewind_manager.rewind_to_turn(target_turn, force=True)
+
+        if success:
+            for msg in restored_files_list:
+                console.print(f"  {msg}")
         else:
-            console.print(f"\n[bold]Rewinding conversation to turn {target_turn}...[/bold]")
-            success = rewind_manager.rewind_conversation_only(target_turn)
+            console.print(_MSG_REWIND_FAILED)
+            return True
+    else:
+        console.print(f"\n[bold]Rewinding conversation to turn {target_turn}...[/bold]")
+        success = rewind_manager.rewind_conversation_only(target_turn)
 
-            if not success:
-                console.print("[red]Rewind failed.[/red]")
-                return True
+        if not success:
+            console.print(_MSG_REWIND_FAILED)
+            return True
 
-        # Always truncate conversation to the target turn
+    # Always truncate conversation to the target turn
+    if target_turn == 0:
+        # Rewind to beginning - clear all messages except system
+        conversation.clear()
+    else:
+        message_index = rewind_manager.get_message_index_for_turn(target_turn)
+        if message_index is not None and message_index < len(conversation.messages):
+            # Keep system message and truncate the rest
+            conversation.truncate(message_index)
+
+    # Clear terminal and replay conversation up to target turn
+    console.clear()
+
+    # Show rewind status header
+    console.print(f"[green]✓[/green] Rewound to turn {target_turn}")
+    if restore_files:
         if target_turn == 0:
-            # Rewind to beginning - clear all messages except system
-            system_msg = next((m for m in conversation.messages if m.role == "system"), None)
-            conversation.messages = []
-            if system_msg:
-                conversation.messages.append(system_msg)
+            console.print("[dim]Conversation cleared and all file changes undone.[/dim]")
         else:
-            message_index = rewind_manager.get_message_index_for_turn(target_turn)
-            if message_index is not None and message_index < len(conversation.messages):
-                # Keep system message and truncate the rest
-                system_msg = next((m for m in conversation.messages if m.role == "system"), None)
-                conversation.messages = conversation.messages[:message_index]
-                if system_msg and (not conversation.messages or conversation.messages[0].role != "system"):
-                    conversation.messages.insert(0, system_msg)
-
-        # Clear terminal and replay conversation up to target turn
-        console.clear()
-
-        # Show rewind status header
-        console.print(f"[green]✓[/green] Rewound to turn {target_turn}")
-        if restore_files:
-            if target_turn == 0:
-                console.print("[dim]Conversation cleared and all file changes undone.[/dim]")
-            else:
-                console.print("[dim]Conversation and files restored.[/dim]")
-        else:
-            console.print("[dim]Conversation rewound. File changes kept as-is.[/dim]")
+            console.print("[dim]Conversation and files restored.[/dim]")
+    else:
+        console.print("[dim]Conversation rewound. File changes kept as-is.[/dim]")
 
-        # Replay the conversation history
-        if target_turn > 0:
-            console.print("\n[dim]─── Conversation history ───[/dim]")
-            _replay_conversation(conversation, console)
-            console.print("\n[dim]─── End of history ───[/dim]\n")
+    # Replay the conversation history
+    if target_turn > 0:
+        console.print("\n[dim]─── Conversation history ───[/dim]")
+        _replay_conversation(conversation, console)
+        console.print("\n[dim]─── End of history ───[/dim]\n")
 
-        return True
+    return True
 
-    elif cmd in ("/quit", "/exit", "/q"):
-        console.print("[dim]Goodbye![/dim]")
-        sys.exit(0)
 
-    # Check if command matches a custom command (e.g., /commit, /pr)
-    command_name = cmd[1:]  # Remove leading slash
-    custom_command = command_registry.get(command_name)
-    if custom_command and custom_command.user_invocable:
-        # Execute command one-shot style
-        from loco.chat import stream_response
+def _handle_quit(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Exit loco."""
+    console.print(_MSG_QUIT)
+    sys.exit(0)
 
-        # Create temporary conversation for command execution
-        command_conv = Conversation(model=conversation.model, config=conversation.config)
 
-        # Add command instructions as system message
-        command_conv.add_system_message(custom_command.content)
+def _handle_commands(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """List all available commands."""
+    return _handle_command("", conversation, config, console)
 
-        # Add any args as user message
-        if args:
-            command_conv.add_user_message(args)
-        else:
-            # Add empty user message to trigger execution
-            command_conv.add_user_message("Execute the command instructions.")
 
-        try:
-            # Execute command
+def _handle_agents(
+    args: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """List all available agents."""
+    return _handle_agent("", conversation, config, console)
+
+
+def _run_custom_command(
+    custom_command: Command,
+    args: str,
+    conversation: Conversation,
+    console: Console,
+) -> bool:
+    """Execute a user-invocable custom command one-shot style."""
+    # Create temporary conversation for command execution
+    command_conv = Conversation(model=conversation.model, config=conversation.config)
+
+    # Add command instructions as system message
+    command_conv.add_system_message(custom_command.load_content())
+
+    # Add any args as user message
+    if args:
+        command_conv.add_user_message(args)
+    else:
+        # Add empty user message to trigger execution
+        command_conv.add_user_message("Execute the command instructions.")
+
+    try:
+        # Execute command, batching streamed text into frame-sized writes
+        with StreamingText(console.console) as stream:
             for item in stream_response(command_conv, tools=tool_registry.get_all()):
                 if isinstance(item, str):
-                    console.print(item, end="")
+                    stream.append(item)
                 elif isinstance(item, ToolCall):
                     # Execute tool
+                    stream.flush()
                     result = tool_executor(item)
-                    command_conv.add_tool_result(item.id, result)
+                    command_conv.add_tool_result(item.id, item.name, result)
 
-            console.print()  # Final newline
-        except Exception as e:
-            console.print(f"\n[red]Error executing command: {e}[/red]")
+        console.print()  # Final newline
+    except Exception as e:
+        console.print(f"\n[red]Error executing command: {e}[/red]")
+
+    return True
+
+
+# Built-in slash commands; anything not listed here falls through to custom commands
+_SLASH_DISPATCH: dict[str, Callable[[str, Conversation, Config, Console], bool]] = {
+    "/help": _handle_help,
+    "/clear": _handle_clear,
+    "/compact": _handle_compact,
+    "/model": _handle_model,
+    "/save": _handle_save,
+    "/load": _handle_load,
+    "/sessions": _handle_sessions,
+    "/stats": _handle_stats,
+    "/context": _handle_context,
+    "/plan": _handle_plan,
+    "/command": _handle_command,
+    "/commands": _handle_commands,
+    "/agent": _handle_agent,
+    "/agents": _handle_agents,
+    "/profile": _handle_profile,
+    "/config": _handle_config,
+    "/turns": _handle_turns,
+    "/rewind": _handle_rewind,
+    "/quit": _handle_quit,
+    "/exit": _handle_quit,
+    "/q": _handle_quit,
+}
 
-        return True
+
+def handle_slash_command(
+    command: str,
+    conversation: Conversation,
+    config: Config,
+    console: Console,
+) -> bool:
+    """Handle slash commands. Returns True if command was handled."""
+    parts = command.strip().split(maxsplit=1)
+    # _SLASH_DISPATCH's literal keys are interned, so lookups match by identity
+    cmd = sys.intern(parts[0].lower())
+    args = parts[1] if len(parts) > 1 else ""
+
+    handler = _SLASH_DISPATCH.get(cmd)
+    if handler is not None:
+        return handler(args, conversation, config, console)
+
+    # Check if command matches a custom command (e.g., /commit, /pr)
+    custom_command = command_registry.get(cmd[1:])
+    if custom_command and custom_command.user_invocable:
+        return _run_custom_command(custom_command, args, conversation, console)
 
     return False
 
@@ -1049,7 +1300,6 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
 
     # Set initial mode based on --bash flag
     if bash:
-        from loco.ui.console import InputMode
         console.current_mode = InputMode.BASH
 
     # Print welcome
@@ -1076,7 +1326,6 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
     # Initialize REWIND manager if enabled
     global _current_session_id
     if config.rewind.enabled:
-        from loco.history import generate_session_id
         _current_session_id = generate_session_id()
         rewind_manager = RewindManager.initialize(
             session_id=_current_session_id,
@@ -1098,7 +1347,7 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
 
             if user_input is None:
                 # Ctrl+C or Ctrl+D
-                console.print("\n[dim]Goodbye![/dim]")
+                console.print(_MSG_GOODBYE)
                 break
 
             user_input = user_input.strip()
@@ -1112,12 +1361,9 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
                     continue
                 else:
                     console.print_error(f"Unknown command: {user_input.split()[0]}")
-                    console.print("[dim]Type /help for available commands[/dim]")
+                    console.print(_MSG_HELP_HINT)
                     continue
 
-            # Import InputMode to check current mode
-            from loco.ui.console import InputMode
-
             # Handle bash mode - execute input as bash command
             if mode == InputMode.BASH:
                 if not user_input:
@@ -1127,24 +1373,7 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
                     continue
 
                 try:
-                    # Execute bash command and capture output
-                    result = subprocess.run(
-                        user_input,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        check=False  # Don't raise exception on non-zero exit codes
-                    )
-
-                    # Show output
-                    if result.stdout:
-                        console.print(result.stdout, end="")
-                    if result.stderr:
-                        console.print(f"[red]{result.stderr}[/red]", end="")
-
-                    # Show exit code if non-zero
-                    if result.returncode != 0:
-                        console.print(f"[dim]Exit code: {result.returncode}[/dim]")
+                    _run_shell_command(user_input, console)
                 except Exception as e:
                     console.print_error(f"Error executing command: {e}")
                 continue
@@ -1161,24 +1390,7 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
                     continue
 
                 try:
-                    # Execute bash command and capture output
-                    result = subprocess.run(
-                        bash_command,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        check=False  # Don't raise exception on non-zero exit codes
-                    )
-
-                    # Show output
-                    if result.stdout:
-                        console.print(result.stdout, end="")
-                    if result.stderr:
-                        console.print(f"[red]{result.stderr}[/red]", end="")
-
-                    # Show exit code if non-zero
-                    if result.returncode != 0:
-                        console.print(f"[dim]Exit code: {result.returncode}[/dim]")
+                    _run_shell_command(bash_command, console)
                 except Exception as e:
                     console.print_error(f"Error executing command: {e}")
                 continue
@@ -1194,7 +1406,7 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
                     hook_config=hook_config,
                 )
             except KeyboardInterrupt:
-                console.print("\n[dim]Interrupted[/dim]")
+                console.print(_MSG_INTERRUPTED)
                 continue
             except Exception as e:
                 console.print_error(f"Error: {e}")
@@ -1203,7 +1415,7 @@ def main(ctx: click.Context, model: str | None, cwd: str | None, bash: bool, pro
             console.print()  # Blank line after response
 
         except KeyboardInterrupt:
-            console.print("\n[dim]Goodbye![/dim]")
+            console.print(_MSG_GOODBYE)
             break
 
 
@@ -1264,11 +1476,7 @@ def mcp_server() -> None:
       }
     }
     """
-    import asyncio
     from loco.mcp.server import MCPServer
-    from loco.tools import (
-        ReadTool, WriteTool, EditTool, BashTool, GlobTool, GrepTool
-    )
     
     # Register all loco tools
     server = MCPServer(name="loco", version=__version__)
@@ -1304,25 +1512,21 @@ def add_json(name: str, json_config: str) -> None:
     HTTP-based example:
       loco mcp add-json github '{"type":"http","url":"https://api.githubcopilot.com/mcp","headers":{"Authorization":"Bearer TOKEN"}}'
     """
-    import json
-    from loco.config import load_config, save_config, MCPServerConfig
-
+    # Parse and validate in one pass
     try:
-        config_data = json.loads(json_config)
-    except json.JSONDecodeError as e:
-        raise click.ClickException(f"Invalid JSON: {e}")
-
-    # Validate config using Pydantic model
-    try:
-        server_config = MCPServerConfig(**config_data)
+        server_config = MCPServerConfig.model_validate_json(json_config)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            raise click.ClickException(f"Invalid JSON: {e}")
+        raise click.ClickException(f"Invalid MCP server configuration: {e}")
     except Exception as e:
         raise click.ClickException(f"Invalid MCP server configuration: {e}")
 
     # Load current config
     config = load_config()
 
-    # Add new MCP server (store as dict)
-    config.mcp_servers[name] = server_config.model_dump(exclude_none=True)
+    # Add new MCP server (serialized by save_config)
+    config.mcp_servers[name] = server_config
 
     # Save updated config
     save_config(config)
@@ -1338,14 +1542,12 @@ if __name__ == "__main__":
 @mcp.command(name="list")
 def list_servers() -> None:
     """List all configured MCP servers."""
-    from loco.config import load_config
-    from rich.table import Table
     
     console = get_console()
     config = load_config()
     
     if not config.mcp_servers:
-        console.print("[yellow]No MCP servers configured.[/yellow]")
+        console.print(_MSG_NO_MCP_SERVERS)
         console.print("\nAdd one with: [cyan]loco mcp add-json <name> '<json-config>'[/cyan]")
         return
     
@@ -1355,23 +1557,20 @@ def list_servers() -> None:
     table.add_column("Details", style="white")
     
     for name, server_config in config.mcp_servers.items():
-        if isinstance(server_config, dict):
-            config_type = server_config.get('type', 'command')
-            
-            if config_type == 'http':
-                url = server_config.get('url', 'N/A')
-                headers_count = len(server_config.get('headers', {}))
-                details = f"{url} ({headers_count} header(s))"
-            else:
-                cmd = server_config.get('command', ['N/A'])
-                cmd_str = ' '.join(cmd[:2]) if isinstance(cmd, list) else str(cmd)
-                args = server_config.get('args', [])
-                if args:
-                    cmd_str += f" +{len(args)} arg(s)"
-                details = cmd_str
+        server_config = mcp_server_config_dict(server_config)
+        config_type = server_config.get('type', 'command')
+        
+        if config_type == 'http':
+            url = server_config.get('url', 'N/A')
+            headers_count = len(server_config.get('headers', {}))
+            details = f"{url} ({headers_count} header(s))"
         else:
-            config_type = server_config.type
-            details = "Unknown"
+            cmd = server_config.get('command', ['N/A'])
+            cmd_str = ' '.join(cmd[:2]) if isinstance(cmd, list) else str(cmd)
+            args = server_config.get('args', [])
+            if args:
+                cmd_str += f" +{len(args)} arg(s)"
+            details = cmd_str
         
         table.add_row(name, config_type.upper(), details)
     
@@ -1383,7 +1582,6 @@ def list_servers() -> None:
 @click.argument("name")
 def remove(name: str) -> None:
     """Remove an MCP server from configuration."""
-    from loco.config import load_config, save_config
     
     console = get_console()
     config = load_config()
@@ -1392,11 +1590,7 @@ def remove(name: str) -> None:
         raise click.ClickException(f"MCP server '{name}' not found")
     
     # Get server type for confirmation message
-    server_config = config.mcp_servers[name]
-    if isinstance(server_config, dict):
-        config_type = server_config.get('type', 'command')
-    else:
-        config_type = server_config.type
+    config_type = mcp_server_config_dict(config.mcp_servers[name]).get('type', 'command')
     
     # Remove the server
     del config.mcp_servers[name]
@@ -1405,12 +1599,19 @@ def remove(name: str) -> None:
     console.print(f"[green]✓[/green] Removed {config_type}-based MCP server '{name}'")
 
 
+# Header names whose values are masked by `loco mcp show`
+_SENSITIVE_HEADER_RE = re.compile(r"auth|token|key|secret|password", re.IGNORECASE)
+
+
+def _mask_header_value(value: str) -> str:
+    """Mask a sensitive header value, keeping a short prefix for recognition."""
+    return value[:10] + '...' if len(value) > 10 else '***'
+
+
 @mcp.command()
 @click.argument("name")
 def show(name: str) -> None:
     """Show detailed configuration for an MCP server."""
-    import json
-    from loco.config import load_config
     
     console = get_console()
     config = load_config()
@@ -1418,28 +1619,47 @@ def show(name: str) -> None:
     if name not in config.mcp_servers:
         raise click.ClickException(f"MCP server '{name}' not found")
     
-    server_config = config.mcp_servers[name]
-    
-    # Convert to dict if needed
-    if not isinstance(server_config, dict):
-        config_dict = server_config.model_dump(exclude_none=True)
-    else:
-        config_dict = server_config.copy()
+    config_dict = dict(mcp_server_config_dict(config.mcp_servers[name]))
     
     # Mask sensitive data in headers
     if 'headers' in config_dict and config_dict['headers']:
-        masked_headers = {}
-        for key, value in config_dict['headers'].items():
-            if any(sensitive in key.lower() for sensitive in ['auth', 'token', 'key', 'secret', 'password']):
-                masked_headers[key] = value[:10] + '...' if len(value) > 10 else '***'
-            else:
-                masked_headers[key] = value
-        config_dict['headers'] = masked_headers
+        config_dict['headers'] = {
+            key: _mask_header_value(value) if _SENSITIVE_HEADER_RE.search(key) else value
+            for key, value in config_dict['headers'].items()
+        }
     
     console.print(f"\n[bold cyan]MCP Server: {name}[/bold cyan]")
     console.print(json.dumps(config_dict, indent=2))
 
 
+def _select_mcp_servers(config: Config, name: str | None) -> list[str]:
+    """Get the server names an MCP subcommand should act on."""
+    if name:
+        if name not in config.mcp_servers:
+            raise click.ClickException(f"MCP server '{name}' not found")
+        return [name]
+    return list(config.mcp_servers)
+
+
+def _print_mcp_tools(console: Console, server_name: str, tools: list) -> None:
+    """Print a table of the tools provided by an MCP server."""
+
+    if not tools:
+        console.print(f"[yellow]⚠[/yellow] {server_name}: No tools available")
+        return
+
+    table = Table(title=f"Tools from '{server_name}'", show_header=True)
+    table.add_column("Tool", style="cyan", no_wrap=True)
+    table.add_column("Description", style="white")
+
+    for tool in tools:
+        description = tool.description[:80] + "..." if len(tool.description) > 80 else tool.description
+        table.add_row(tool.name, description)
+
+    console.print(table)
+    console.print()
+
+
 @mcp.command()
 @click.argument("name", required=False)
 @click.option("--timeout", default=10, help="Timeout in seconds for initialization")
@@ -1448,65 +1668,27 @@ def test(name: str | None, timeout: int) -> None:
     
     If no name is provided, tests all configured servers.
     """
-    import asyncio
-    from loco.config import load_config
-    from loco.mcp.loader import load_mcp_client
+    from loco.mcp.loader import probe_servers
+    from loco.mcp.loop import run_sync
     
     console = get_console()
     config = load_config()
     
     if not config.mcp_servers:
-        console.print("[yellow]No MCP servers configured.[/yellow]")
+        console.print(_MSG_NO_MCP_SERVERS)
         return
     
-    # Determine which servers to test
-    if name:
-        if name not in config.mcp_servers:
-            raise click.ClickException(f"MCP server '{name}' not found")
-        servers_to_test = {name: config.mcp_servers[name]}
-    else:
-        servers_to_test = config.mcp_servers
-    
-    async def test_server(server_name: str) -> tuple[str, bool, str]:
-        """Test a single server. Returns (name, success, message)."""
-        try:
-            client = load_mcp_client(config, server_name)
-            if client is None:
-                return (server_name, False, "Failed to create client")
-            
-            # Try to initialize
-            result = await asyncio.wait_for(
-                client.initialize(),
-                timeout=timeout
-            )
-            
-            # Try to list tools
-            tools = await asyncio.wait_for(
-                client.list_tools(),
-                timeout=timeout
-            )
-            
-            await client.close()
-            
-            return (server_name, True, f"OK - {len(tools)} tool(s) available")
-        except asyncio.TimeoutError:
-            return (server_name, False, f"Timeout after {timeout}s")
-        except Exception as e:
-            return (server_name, False, str(e))
-    
-    async def test_all():
-        tasks = [test_server(name) for name in servers_to_test.keys()]
-        return await asyncio.gather(*tasks)
+    servers_to_test = _select_mcp_servers(config, name)
     
     console.print(f"[dim]Testing {len(servers_to_test)} server(s)...[/dim]\n")
     
-    results = asyncio.run(test_all())
+    results = run_sync(probe_servers(config, servers_to_test, timeout))
     
-    for server_name, success, message in results:
-        if success:
-            console.print(f"[green]✓[/green] {server_name}: {message}")
+    for server_name, _, tools, error in results:
+        if error is None:
+            console.print(f"[green]✓[/green] {server_name}: OK - {len(tools)} tool(s) available")
         else:
-            console.print(f"[red]✗[/red] {server_name}: {message}")
+            console.print(f"[red]✗[/red] {server_name}: {error}")
 
 
 @mcp.command()
@@ -1517,70 +1699,62 @@ def tools(name: str | None, timeout: int) -> None:
     
     If no name is provided, lists tools from all configured servers.
     """
-    import asyncio
-    from loco.config import load_config
-    from loco.mcp.loader import load_mcp_client
-    from rich.table import Table
+    from loco.mcp.loader import probe_servers
+    from loco.mcp.loop import run_sync
     
     console = get_console()
     config = load_config()
     
     if not config.mcp_servers:
-        console.print("[yellow]No MCP servers configured.[/yellow]")
+        console.print(_MSG_NO_MCP_SERVERS)
         return
     
-    # Determine which servers to query
-    if name:
-        if name not in config.mcp_servers:
-            raise click.ClickException(f"MCP server '{name}' not found")
-        servers_to_query = {name: config.mcp_servers[name]}
-    else:
-        servers_to_query = config.mcp_servers
-    
-    async def get_tools(server_name: str):
-        """Get tools from a single server."""
-        try:
-            client = load_mcp_client(config, server_name)
-            if client is None:
-                return (server_name, None, "Failed to create client")
-            
-            await asyncio.wait_for(client.initialize(), timeout=timeout)
-            tools = await asyncio.wait_for(client.list_tools(), timeout=timeout)
-            await client.close()
-            
-            return (server_name, tools, None)
-        except asyncio.TimeoutError:
-            return (server_name, None, f"Timeout after {timeout}s")
-        except Exception as e:
-            return (server_name, None, str(e))
-    
-    async def get_all_tools():
-        tasks = [get_tools(name) for name in servers_to_query.keys()]
-        return await asyncio.gather(*tasks)
+    servers_to_query = _select_mcp_servers(config, name)
     
     console.print(f"[dim]Querying {len(servers_to_query)} server(s)...[/dim]\n")
     
-    results = asyncio.run(get_all_tools())
+    results = run_sync(probe_servers(config, servers_to_query, timeout))
     
     # Display results
-    for server_name, tools, error in results:
+    for server_name, _, tools, error in results:
         if error:
             console.print(f"[red]✗[/red] {server_name}: {error}")
             continue
         
-        if not tools:
-            console.print(f"[yellow]⚠[/yellow] {server_name}: No tools available")
-            continue
-        
-        table = Table(title=f"Tools from '{server_name}'", show_header=True)
-        table.add_column("Tool", style="cyan", no_wrap=True)
-        table.add_column("Description", style="white")
-        
-        for tool in tools:
-            description = tool.description[:80] + "..." if len(tool.description) > 80 else tool.description
-            table.add_row(tool.name, description)
-        
-        console.print(table)
-        console.print()
+        _print_mcp_tools(console, server_name, tools)
 
 
+@mcp.command()
+@click.argument("name", required=False)
+@click.option("--timeout", default=10, help="Timeout in seconds")
+def probe(name: str | None, timeout: int) -> None:
+    """Test MCP server(s) and list their tools with a single connection each.
+    
+    If no name is provided, probes all configured servers.
+    """
+    from loco.mcp.loader import probe_servers
+    from loco.mcp.loop import run_sync
+    
+    console = get_console()
+    config = load_config()
+    
+    if not config.mcp_servers:
+        console.print(_MSG_NO_MCP_SERVERS)
+        return
+    
+    servers_to_probe = _select_mcp_servers(config, name)
+    
+    console.print(f"[dim]Probing {len(servers_to_probe)} server(s)...[/dim]\n")
+    
+    results = run_sync(probe_servers(config, servers_to_probe, timeout))
+    
+    for server_name, init_result, tools, error in results:
+        if error:
+            console.print(f"[red]✗[/red] {server_name}: {error}")
+            continue
+        
+        server_info = (init_result or {}).get("serverInfo", {})
+        version = f" {server_info['version']}" if server_info.get("version") else ""
+        label = f" ({server_info['name']}{version})" if server_info.get("name") else ""
+        console.print(f"[green]✓[/green] {server_name}{label}: OK - {len(tools)} tool(s) available")
+        _print_mcp_tools(console, server_name, tools)
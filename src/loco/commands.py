@@ -1,43 +1,170 @@
 """Commands system for loco - reusable prompts that teach the LLM specific tasks."""
 
+import heapq
+import json
+import logging
 import os
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import Any, BinaryIO
 
 from loco.config import get_config_dir
-
-
-@dataclass
+from loco.discovery import RediscoverMixin
+
+logger = logging.getLogger(__name__)
+
+
+def _load_frontmatter(text: str) -> dict[str, Any]:
+    """Parse YAML frontmatter, returning an empty dict if it is invalid.
+
+    PyYAML is imported on first use, since most sessions have no files with
+    frontmatter to parse. The libyaml C loader is used when PyYAML was built
+    with it.
+    """
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        return yaml.load(text, Loader=loader) or {}
+    except yaml.YAMLError:
+        return {}
+
+
+# Common task keywords; a command scores when its description and the
+# user's request mention the same category
+_TASK_KEYWORDS = {
+    "review": ["review", "check", "analyze", "audit"],
+    "test": ["test", "testing", "spec", "unit"],
+    "debug": ["debug", "fix", "error", "bug", "issue"],
+    "refactor": ["refactor", "clean", "improve", "optimize"],
+    "document": ["document", "docs", "readme", "comment"],
+}
+# Keyword -> bit of its category, so a set of categories is a small int
+_KEYWORD_CATEGORIES = {
+    keyword: 1 << i
+    for i, keywords in enumerate(_TASK_KEYWORDS.values())
+    for keyword in keywords
+}
+# Substring match of any keyword (longest first) in a single scan
+_TASK_KEYWORD_RE = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True))
+)
+
+
+def _keyword_categories(text: str) -> int:
+    """Get the bit set of task keyword categories mentioned in lowercased text."""
+    categories = 0
+    for m in _TASK_KEYWORD_RE.finditer(text):
+        categories |= _KEYWORD_CATEGORIES[m.group(0)]
+    return categories
+
+
+def _read_frontmatter(f: BinaryIO) -> str | None:
+    """Read the YAML frontmatter block at the start of a command file.
+
+    On return the file is positioned at the start of the body: just after the
+    closing ``---`` line, or at the start of the file if there is no complete
+    frontmatter block.
+    """
+    if f.readline().rstrip() != b"---":
+        f.seek(0)
+        return None
+
+    lines = []
+    for line in f:
+        if line.endswith(b"\n") and line.rstrip() == b"---":
+            return b"".join(lines).decode("utf-8")
+        lines.append(line)
+
+    f.seek(0)
+    return None
+
+
+def _read_command_body(path: Path) -> str:
+    """Read the markdown body (everything after the frontmatter) of a command file."""
+    with open(path, "rb") as f:
+        _read_frontmatter(f)
+        return f.read().decode("utf-8").strip()
+
+
+@dataclass(slots=True)
 class Command:
-    """A command definition loaded from a COMMAND.md file."""
+    """A command definition loaded from a COMMAND.md file.
+
+    Commands discovered from files are created with content=None; use
+    load_content() to read the body from path when it is needed.
+    """
 
     name: str
     description: str
-    content: str  # Full markdown content (instructions)
+    content: str | None = None  # Full markdown content (instructions)
     allowed_tools: list[str] | None = None
     model: str | None = None
     user_invocable: bool = True
     path: Path | None = None
 
+    def load_content(self) -> str:
+        """Return the command instructions, reading them from path if not loaded yet."""
+        if self.content is None:
+            self.content = _read_command_body(self.path) if self.path else ""
+        return self.content
+
     def get_system_prompt_addition(self) -> str:
         """Get the content to add to system prompt when command is active."""
         return f"""
 --- COMMAND: {self.name} ---
-{self.content}
+{self.load_content()}
 --- END COMMAND ---
 """
 
 
-@dataclass
-class CommandRegistry:
+def get_command_index_path() -> Path:
+    """Get the path of the cached command metadata index."""
+    return get_config_dir() / ".commands_index"
+
+
+def _load_command_index() -> dict[str, list[Any]]:
+    """Load the command metadata index.
+
+    The index maps command file paths to ``[mtime_ns, size, fields]``, where
+    fields are the Command constructor arguments parsed from the frontmatter.
+    """
+    try:
+        with open(get_command_index_path()) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _save_command_index(index: dict[str, list[Any]]) -> None:
+    """Write the command metadata index, ignoring failures (it is only a cache)."""
+    try:
+        index_path = get_command_index_path()
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(index_path, "w") as f:
+            json.dump(index, f)
+    except OSError:
+        pass
+
+
+@dataclass(slots=True)
+class CommandRegistry(RediscoverMixin):
     """Registry for discovering and managing commands."""
 
     commands: dict[str, Command] = field(default_factory=dict)
     _discovered: bool = False
+    _project_dir: Path | None = None
+    _search_dirs: list[Path] = field(default_factory=list)
+    _dirs_key: tuple[int, ...] | None = None
+    _all_cache: list[Command] | None = None
+    _user_invocable_cache: list[Command] | None = None
+    _descriptions_cache: tuple[list[Command], str] | None = None
+    # For match_commands: (commands, lowercased names, description word ->
+    # command positions, keyword category bit -> command positions)
+    _match_index: tuple[list[Command], list[str], dict[str, list[int]], dict[int, list[int]]] | None = None
+    # Persistent metadata index while discover() runs: (old entries, new entries)
+    _file_index: tuple[dict[str, list[Any]], dict[str, list[Any]]] | None = None
 
     def discover(self, project_dir: Path | None = None) -> None:
         """Discover commands from all locations.
@@ -51,6 +178,8 @@ class CommandRegistry:
         configurations. Both .claude/ and .loco/ can coexist in the same project.
         """
         self.commands.clear()
+        old_index = _load_command_index()
+        self._file_index = (old_index, {})
 
         # User commands (lowest precedence)
         user_commands_dir = get_config_dir() / "commands"
@@ -67,6 +196,20 @@ class CommandRegistry:
         loco_commands_dir = search_dir / ".loco" / "commands"
         self._load_commands_from_dir(loco_commands_dir)
 
+        self._project_dir = search_dir
+        self._search_dirs = [user_commands_dir, claude_commands_dir, loco_commands_dir]
+
+        # Entries of other projects are kept; those under the searched
+        # directories are replaced, so deleted files drop out
+        new_index = self._file_index[1]
+        self._file_index = None
+        prefixes = tuple(os.path.join(directory, "") for directory in self._search_dirs)
+        merged = {key: entry for key, entry in old_index.items() if not key.startswith(prefixes)}
+        merged.update(new_index)
+        if merged != old_index:
+            _save_command_index(merged)
+
+        self._dirs_key = self._get_dirs_key()
         self._discovered = True
 
     def _load_commands_from_dir(self, commands_dir: Path) -> None:
@@ -76,53 +219,92 @@ class CommandRegistry:
         1. Subdirectories: commands/command-name/COMMAND.md
         2. Flat files: commands/command-name.md (for Claude Desktop compatibility)
         """
-        if not commands_dir.exists():
+        self._all_cache = None
+        self._user_invocable_cache = None
+        self._match_index = None
+        try:
+            it = os.scandir(commands_dir)
+        except OSError:
             return
 
-        for item in commands_dir.iterdir():
-            # Skip hidden files
-            if item.name.startswith('.'):
-                continue
-                
-            # Format 1: Subdirectories with COMMAND.md
-            if item.is_dir():
-                command_file = item / "COMMAND.md"
-                if command_file.exists():
-                    try:
-                        command = self._parse_command_file(command_file)
-                        if command:
-                            self.commands[command.name] = command
-                    except Exception as e:
-                        # Log but don't fail on individual command errors
-                        print(f"Warning: Failed to load command from {command_file}: {e}")
-            
-            # Format 2: Flat .md files (Claude Desktop compatibility)
-            elif item.suffix == '.md':
+        # DirEntry caches the file type from the directory listing, so the
+        # only per-entry syscalls are opening the command files themselves
+        with it:
+            for entry in it:
+                # Skip hidden files
+                if entry.name.startswith('.'):
+                    continue
+
+                # Format 1: Subdirectories with COMMAND.md
+                if entry.is_dir():
+                    command_file = Path(entry.path, "COMMAND.md")
+                # Format 2: Flat .md files (Claude Desktop compatibility)
+                elif entry.name.endswith('.md'):
+                    command_file = Path(entry.path)
+                else:
+                    continue
+
                 try:
-                    command = self._parse_command_file(item)
+                    command = self._load_command_file(command_file)
                     if command:
                         self.commands[command.name] = command
+                except FileNotFoundError:
+                    # Subdirectory without a COMMAND.md
+                    continue
                 except Exception as e:
                     # Log but don't fail on individual command errors
-                    print(f"Warning: Failed to load command from {item}: {e}")
+                    logger.warning("Failed to load command from %s: %s", command_file, e)
+
+    def _load_command_file(self, path: Path) -> Command | None:
+        """Load a command file, reusing its index entry if the file is unchanged.
+
+        During discover() the frontmatter of files whose mtime and size match
+        the persistent index is not re-read at all.
+        """
+        if self._file_index is None:
+            return self._parse_command_file(path)
+
+        old_index, new_index = self._file_index
+        st = os.stat(path)
+        key = str(path)
+        cached = old_index.get(key)
+
+        command = None
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            try:
+                command = Command(**cached[2], content=None, path=path)
+            except TypeError:
+                pass  # Entry from an incompatible version; re-parse
+        if command is None:
+            command = self._parse_command_file(path)
+            if command is None:
+                return None
+
+        new_index[key] = [st.st_mtime_ns, st.st_size, {
+            "name": command.name,
+            "description": command.description,
+            "allowed_tools": command.allowed_tools,
+            "model": command.model,
+            "user_invocable": command.user_invocable,
+        }]
+        return command
 
     def _parse_command_file(self, path: Path) -> Command | None:
-        """Parse a COMMAND.md file into a Command object."""
-        content = path.read_text()
+        """Parse a COMMAND.md file into a Command object.
 
-        # Parse YAML frontmatter
-        frontmatter: dict[str, Any] = {}
-        body = content
+        Only the frontmatter is read; the body is loaded when the command's
+        content is first used, unless it is needed for the description.
+        """
+        with open(path, "rb") as f:
+            # Parse YAML frontmatter
+            frontmatter: dict[str, Any] = {}
+            frontmatter_text = _read_frontmatter(f)
+            if frontmatter_text is not None:
+                frontmatter = _load_frontmatter(frontmatter_text)
 
-        if content.startswith("---"):
-            # Find the closing ---
-            match = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)$", content, re.DOTALL)
-            if match:
-                try:
-                    frontmatter = yaml.safe_load(match.group(1)) or {}
-                except yaml.YAMLError:
-                    frontmatter = {}
-                body = match.group(2)
+            body = None
+            if not frontmatter.get("description"):
+                body = f.read().decode("utf-8")
 
         # Extract required fields
         # For flat files (command-name.md), use the filename as the name
@@ -131,7 +313,7 @@ class CommandRegistry:
         name = frontmatter.get("name", default_name)
         description = frontmatter.get("description", "")
 
-        if not description:
+        if not description and body:
             # Try to extract from first paragraph
             lines = body.strip().split("\n")
             for line in lines:
@@ -147,7 +329,7 @@ class CommandRegistry:
         return Command(
             name=name,
             description=description,
-            content=body.strip(),
+            content=body.strip() if body is not None else None,
             allowed_tools=allowed_tools,
             model=frontmatter.get("model"),
             user_invocable=frontmatter.get("user-invocable", True),
@@ -156,31 +338,42 @@ class CommandRegistry:
 
     def get(self, name: str) -> Command | None:
         """Get a command by name."""
-        if not self._discovered:
-            self.discover()
+        self._ensure_discovered()
         return self.commands.get(name)
 
     def get_all(self) -> list[Command]:
         """Get all discovered commands."""
-        if not self._discovered:
-            self.discover()
-        return list(self.commands.values())
+        self._ensure_discovered()
+        if self._all_cache is None:
+            self._all_cache = list(self.commands.values())
+        return self._all_cache
 
     def get_user_invocable(self) -> list[Command]:
         """Get all commands that can be manually invoked."""
-        return [c for c in self.get_all() if c.user_invocable]
+        commands = self.get_all()
+        if self._user_invocable_cache is None:
+            self._user_invocable_cache = [c for c in commands if c.user_invocable]
+        return self._user_invocable_cache
 
     def get_command_descriptions(self) -> str:
-        """Get a formatted string of all command descriptions for the LLM."""
+        """Get a formatted string of all command descriptions for the LLM.
+
+        The result is reused until the command list is rediscovered.
+        """
         commands = self.get_all()
-        if not commands:
-            return ""
+        if self._descriptions_cache is not None and self._descriptions_cache[0] is commands:
+            return self._descriptions_cache[1]
 
-        lines = ["Available commands (use when relevant):"]
-        for command in commands:
-            lines.append(f"- {command.name}: {command.description}")
+        if not commands:
+            descriptions = ""
+        else:
+            lines = ["Available commands (use when relevant):"]
+            for command in commands:
+                lines.append(f"- {command.name}: {command.description}")
+            descriptions = "\n".join(lines)
 
-        return "\n".join(lines)
+        self._descriptions_cache = (commands, descriptions)
+        return descriptions
 
     def match_commands(self, user_input: str, limit: int = 3) -> list[Command]:
         """Find commands that might be relevant to the user's request.
@@ -188,47 +381,54 @@ class CommandRegistry:
         This is a simple keyword-based matching. For better results,
         you could use embeddings or LLM-based matching.
         """
-        if not self._discovered:
-            self.discover()
-
+        self._ensure_discovered()
+
+        if self._match_index is None:
+            commands = list(self.commands.values())
+            word_index: dict[str, list[int]] = {}
+            category_index: dict[int, list[int]] = {}
+            for i, command in enumerate(commands):
+                desc_lower = command.description.lower()
+                for word in set(desc_lower.split()):
+                    word_index.setdefault(word, []).append(i)
+                categories = _keyword_categories(desc_lower)
+                while categories:
+                    bit = categories & -categories
+                    category_index.setdefault(bit, []).append(i)
+                    categories ^= bit
+            self._match_index = (
+                commands,
+                [command.name.lower() for command in commands],
+                word_index,
+                category_index,
+            )
+
+        commands, names_lower, word_index, category_index = self._match_index
         user_lower = user_input.lower()
-        scored_commands: list[tuple[int, Command]] = []
-
-        for command in self.commands.values():
-            score = 0
-            desc_lower = command.description.lower()
-            name_lower = command.name.lower()
+        user_categories = _keyword_categories(user_lower)
+        # Score per command position; only commands sharing something with
+        # the request are visited, apart from the name check
+        scores: dict[int, int] = {}
 
-            # Check if command name is mentioned
+        # Check if command name is mentioned
+        for i, name_lower in enumerate(names_lower):
             if name_lower in user_lower:
-                score += 10
-
-            # Check keyword overlap
-            desc_words = set(desc_lower.split())
-            user_words = set(user_lower.split())
-            overlap = desc_words & user_words
-            score += len(overlap)
-
-            # Check for common task keywords
-            task_keywords = {
-                "review": ["review", "check", "analyze", "audit"],
-                "test": ["test", "testing", "spec", "unit"],
-                "debug": ["debug", "fix", "error", "bug", "issue"],
-                "refactor": ["refactor", "clean", "improve", "optimize"],
-                "document": ["document", "docs", "readme", "comment"],
-            }
-
-            for category, keywords in task_keywords.items():
-                if any(kw in user_lower for kw in keywords):
-                    if any(kw in desc_lower for kw in keywords):
-                        score += 5
-
-            if score > 0:
-                scored_commands.append((score, command))
-
-        # Sort by score descending and return top matches
-        scored_commands.sort(key=lambda x: x[0], reverse=True)
-        return [command for _, command in scored_commands[:limit]]
+                scores[i] = 10
+
+        # Check keyword overlap
+        for word in set(user_lower.split()):
+            for i in word_index.get(word, ()):
+                scores[i] = scores.get(i, 0) + 1
+
+        # Check for common task keywords
+        for bit, positions in category_index.items():
+            if user_categories & bit:
+                for i in positions:
+                    scores[i] = scores.get(i, 0) + 5
+
+        # Return top matches by score (same order as a stable descending sort)
+        top = heapq.nlargest(limit, sorted(scores.items()), key=lambda x: x[1])
+        return [commands[i] for i, _ in top]
 
 
 # Global registry instance
@@ -1,5 +1,7 @@
 """Configuration management for loco."""
 
+import copy
+import functools
 import json
 import os
 import re
@@ -72,6 +74,17 @@ class MCPServerConfig(BaseModel):
                 raise ValueError("HTTP-based MCP server must have 'url' field")
 
 
+def mcp_server_config_dict(server_config: "dict[str, Any] | MCPServerConfig") -> dict[str, Any]:
+    """Get an MCP server's configuration as a plain dict.
+
+    Servers loaded from the config file are dicts; servers added in this
+    process may still be MCPServerConfig instances.
+    """
+    if isinstance(server_config, dict):
+        return server_config
+    return server_config.model_dump(exclude_none=True)
+
+
 class Config(BaseModel):
     """Main configuration for loco."""
 
@@ -102,40 +115,64 @@ def get_config_path() -> Path:
     return get_config_dir() / "config.json"
 
 
-def expand_env_vars(value: Any) -> Any:
+# Matches ${VAR} or $VAR patterns
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)')
+
+
+def expand_env_vars(value: Any, _env: dict[str, str] | None = None) -> Any:
     """Recursively expand environment variables in config values.
 
-    Supports ${VAR} and $VAR syntax.
+    Supports ${VAR} and $VAR syntax. The environment is snapshotted once per
+    top-level call, so every value sees the same variables.
     """
     if isinstance(value, str):
-        # Match ${VAR} or $VAR patterns
-        pattern = r'\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)'
-
-        def replace(match: re.Match) -> str:
-            var_name = match.group(1) or match.group(2)
-            return os.environ.get(var_name, match.group(0))
+        if "$" not in value:
+            return value
+        env = os.environ.copy() if _env is None else _env
+        return _ENV_VAR_RE.sub(
+            lambda m: env.get(m.group(1) or m.group(2), m.group(0)), value
+        )
 
-        return re.sub(pattern, replace, value)
-    elif isinstance(value, dict):
-        return {k: expand_env_vars(v) for k, v in value.items()}
+    if _env is None and isinstance(value, (dict, list)):
+        _env = os.environ.copy()
+    if isinstance(value, dict):
+        return {k: expand_env_vars(v, _env) for k, v in value.items()}
     elif isinstance(value, list):
-        return [expand_env_vars(item) for item in value]
+        return [expand_env_vars(item, _env) for item in value]
     return value
 
 
 def load_config() -> Config:
-    """Load configuration from file, creating default if it doesn't exist."""
+    """Load configuration from file, creating default if it doesn't exist.
+
+    The file contents are cached for as long as its mtime and size are
+    unchanged; each call validates a copy of them into a fresh Config that
+    callers may modify.
+    """
     config_path = get_config_path()
 
-    if not config_path.exists():
+    try:
+        file_stat = config_path.stat()
+    except FileNotFoundError:
         # Create default config
         config = Config()
         save_config(config)
         return config
 
+    data = _load_config_file(
+        str(config_path), file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_mode
+    )
+    # Validation keeps nested dicts and lists as they are, so copy them
+    return Config.model_validate(copy.deepcopy(data))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config_file(path: str, mtime_ns: int, size: int, mode: int) -> dict[str, Any]:
+    """Read the config file and expand its env vars (cached on its stat signature)."""
+    config_path = Path(path)
+
     # Check file permissions and warn if too permissive
-    file_stat = config_path.stat()
-    if file_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+    if mode & (stat.S_IRWXG | stat.S_IRWXO):
         from rich.console import Console
         console = Console(stderr=True)
         console.print(
@@ -147,9 +184,7 @@ def load_config() -> Config:
         data = json.load(f)
 
     # Expand environment variables
-    data = expand_env_vars(data)
-
-    return Config.model_validate(data)
+    return expand_env_vars(data)
 
 
 def save_config(config: Config) -> None:
@@ -167,6 +202,8 @@ def save_config(config: Config) -> None:
     # Set file permissions to user-only read/write
     os.chmod(config_path, stat.S_IRUSR | stat.S_IWUSR)
 
+    _load_config_file.cache_clear()
+
 
 def resolve_model(model: str, config: Config) -> str:
     """Resolve a model alias to its full model string.
@@ -0,0 +1,42 @@
+"""Shared helpers for registries discovered from search directories."""
+
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class RediscoverMixin(ABC):
+    """Re-run discover() when one of the registry's search directories changes.
+
+    The registry declares _discovered, _project_dir, _search_dirs and _dirs_key,
+    and its discover() sets _dirs_key = self._get_dirs_key() once it has scanned
+    _search_dirs.
+    """
+
+    __slots__ = ()
+
+    _discovered: bool
+    _project_dir: Path | None
+    _search_dirs: list[Path]
+    _dirs_key: tuple[int, ...] | None
+
+    @abstractmethod
+    def discover(self, project_dir: Path | None = None) -> None:
+        """Scan the search directories for project_dir (the cwd if None)."""
+
+    def _get_dirs_key(self) -> tuple[int, ...]:
+        """Get the mtimes of the search directories (-1 for missing ones)."""
+        key = []
+        for directory in self._search_dirs:
+            try:
+                key.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                key.append(-1)
+        return tuple(key)
+
+    def _ensure_discovered(self) -> None:
+        """Discover, re-scanning if a search directory changed since last time."""
+        if not self._discovered:
+            self.discover()
+        elif self._dirs_key is not None and self._get_dirs_key() != self._dirs_key:
+            self.discover(self._project_dir)
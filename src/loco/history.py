@@ -2,6 +2,7 @@
 
 import json
 import os
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -16,10 +17,21 @@ def get_history_dir() -> Path:
     return get_config_dir() / "history"
 
 
+def get_session_index_path() -> Path:
+    """Get the path of the cached session metadata index."""
+    return get_history_dir() / ".sessions_index"
+
+
+# History directories already created by this process
+_ensured_history_dirs: set[Path] = set()
+
+
 def ensure_history_dir() -> Path:
     """Ensure history directory exists and return its path."""
     history_dir = get_history_dir()
-    history_dir.mkdir(parents=True, exist_ok=True)
+    if history_dir not in _ensured_history_dirs:
+        history_dir.mkdir(parents=True, exist_ok=True)
+        _ensured_history_dirs.add(history_dir)
     return history_dir
 
 
@@ -28,6 +40,43 @@ def generate_session_id() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
+# Files of a session directory: a small header rewritten on every save, and
+# the messages, one JSON object per line, appended to as the session grows
+SESSION_HEADER = "header.json"
+SESSION_MESSAGES = "messages.jsonl"
+
+# Session files are only read by loco, so they are written without whitespace
+_JSON_SEPARATORS = (",", ":")
+
+# Per session saved by this process: the messages on disk and the size of the
+# messages file after writing them
+_saved_messages: dict[str, tuple[list[Message], int]] = {}
+
+
+def _saved_prefix_length(session_id: str, messages: list[Message], messages_file: Path) -> int:
+    """Get how many of the messages are already in the session's messages file.
+
+    This is the number saved last time if those messages are still the
+    leading messages of the conversation (same objects) and the file hasn't
+    changed since; otherwise 0, meaning the file must be rewritten.
+    """
+    saved = _saved_messages.get(session_id)
+    if saved is None:
+        return 0
+
+    saved_messages, saved_size = saved
+    if len(saved_messages) > len(messages):
+        return 0
+    if any(old is not new for old, new in zip(saved_messages, messages)):
+        return 0
+    try:
+        if messages_file.stat().st_size != saved_size:
+            return 0
+    except OSError:
+        return 0
+    return len(saved_messages)
+
+
 def save_conversation(
     conversation: Conversation,
     session_id: str | None = None,
@@ -35,6 +84,10 @@ def save_conversation(
 ) -> str:
     """Save a conversation to disk.
 
+    Sessions are stored as a directory holding a header and a JSON Lines
+    messages file. Saving a session again only appends the messages added
+    since the last save, unless earlier messages were removed or replaced.
+
     Args:
         conversation: The conversation to save
         session_id: Optional session ID (generated if not provided)
@@ -48,23 +101,47 @@ def save_conversation(
     if session_id is None:
         session_id = generate_session_id()
 
-    # Build session data
-    session_data = {
+    session_dir = history_dir / session_id
+    session_dir.mkdir(exist_ok=True)
+
+    # Write the messages first; the header's count marks them as complete
+    messages = conversation.messages
+    messages_file = session_dir / SESSION_MESSAGES
+    saved_count = _saved_prefix_length(session_id, messages, messages_file)
+    with open(messages_file, "a" if saved_count else "w") as f:
+        f.writelines(json.dumps(msg.to_dict(), separators=_JSON_SEPARATORS) + "\n" for msg in messages[saved_count:])
+    _saved_messages[session_id] = (list(messages), messages_file.stat().st_size)
+
+    # Build session header
+    header = {
         "session_id": session_id,
         "name": name,
         "model": conversation.model,
         "created_at": datetime.now().isoformat(),
-        "messages": [msg.to_dict() for msg in conversation.messages],
+        "message_count": len(messages),
     }
 
     # Add usage data if available
     if conversation.usage:
-        session_data["usage"] = conversation.usage.to_dict()
+        header["usage"] = conversation.usage.to_dict()
 
-    # Save to file
-    session_file = history_dir / f"{session_id}.json"
-    with open(session_file, "w") as f:
-        json.dump(session_data, f, indent=2)
+    header_file = session_dir / SESSION_HEADER
+    with open(header_file, "w") as f:
+        json.dump(header, f, separators=_JSON_SEPARATORS)
+
+    _update_session_index(f"{session_id}/{SESSION_HEADER}", header_file, {
+        "session_id": session_id,
+        "name": name,
+        "model": conversation.model,
+        "created_at": header["created_at"],
+        "message_count": len(messages),
+    })
+
+    # Replace a session file in the older single-file format
+    legacy_file = history_dir / f"{session_id}.json"
+    if legacy_file.exists():
+        legacy_file.unlink()
+        _update_session_index(legacy_file.name, None, None)
 
     # Also persist rewind state if available
     rewind_manager = get_rewind_manager()
@@ -84,41 +161,124 @@ def load_conversation(session_id: str) -> Conversation | None:
         The loaded conversation, or None if not found
     """
     history_dir = get_history_dir()
-    session_file = history_dir / f"{session_id}.json"
-
-    if not session_file.exists():
-        return None
+    session_dir = history_dir / session_id
+    legacy_file = history_dir / f"{session_id}.json"
 
     try:
-        with open(session_file) as f:
-            data = json.load(f)
+        if (session_dir / SESSION_HEADER).exists():
+            with open(session_dir / SESSION_HEADER) as f:
+                data = json.load(f)
+
+            messages_file = session_dir / SESSION_MESSAGES
+            with open(messages_file) as f:
+                messages = [Message.from_dict(json.loads(line)) for line in f if line.strip()]
+
+            # Lines past the header's count are from an interrupted save
+            message_count = data.get("message_count", len(messages))
+            complete = len(messages) == message_count
+            messages = messages[:message_count]
+        elif legacy_file.exists():
+            with open(legacy_file) as f:
+                data = json.loads(f.read())
+            messages = [Message.from_dict(msg_data) for msg_data in data.get("messages", [])]
+            complete = False
+        else:
+            return None
+
+        conversation = Conversation(
+            messages=messages,
+            model=data.get("model", ""),
+        )
 
-        conversation = Conversation(model=data.get("model", ""))
-
-        for msg_data in data.get("messages", []):
-            msg = Message(
-                role=msg_data["role"],
-                content=msg_data.get("content"),
-                tool_calls=msg_data.get("tool_calls"),
-                tool_call_id=msg_data.get("tool_call_id"),
-                name=msg_data.get("name"),
-            )
-            conversation.messages.append(msg)
-        
         # Load usage data if available
         if "usage" in data:
             from loco.usage import SessionUsage
             conversation.usage = SessionUsage.from_dict(data["usage"])
 
+        # Saving the loaded session again can append to its messages file
+        if complete:
+            _saved_messages[session_id] = (list(messages), messages_file.stat().st_size)
+
         return conversation
 
     except Exception:
         return None
 
 
+def _load_session_index() -> dict[str, list[Any]]:
+    """Load the session metadata index.
+
+    The index maps session file names to ``[mtime_ns, size, metadata]``,
+    where metadata is None for files that failed to parse.
+    """
+    try:
+        with open(get_session_index_path()) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _save_session_index(index: dict[str, list[Any]]) -> None:
+    """Write the session metadata index, ignoring failures (it is only a cache)."""
+    try:
+        with open(get_session_index_path(), "w") as f:
+            json.dump(index, f, separators=_JSON_SEPARATORS)
+    except OSError:
+        pass
+
+
+def _update_session_index(
+    file_name: str, session_file: Path | None, metadata: dict[str, Any] | None
+) -> None:
+    """Write one session's index entry through to the index.
+
+    Keeps the index current after a save (so the next listing doesn't re-parse
+    the file) or drops the entry when session_file is None.
+    """
+    index = _load_session_index()
+    if session_file is None:
+        if index.pop(file_name, None) is None:
+            return
+    else:
+        try:
+            st = session_file.stat()
+        except OSError:
+            return
+        index[file_name] = [st.st_mtime_ns, st.st_size, metadata]
+    _save_session_index(index)
+
+
+def _read_session_metadata(session_file: Path) -> dict[str, Any] | None:
+    """Parse a session header (or older single-file session) for listing metadata."""
+    try:
+        with open(session_file) as f:
+            data = json.load(f)
+
+        if session_file.name == SESSION_HEADER:
+            default_id = session_file.parent.name
+            message_count = data["message_count"]
+        else:
+            default_id = session_file.stem
+            message_count = len(data.get("messages", []))
+
+        return {
+            "session_id": data.get("session_id", default_id),
+            "name": data.get("name"),
+            "model": data.get("model"),
+            "created_at": data.get("created_at"),
+            "message_count": message_count,
+        }
+    except Exception:
+        return None
+
+
 def list_sessions(limit: int = 20) -> list[dict[str, Any]]:
     """List recent saved sessions.
 
+    Session metadata is cached in an index keyed on the mtime and size of
+    each session's header, so only new or modified sessions are re-parsed.
+
     Args:
         limit: Maximum number of sessions to return
 
@@ -130,26 +290,53 @@ def list_sessions(limit: int = 20) -> list[dict[str, Any]]:
     if not history_dir.exists():
         return []
 
+    # (index key, metadata file) per session: session directories and
+    # sessions saved in the older single-file format
+    with os.scandir(history_dir) as it:
+        entries = []
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                key = f"{entry.name}/{SESSION_HEADER}"
+                entries.append((key, Path(entry.path, SESSION_HEADER)))
+            elif entry.name.endswith(".json") and entry.is_file():
+                entries.append((entry.name, Path(entry.path)))
+    entries.sort(reverse=True)
+
+    index = _load_session_index()
+    new_index: dict[str, list[Any]] = {}
+    changed = False
     sessions = []
 
-    for session_file in sorted(history_dir.glob("*.json"), reverse=True):
+    for key, session_file in entries:
+        cached = index.get(key)
+
         if len(sessions) >= limit:
-            break
+            # Keep cache entries for sessions we didn't need this time
+            if cached is not None:
+                new_index[key] = cached
+            continue
 
         try:
-            with open(session_file) as f:
-                data = json.load(f)
-
-            sessions.append({
-                "session_id": data.get("session_id", session_file.stem),
-                "name": data.get("name"),
-                "model": data.get("model"),
-                "created_at": data.get("created_at"),
-                "message_count": len(data.get("messages", [])),
-            })
-        except Exception:
+            st = session_file.stat()
+        except OSError:
             continue
 
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            metadata = cached[2]
+        else:
+            metadata = _read_session_metadata(session_file)
+            changed = True
+
+        new_index[key] = [st.st_mtime_ns, st.st_size, metadata]
+        if metadata is not None:
+            sessions.append(metadata)
+
+    # Prune entries for deleted session files
+    if changed or new_index.keys() != index.keys():
+        _save_session_index(new_index)
+
     return sessions
 
 
@@ -163,11 +350,18 @@ def delete_session(session_id: str) -> bool:
         True if deleted, False if not found
     """
     history_dir = get_history_dir()
-    session_file = history_dir / f"{session_id}.json"
+    session_dir = history_dir / session_id
+    legacy_file = history_dir / f"{session_id}.json"
+    _saved_messages.pop(session_id, None)
 
     deleted = False
-    if session_file.exists():
-        session_file.unlink()
+    if session_dir.is_dir():
+        shutil.rmtree(session_dir)
+        _update_session_index(f"{session_id}/{SESSION_HEADER}", None, None)
+        deleted = True
+    if legacy_file.exists():
+        legacy_file.unlink()
+        _update_session_index(legacy_file.name, None, None)
         deleted = True
 
     # Also clean up rewind state if it exists
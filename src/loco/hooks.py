@@ -40,15 +40,24 @@ class Hook:
     command: str
     timeout: int = 60  # seconds
     matcher: str | None = None  # Regex pattern to match tool names
+    # Compiled matcher, or None if it isn't a valid regex
+    _pattern: re.Pattern[str] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Compiled once: hooks are checked against every tool call
+        if self.matcher is not None:
+            try:
+                self._pattern = re.compile(self.matcher, re.IGNORECASE)
+            except re.error:
+                self._pattern = None
 
     def matches(self, tool_name: str) -> bool:
         """Check if this hook matches the given tool name."""
         if self.matcher is None:
             return True
-        try:
-            return bool(re.match(self.matcher, tool_name, re.IGNORECASE))
-        except re.error:
+        if self._pattern is None:
             return self.matcher.lower() == tool_name.lower()
+        return self._pattern.match(tool_name) is not None
 
 
 @dataclass
@@ -3,7 +3,13 @@
 from loco.mcp.server import MCPServer
 from loco.mcp.client import MCPClient
 from loco.mcp.transport import StdioTransport, SSETransport, HTTPTransport
-from loco.mcp.loader import load_mcp_clients, load_mcp_client
+from loco.mcp.loader import (
+    load_mcp_clients,
+    load_mcp_clients_async,
+    load_mcp_client,
+    probe_server,
+    probe_servers,
+)
 
 __all__ = [
     "MCPServer",
@@ -12,5 +18,8 @@ __all__ = [
     "SSETransport",
     "HTTPTransport",
     "load_mcp_clients",
+    "load_mcp_clients_async",
     "load_mcp_client",
+    "probe_server",
+    "probe_servers",
 ]
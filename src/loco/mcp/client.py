@@ -1,16 +1,14 @@
 """MCP Client implementation for connecting to external MCP servers."""
 
 import asyncio
-import uuid
 from typing import Any
 from loco.mcp.protocol import (
     MCP_VERSION,
-    MCPRequest,
     MCPResponse,
     InitializeParams,
-    CallToolParams,
     ToolInfo,
 )
+from loco.mcp.loop import run_sync
 from loco.mcp.transport import MCPTransport, ProcessTransport
 from loco.tools.base import Tool
 
@@ -36,17 +34,8 @@ class MCPClientTool(Tool):
 
     def execute(self, **kwargs: Any) -> str:
         """Execute the tool via the MCP client."""
-        # Run the async call synchronously
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If we're already in an async context, we need to handle this differently
-            # For now, raise an error
-            raise RuntimeError(
-                "Cannot execute MCP tool synchronously from async context. "
-                "Use await client.call_tool() instead."
-            )
-        
-        return loop.run_until_complete(self._client.call_tool(self.name, kwargs))
+        # Run on the shared MCP loop, which works from sync and async callers alike
+        return run_sync(self._client.call_tool(self.name, kwargs))
 
 
 class MCPClient:
@@ -62,15 +51,23 @@ class MCPClient:
         self.client_name = client_name
         self.client_version = client_version
         self._initialized = False
-        self._request_id = 0
-        self._pending_requests: dict[str | int, asyncio.Future] = {}
+        # Pending requests by ID: request IDs are indexes into this slot table
+        self._pending: list[asyncio.Future | None] = []
+        self._free_slots: list[int] = []
         self._tools: dict[str, ToolInfo] = {}
         self._receive_task: asyncio.Task | None = None
 
     def _next_id(self) -> int:
-        """Generate next request ID."""
-        self._request_id += 1
-        return self._request_id
+        """Claim a free pending-request slot; its index is the request ID."""
+        if self._free_slots:
+            return self._free_slots.pop()
+        self._pending.append(None)
+        return len(self._pending) - 1
+
+    def _release_id(self, request_id: int) -> None:
+        """Return a request's slot to the free list."""
+        self._pending[request_id] = None
+        self._free_slots.append(request_id)
 
     async def _send_request(
         self, 
@@ -79,16 +76,15 @@ class MCPClient:
     ) -> dict[str, Any]:
         """Send a request and wait for response."""
         request_id = self._next_id()
-        future: asyncio.Future[dict[str, Any]] = asyncio.Future()
-        self._pending_requests[request_id] = future
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
 
-        request = MCPRequest(
-            id=request_id,
-            method=method,
-            params=params,
-        )
+        # Built directly rather than through MCPRequest: this runs for every call
+        request: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            request["params"] = params
 
-        await self.transport.send(request.model_dump())
+        await self.transport.send(request)
 
         try:
             # Wait for response with timeout
@@ -103,25 +99,32 @@ class MCPClient:
             return response.get("result", {})
         
         finally:
-            self._pending_requests.pop(request_id, None)
+            # A request that timed out keeps its slot until its late response
+            # arrives, so the ID isn't reused while the server may still answer
+            if future.done() and not future.cancelled():
+                self._release_id(request_id)
 
     async def _receive_loop(self) -> None:
         """Receive and handle responses."""
         try:
             async for message in self.transport.receive():
                 # Check if it's a response to a pending request
-                if "id" in message:
-                    request_id = message["id"]
-                    future = self._pending_requests.get(request_id)
-                    
-                    if future and not future.done():
-                        future.set_result(message)
+                request_id = message.get("id")
+                if type(request_id) is int and 0 <= request_id < len(self._pending):
+                    future = self._pending[request_id]
+
+                    if future is not None:
+                        if future.done():
+                            # Late response to a request that timed out
+                            self._release_id(request_id)
+                        else:
+                            future.set_result(message)
                 # Could also handle notifications here
         
         except Exception as e:
             # Fail all pending requests
-            for future in self._pending_requests.values():
-                if not future.done():
+            for future in self._pending:
+                if future is not None and not future.done():
                     future.set_exception(e)
 
     async def initialize(self) -> dict[str, Any]:
@@ -179,8 +182,9 @@ class MCPClient:
         if not self._initialized:
             await self.initialize()
 
-        params = CallToolParams(name=name, arguments=arguments)
-        result = await self._send_request("tools/call", params.model_dump())
+        result = await self._send_request(
+            "tools/call", {"name": name, "arguments": arguments or {}}
+        )
         
         # Extract text content from result
         content = result.get("content", [])
@@ -230,10 +234,14 @@ class MCPClient:
         headers: dict[str, str] | None = None,
         client_name: str = "loco",
         client_version: str = "0.1.0",
+        session: Any = None,
     ) -> "MCPClient":
-        """Create an MCP client that connects to an HTTP-based MCP server."""
+        """Create an MCP client that connects to an HTTP-based MCP server.
+
+        An aiohttp session may be passed to share connections between clients.
+        """
         from loco.mcp.transport import HTTPTransport
-        transport = HTTPTransport(url, headers)
+        transport = HTTPTransport(url, headers, session=session)
         return cls(transport, client_name, client_version)
 
     @classmethod
@@ -242,10 +250,12 @@ class MCPClient:
         config: dict[str, Any],
         client_name: str = "loco",
         client_version: str = "0.1.0",
+        http_session: Any = None,
     ) -> "MCPClient":
         """Create an MCP client from a configuration dictionary.
         
         Supports both command-based and HTTP-based configurations.
+        http_session is an optional shared aiohttp session for HTTP servers.
         """
         config_type = config.get("type", "command")
         
@@ -254,7 +264,7 @@ class MCPClient:
             if not url:
                 raise ValueError("HTTP MCP server config must have 'url' field")
             headers = config.get("headers", {})
-            return cls.from_http(url, headers, client_name, client_version)
+            return cls.from_http(url, headers, client_name, client_version, session=http_session)
         else:  # command
             command = config.get("command")
             if not command:
@@ -1,8 +1,14 @@
 """Utilities for loading MCP clients from configuration."""
 
+import asyncio
+import logging
 from typing import Any
 from loco.mcp.client import MCPClient
-from loco.config import Config
+from loco.mcp.protocol import ToolInfo
+from loco.mcp.transport import HAS_AIOHTTP
+from loco.config import Config, mcp_server_config_dict
+
+logger = logging.getLogger(__name__)
 
 
 def load_mcp_clients(config: Config) -> dict[str, MCPClient]:
@@ -14,25 +20,60 @@ def load_mcp_clients(config: Config) -> dict[str, MCPClient]:
     
     for name, server_config in config.mcp_servers.items():
         try:
-            # Convert to dict if it's a Pydantic model
-            if not isinstance(server_config, dict):
-                config_dict = server_config.model_dump(exclude_none=True)
-            else:
-                config_dict = server_config
-            
-            client = MCPClient.from_config(config_dict)
+            client = MCPClient.from_config(mcp_server_config_dict(server_config))
             clients[name] = client
         except Exception as e:
-            import sys
-            sys.stderr.write(f"Warning: Failed to load MCP server '{name}': {e}\n")
-            sys.stderr.flush()
+            logger.warning("Failed to load MCP server '%s': %s", name, e)
     
     return clients
 
 
-def load_mcp_client(config: Config, name: str) -> MCPClient | None:
+# Seconds each server gets to initialize and list its tools
+CONNECT_TIMEOUT = 10.0
+
+
+async def load_mcp_clients_async(
+    config: Config,
+    timeout: float = CONNECT_TIMEOUT,
+) -> dict[str, MCPClient]:
+    """Load all MCP clients and connect to them concurrently.
+
+    Each server's initialize handshake and tools/list run at the same time as
+    the other servers', so startup takes as long as the slowest server rather
+    than the sum of them. Servers that fail to connect within timeout seconds
+    are closed, reported and left out of the result.
+    """
+    clients = load_mcp_clients(config)
+
+    async def connect(client: MCPClient) -> list[ToolInfo]:
+        await client.initialize()
+        return await client.list_tools()
+
+    results = await asyncio.gather(
+        *(asyncio.wait_for(connect(client), timeout) for client in clients.values()),
+        return_exceptions=True,
+    )
+
+    connected: dict[str, MCPClient] = {}
+    for (name, client), result in zip(clients.items(), results):
+        if isinstance(result, BaseException):
+            if isinstance(result, asyncio.TimeoutError):
+                result = f"Timeout after {timeout}s"
+            logger.warning("Failed to connect to MCP server '%s': %s", name, result)
+            try:
+                await client.close()
+            except Exception:
+                pass
+        else:
+            connected[name] = client
+
+    return connected
+
+
+def load_mcp_client(config: Config, name: str, http_session: Any = None) -> MCPClient | None:
     """Load a specific MCP client by name.
     
+    http_session is an optional shared aiohttp session for HTTP servers.
     Returns None if the server is not configured or fails to load.
     """
     server_config = config.mcp_servers.get(name)
@@ -40,15 +81,84 @@ def load_mcp_client(config: Config, name: str) -> MCPClient | None:
         return None
     
     try:
-        # Convert to dict if it's a Pydantic model
-        if not isinstance(server_config, dict):
-            config_dict = server_config.model_dump(exclude_none=True)
-        else:
-            config_dict = server_config
-        
-        return MCPClient.from_config(config_dict)
+        return MCPClient.from_config(
+            mcp_server_config_dict(server_config), http_session=http_session
+        )
     except Exception as e:
-        import sys
-        sys.stderr.write(f"Warning: Failed to load MCP server '{name}': {e}\n")
-        sys.stderr.flush()
+        logger.warning("Failed to load MCP server '%s': %s", name, e)
         return None
+
+
+# Maximum number of servers probed at the same time
+MAX_CONCURRENT_PROBES = 8
+
+
+async def probe_server(
+    config: Config,
+    name: str,
+    timeout: float,
+    http_session: Any = None,
+) -> tuple[dict[str, Any] | None, list[ToolInfo] | None, str | None]:
+    """Connect to a server once, initialize it and list its tools.
+
+    Returns (initialize result, tools, error message); on failure the first
+    two are None and the error message is set.
+    """
+    client = load_mcp_client(config, name, http_session)
+    if client is None:
+        return (None, None, "Failed to create client")
+
+    try:
+        init_result = await asyncio.wait_for(client.initialize(), timeout=timeout)
+        tools = await asyncio.wait_for(client.list_tools(), timeout=timeout)
+        return (init_result, tools, None)
+    except asyncio.TimeoutError:
+        return (None, None, f"Timeout after {timeout}s")
+    except Exception as e:
+        return (None, None, str(e))
+    finally:
+        try:
+            await client.close()
+        except Exception:
+            pass
+
+
+async def probe_servers(
+    config: Config,
+    names: list[str],
+    timeout: float,
+) -> list[tuple[str, dict[str, Any] | None, list[ToolInfo] | None, str | None]]:
+    """Probe several servers concurrently.
+
+    At most MAX_CONCURRENT_PROBES servers are contacted at once, and HTTP
+    servers share one aiohttp session so connections to the same host are
+    reused.
+
+    Returns (name, initialize result, tools, error message) per server, in order.
+    """
+    semaphore = asyncio.Semaphore(max(1, min(MAX_CONCURRENT_PROBES, len(names))))
+
+    async def probe(name: str, http_session: Any) -> tuple[dict[str, Any] | None, list[ToolInfo] | None, str | None]:
+        async with semaphore:
+            return await probe_server(config, name, timeout, http_session)
+
+    async def probe_all(http_session: Any) -> list[Any]:
+        return await asyncio.gather(*(probe(name, http_session) for name in names))
+
+    if HAS_AIOHTTP and any(_server_type(config, name) == "http" for name in names):
+        import aiohttp
+
+        async with aiohttp.ClientSession() as http_session:
+            results = await probe_all(http_session)
+    else:
+        results = await probe_all(None)
+
+    return [(name, *result) for name, result in zip(names, results)]
+
+
+def _server_type(config: Config, name: str) -> str:
+    """Get the transport type of a configured server."""
+    server_config = config.mcp_servers.get(name)
+    if server_config is None:
+        return "command"
+    return mcp_server_config_dict(server_config).get("type", "command")
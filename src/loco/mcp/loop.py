@@ -0,0 +1,75 @@
+"""Shared background event loop for running MCP coroutines from sync code."""
+
+import asyncio
+import atexit
+import threading
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+def get_mcp_loop() -> asyncio.AbstractEventLoop:
+    """Get the MCP event loop, starting its daemon thread on first use.
+
+    All MCP clients driven from synchronous code share this loop, so their
+    transports stay bound to one loop and concurrent calls share a selector.
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever, name="loco-mcp-loop", daemon=True
+            )
+            _thread.start()
+            atexit.register(_shutdown)
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """Run a coroutine on the MCP loop and block until it finishes.
+
+    Safe to call from any thread other than the MCP loop's own, including one
+    with its own running loop. The coroutine is cancelled if the wait times
+    out or is interrupted.
+    """
+    loop = get_mcp_loop()
+    if threading.current_thread() is _thread:
+        # Blocking here would stop the loop that has to run the coroutine
+        coro.close()
+        raise RuntimeError("run_sync() called from the MCP event loop thread; await instead")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def _shutdown() -> None:
+    """Stop the MCP loop and its thread at exit."""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None or loop.is_closed():
+        return
+
+    async def _finish() -> None:
+        # Cancel leftover tasks (e.g. client receive loops) before their generators close
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await loop.shutdown_asyncgens()
+        loop.stop()
+
+    asyncio.run_coroutine_threadsafe(_finish(), loop)
+    if thread is not None:
+        thread.join(timeout=5)
+    if not loop.is_running():
+        loop.close()
@@ -9,9 +9,9 @@ MCP_VERSION = "2024-11-05"
 
 
 class MCPRequest(BaseModel):
-    """Base MCP request."""
+    """Base MCP request (a notification when id is None)."""
     jsonrpc: str = "2.0"
-    id: str | int
+    id: str | int | None = None
     method: str
     params: dict[str, Any] | None = None
 
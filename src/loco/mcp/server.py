@@ -1,22 +1,84 @@
 """MCP Server implementation that exposes loco's tools."""
 
-import asyncio
 import sys
+from dataclasses import dataclass
 from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
 from loco.mcp.protocol import (
     MCP_VERSION,
-    MCPRequest,
-    MCPResponse,
-    MCPNotification,
-    InitializeResult,
-    ToolInfo,
     CallToolParams,
-    ToolResult,
 )
-from loco.mcp.transport import MCPTransport, StdioTransport
+from loco.mcp.transport import MCPTransport, StdioTransport, decode_json, encode_json
 from loco.tools import tool_registry, Tool
 
 
+@dataclass(slots=True, frozen=True)
+class IncomingRequest:
+    """A request received by the server (a notification when id is None).
+
+    Same fields as MCPRequest, but one is created for every message, so it
+    is a slotted dataclass: no per-instance __dict__ or model bookkeeping.
+    """
+    method: str
+    jsonrpc: str = "2.0"
+    id: str | int | None = None
+    params: dict[str, Any] | None = None
+
+
+_request_adapter = TypeAdapter(IncomingRequest)
+
+
+def _tool_result(text: str, is_error: bool = False) -> dict[str, Any]:
+    """Build a tools/call result (the serialized form of ToolResult)."""
+    return {
+        "content": [{"type": "text", "text": text}],
+        "isError": is_error,
+    }
+
+
+def _internal_error(error: Exception) -> dict[str, Any]:
+    """Log a request failure and build its JSON-RPC internal error object."""
+    # Log error to stderr (stdout is for JSON-RPC)
+    sys.stderr.write(f"Error handling request: {error}\n")
+    sys.stderr.flush()
+
+    return {
+        "code": -32603,
+        "message": f"Internal error: {str(error)}",
+    }
+
+
+# Methods whose serialized results are cached by the server
+_CACHED_METHODS = frozenset({"initialize", "tools/list"})
+
+# Response frames by member; only the id and the payload vary
+_RESPONSE_FRAMES = {
+    "result": b'{"jsonrpc":"2.0","id":%b,"result":%b}\n',
+    "error": b'{"jsonrpc":"2.0","id":%b,"error":%b}\n',
+}
+
+
+def _response_frame(request_id: Any, key: str, payload: bytes) -> bytes:
+    """Splice an encoded result or error into a JSON-RPC response frame.
+
+    The envelope is filled in as a bytes template in one step rather than
+    encoded as a dict each time.
+    """
+    # Integer ids (the common case) don't need the JSON encoder
+    encoded_id = b"%d" % request_id if type(request_id) is int else encode_json(request_id)
+    return _RESPONSE_FRAMES[key] % (encoded_id, payload)
+
+
+def _encode_member(key: str, payload: Any) -> tuple[str, bytes]:
+    """Encode a response member, reporting a result that can't be encoded as an error."""
+    try:
+        return key, encode_json(payload)
+    except (TypeError, ValueError) as e:
+        return "error", encode_json(_internal_error(e))
+
+
 class MCPServer:
     """MCP server that exposes loco's tools to MCP clients."""
 
@@ -35,6 +97,9 @@ class MCPServer:
             "tools/list": self._handle_list_tools,
             "tools/call": self._handle_call_tool,
         }
+        # Serialized results of requests whose answer never changes:
+        # method -> (tool registry version, result JSON)
+        self._result_cache: dict[str, tuple[int, bytes]] = {}
 
     def register_tool(self, tool: Tool) -> None:
         """Register a tool to be exposed via MCP."""
@@ -43,139 +108,167 @@ class MCPServer:
     async def _handle_initialize(self, params: dict[str, Any]) -> dict[str, Any]:
         """Handle initialize request."""
         self._initialized = True
-        
-        result = InitializeResult(
-            protocolVersion=MCP_VERSION,
-            capabilities={
+
+        # Same shape as InitializeResult, built without a model round trip
+        return {
+            "protocolVersion": MCP_VERSION,
+            "capabilities": {
                 "tools": {},  # We support tools
             },
-            serverInfo={
+            "serverInfo": {
                 "name": self.name,
                 "version": self.version,
             },
-        )
-        
-        return result.model_dump()
+        }
 
     async def _handle_list_tools(self, params: dict[str, Any] | None) -> dict[str, Any]:
         """Handle tools/list request."""
         if not self._initialized:
             raise RuntimeError("Server not initialized")
-        
-        tools = tool_registry.get_all()
-        tool_infos = []
-        
-        for tool in tools:
-            tool_info = ToolInfo(
-                name=tool.name,
-                description=tool.description,
-                inputSchema=tool.parameters,
-            )
-            tool_infos.append(tool_info.model_dump())
-        
+
+        # Same shape as ToolInfo
+        tool_infos = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "inputSchema": tool.parameters,
+            }
+            for tool in tool_registry.get_all()
+        ]
+
         return {"tools": tool_infos}
 
     async def _handle_call_tool(self, params: dict[str, Any]) -> dict[str, Any]:
         """Handle tools/call request."""
         if not self._initialized:
             raise RuntimeError("Server not initialized")
-        
-        call_params = CallToolParams(**params)
+
+        call_params = CallToolParams.model_validate(params)
         tool = tool_registry.get(call_params.name)
-        
+
         if tool is None:
-            result = ToolResult(
-                content=[{
-                    "type": "text",
-                    "text": f"Error: Unknown tool '{call_params.name}'"
-                }],
-                isError=True,
-            )
-            return result.model_dump()
-        
+            return _tool_result(f"Error: Unknown tool '{call_params.name}'", is_error=True)
+
         try:
             # Execute the tool
             arguments = call_params.arguments or {}
             output = tool.execute(**arguments)
-            
-            result = ToolResult(
-                content=[{
-                    "type": "text",
-                    "text": output,
-                }],
-                isError=False,
-            )
-            return result.model_dump()
-        
+            return _tool_result(output)
+
         except Exception as e:
-            result = ToolResult(
-                content=[{
-                    "type": "text",
-                    "text": f"Error executing {call_params.name}: {str(e)}"
-                }],
-                isError=True,
+            return _tool_result(
+                f"Error executing {call_params.name}: {str(e)}", is_error=True
             )
-            return result.model_dump()
 
     async def _handle_request(self, request: dict[str, Any]) -> dict[str, Any] | None:
         """Handle an incoming request."""
         try:
-            req = MCPRequest(**request)
-            handler = self._request_handlers.get(req.method)
-            
-            if handler is None:
-                # Method not found
-                return {
-                    "jsonrpc": "2.0",
-                    "id": req.id,
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {req.method}",
-                    },
-                }
-            
-            # Call the handler
-            result = await handler(req.params or {})
-            
-            return {
-                "jsonrpc": "2.0",
-                "id": req.id,
-                "result": result,
-            }
-        
+            req = _request_adapter.validate_python(request)
         except Exception as e:
-            # Log error to stderr (stdout is for JSON-RPC)
-            sys.stderr.write(f"Error handling request: {e}\n")
-            sys.stderr.flush()
-            
             return {
                 "jsonrpc": "2.0",
                 "id": request.get("id", 0),
-                "error": {
-                    "code": -32603,
-                    "message": f"Internal error: {str(e)}",
-                },
+                "error": _internal_error(e),
             }
 
+        key, payload = await self._dispatch(req)
+        return {"jsonrpc": "2.0", "id": req.id, key: payload}
+
+    async def _handle_frame(self, frame: bytes) -> dict[str, Any] | bytes | None:
+        """Handle a raw JSON-RPC frame, returning None for notifications.
+
+        Valid requests are parsed straight from the bytes into a request,
+        without building an intermediate dict first. The response is either
+        a message or an already-encoded frame.
+        """
+        # Notifications have no id key; drop them without parsing. A match
+        # elsewhere in the frame (e.g. in params) just takes the full path.
+        if b'"id"' not in frame:
+            return None
+
+        try:
+            req = _request_adapter.validate_json(frame)
+        except ValidationError:
+            # Fall back to the dict path, which reports the request's id
+            message = decode_json(frame)
+            if "id" not in message:
+                return None
+            return await self._handle_request(message)
+
+        if req.id is None:
+            # It's a notification, we don't respond
+            # (could handle notifications like initialized, etc.)
+            return None
+
+        if req.method in _CACHED_METHODS:
+            response_frame = await self._cached_response_frame(req)
+            if response_frame is not None:
+                return response_frame
+
+        key, payload = await self._dispatch(req)
+        return _response_frame(req.id, *_encode_member(key, payload))
+
+    async def _cached_response_frame(self, req: IncomingRequest) -> bytes | None:
+        """Get the response frame for an initialize or tools/list request.
+
+        Their results only depend on the server identity and the registered
+        tools, so the serialized result is cached (until a tool is
+        registered) and spliced into the JSON-RPC envelope. Cache misses go
+        through _dispatch, so a failing handler is answered with an error.
+        """
+        if req.method == "initialize":
+            self._initialized = True
+        elif not self._initialized:
+            return None
+
+        cached = self._result_cache.get(req.method)
+        if cached is None or cached[0] != tool_registry.version:
+            version = tool_registry.version
+            key, encoded = _encode_member(*await self._dispatch(req))
+            if key != "result":
+                # Errors are answered but not cached
+                return _response_frame(req.id, key, encoded)
+            cached = (version, encoded)
+            self._result_cache[req.method] = cached
+
+        return _response_frame(req.id, "result", cached[1])
+
+    async def _dispatch(self, req: IncomingRequest) -> tuple[str, Any]:
+        """Run the handler for a validated request.
+
+        Returns the response member and its value: ("result", result) or
+        ("error", error object).
+        """
+        handler = self._request_handlers.get(req.method)
+
+        if handler is None:
+            # Method not found
+            return "error", {
+                "code": -32601,
+                "message": f"Method not found: {req.method}",
+            }
+
+        try:
+            # Call the handler
+            return "result", await handler(req.params or {})
+        except Exception as e:
+            return "error", _internal_error(e)
+
     async def run(self) -> None:
         """Run the MCP server (receive and handle requests)."""
         try:
-            async for message in self.transport.receive():
-                # Check if it's a notification (no id) or request (has id)
-                if "id" not in message:
-                    # It's a notification, we don't respond
-                    # (could handle notifications like initialized, etc.)
-                    continue
-                
+            async for frame in self.transport.receive_frames():
                 # Handle request and send response
-                response = await self._handle_request(message)
-                if response:
+                response = await self._handle_frame(frame)
+                if isinstance(response, bytes):
+                    await self.transport.send_frame(response)
+                elif response:
                     await self.transport.send(response)
-        
+
         except Exception as e:
             sys.stderr.write(f"Server error: {e}\n")
             sys.stderr.flush()
-        
+
         finally:
             await self.transport.close()
 
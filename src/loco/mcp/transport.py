@@ -1,17 +1,118 @@
 """Transport layer for MCP communication."""
 
+import os
 import sys
 import json
 import asyncio
+import importlib.util
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Callable
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
 from collections.abc import Awaitable
 
-try:
+if TYPE_CHECKING:
     import aiohttp
-    HAS_AIOHTTP = True
-except ImportError:
-    HAS_AIOHTTP = False
+
+# aiohttp is only imported once an HTTP transport is created, so stdio
+# servers and clients don't pay for loading it
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+
+
+# Compact encoders shared by the transports. Non-ASCII text is written as
+# UTF-8 rather than \uXXXX escapes, which take two to three times the bytes.
+_json_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+_json_encode_ascii = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON."""
+    try:
+        return _json_encode(value).encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates can't be written as UTF-8; escape them instead
+        return _json_encode_ascii(value).encode("ascii")
+
+
+# Shared decoder; frames are always UTF-8, so no encoding detection is needed
+_json_decode = json.JSONDecoder().decode
+
+
+def decode_json(data: bytes) -> Any:
+    """Decode a UTF-8 JSON document."""
+    return _json_decode(data.decode("utf-8"))
+
+
+def encode_frame(message: dict[str, Any]) -> bytes:
+    """Encode a JSON-RPC message as one newline-delimited UTF-8 frame."""
+    return encode_json(message) + b"\n"
+
+
+# Bytes requested per read when splitting a stream into frames
+READ_CHUNK_SIZE = 64 * 1024
+
+# Messages buffered by queue-based transports before producers wait for the
+# consumer, so a fast stream can't grow the queue without bound
+MAX_QUEUED_MESSAGES = 256
+
+
+async def read_frames(
+    reader: "asyncio.StreamReader | aiohttp.StreamReader",
+) -> AsyncIterator[bytes]:
+    """Split a stream into newline-delimited frames, reading it in large chunks.
+
+    A burst of queued messages is split in one pass instead of one readline()
+    await per message, and frames are not limited to the reader's line
+    length limit. Frames are stripped and empty lines skipped.
+    """
+    pending: list[bytes] = []  # Chunks of the frame being read so far
+    while True:
+        chunk = await reader.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        # A single split finds every frame boundary in the chunk
+        parts = chunk.split(b"\n")
+        if len(parts) == 1:
+            pending.append(chunk)
+            continue
+
+        first, *lines, rest = parts
+        pending.append(first)
+        lines.insert(0, b"".join(pending))
+        pending = [rest]
+
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line
+
+    # A final frame without a trailing newline
+    line = b"".join(pending).strip()
+    if line:
+        yield line
+
+
+async def _queued_messages(
+    queue: "asyncio.Queue[dict[str, Any]]", closed: asyncio.Event
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield messages from a queue until the closed event is set.
+
+    Waits on both at once, so an idle transport sleeps until a message
+    arrives or it is closed rather than waking up to poll.
+    """
+    close_wait = asyncio.ensure_future(closed.wait())
+    get = None
+    try:
+        while not closed.is_set():
+            get = asyncio.ensure_future(queue.get())
+            await asyncio.wait((get, close_wait), return_when=asyncio.FIRST_COMPLETED)
+            if not get.done():
+                break
+            yield get.result()
+    finally:
+        close_wait.cancel()
+        if get is not None:
+            get.cancel()
 
 
 class MCPTransport(ABC):
@@ -27,6 +128,23 @@ class MCPTransport(ABC):
         """Receive messages as an async iterator."""
         ...
 
+    async def send_frame(self, frame: bytes) -> None:
+        """Send a message that is already encoded as a JSON frame.
+
+        Transports that write JSON text override this to write the bytes
+        as-is; the default decodes the frame and calls send().
+        """
+        await self.send(decode_json(frame))
+
+    async def receive_frames(self) -> AsyncIterator[bytes]:
+        """Receive messages as raw JSON frames.
+
+        Transports that read JSON text override this to hand over the bytes
+        as received; the default re-encodes the messages from receive().
+        """
+        async for message in self.receive():
+            yield encode_frame(message)
+
     @abstractmethod
     async def close(self) -> None:
         """Close the transport."""
@@ -40,6 +158,9 @@ class StdioTransport(MCPTransport):
         self._closed = False
         self._reader: asyncio.StreamReader | None = None
         self._writer: asyncio.StreamWriter | None = None
+        self._stdout_fd: int | None = None
+        # Frames sent during the current event loop iteration, written together
+        self._pending_frames: list[bytes] = []
 
     async def _setup(self) -> None:
         """Setup stdio streams."""
@@ -52,40 +173,92 @@ class StdioTransport(MCPTransport):
             # For writing, we use stdout
             self._writer = None  # We'll write directly to stdout
 
+    def _get_stdout_fd(self) -> int | None:
+        """Get stdout's file descriptor, or None if stdout isn't backed by one."""
+        if self._stdout_fd is None:
+            try:
+                # Anything already buffered must go out before our raw writes
+                sys.stdout.flush()
+                self._stdout_fd = sys.stdout.fileno()
+            except (AttributeError, OSError, ValueError):
+                return None
+        return self._stdout_fd
+
     async def send(self, message: dict[str, Any]) -> None:
         """Send a JSON-RPC message to stdout."""
+        await self.send_frame(encode_frame(message))
+
+    async def send_frame(self, frame: bytes) -> None:
+        """Write a newline-terminated JSON-RPC frame to stdout.
+
+        Frames sent in the same event loop iteration (e.g. the responses to
+        a batch of requests read in one chunk) are written together once
+        the iteration ends.
+        """
         if self._closed:
             raise RuntimeError("Transport is closed")
 
-        # MCP uses JSON-RPC over stdio with newline delimiters
-        json_str = json.dumps(message)
-        sys.stdout.write(json_str + "\n")
-        sys.stdout.flush()
+        self._pending_frames.append(frame)
+        if len(self._pending_frames) == 1:
+            asyncio.get_running_loop().call_soon(self._flush_frames)
+
+    def _flush_frames(self) -> None:
+        """Write the pending frames to stdout."""
+        if not self._pending_frames:
+            return
+        data = b"".join(self._pending_frames)
+        self._pending_frames.clear()
+
+        try:
+            # MCP uses JSON-RPC over stdio with newline delimiters. The
+            # frames go straight to the fd, bypassing stdout's buffers.
+            fd = self._get_stdout_fd()
+            if fd is None:
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+                return
+
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        except OSError as e:
+            # The client went away; stop sending
+            sys.stderr.write(f"Error sending message: {e}\n")
+            sys.stderr.flush()
+            self._closed = True
 
     async def receive(self) -> AsyncIterator[dict[str, Any]]:
         """Receive JSON-RPC messages from stdin."""
+        async for frame in self.receive_frames():
+            try:
+                message = decode_json(frame)
+            except ValueError as e:
+                sys.stderr.write(f"Error receiving message: {e}\n")
+                sys.stderr.flush()
+                break
+            yield message
+
+    async def receive_frames(self) -> AsyncIterator[bytes]:
+        """Receive raw newline-delimited JSON-RPC frames from stdin."""
         await self._setup()
 
         if self._reader is None:
             raise RuntimeError("Reader not initialized")
 
-        while not self._closed:
-            try:
-                line = await self._reader.readline()
-                if not line:
+        try:
+            async for frame in read_frames(self._reader):
+                if self._closed:
                     break
-
-                line_str = line.decode('utf-8').strip()
-                if line_str:
-                    yield json.loads(line_str)
-            except Exception as e:
-                # Log error and continue
-                sys.stderr.write(f"Error receiving message: {e}\n")
-                sys.stderr.flush()
-                break
+                yield frame
+        except Exception as e:
+            # Log error and stop
+            sys.stderr.write(f"Error receiving message: {e}\n")
+            sys.stderr.flush()
 
     async def close(self) -> None:
         """Close the transport."""
+        self._flush_frames()
         self._closed = True
 
 
@@ -95,8 +268,9 @@ class SSETransport(MCPTransport):
     def __init__(self, endpoint: str):
         self.endpoint = endpoint
         self._closed = False
-        self._send_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
-        self._receive_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._closed_event = asyncio.Event()
+        self._send_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(MAX_QUEUED_MESSAGES)
+        self._receive_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(MAX_QUEUED_MESSAGES)
         self._session = None
 
     async def send(self, message: dict[str, Any]) -> None:
@@ -112,21 +286,13 @@ class SSETransport(MCPTransport):
         """Receive messages via SSE stream."""
         # This is a placeholder - full implementation would use aiohttp
         # to connect to an SSE endpoint and parse the event stream
-        while not self._closed:
-            try:
-                message = await asyncio.wait_for(
-                    self._receive_queue.get(),
-                    timeout=30.0
-                )
-                yield message
-            except asyncio.TimeoutError:
-                continue
-            except Exception:
-                break
+        async for message in _queued_messages(self._receive_queue, self._closed_event):
+            yield message
 
     async def close(self) -> None:
         """Close the transport."""
         self._closed = True
+        self._closed_event.set()
         if self._session:
             await self._session.close()
 
@@ -138,18 +304,27 @@ class ProcessTransport(MCPTransport):
         self.command = command
         self.cwd = cwd
         self._process: asyncio.subprocess.Process | None = None
+        self._spawn_lock = asyncio.Lock()
         self._closed = False
+        # Frames sent during the current event loop iteration, written together
+        self._pending_frames: list[bytes] = []
+        # Outcome of writing the pending frames, for the sends that queued them
+        self._batch: asyncio.Future[None] | None = None
 
     async def _ensure_process(self) -> None:
         """Ensure the process is running."""
-        if self._process is None:
-            self._process = await asyncio.create_subprocess_exec(
-                *self.command,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self.cwd,
-            )
+        # The receive loop and the first send both get here; spawn only once
+        async with self._spawn_lock:
+            if self._process is None:
+                self._process = await asyncio.create_subprocess_exec(
+                    *self.command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    # Nothing reads the server's logs; an unread pipe would
+                    # stall the server once its buffer filled up
+                    stderr=asyncio.subprocess.DEVNULL,
+                    cwd=self.cwd,
+                )
 
     async def send(self, message: dict[str, Any]) -> None:
         """Send a message to the process stdin."""
@@ -161,9 +336,35 @@ class ProcessTransport(MCPTransport):
         if self._process is None or self._process.stdin is None:
             raise RuntimeError("Process stdin not available")
 
-        json_str = json.dumps(message) + "\n"
-        self._process.stdin.write(json_str.encode('utf-8'))
-        await self._process.stdin.drain()
+        # The first send of an event loop iteration writes the frames of all
+        # sends made in it, with one write and one drain
+        self._pending_frames.append(encode_frame(message))
+        if len(self._pending_frames) > 1:
+            # Wait for the first send to write this frame, and share its errors
+            if self._batch is None:
+                self._batch = asyncio.get_running_loop().create_future()
+            await asyncio.shield(self._batch)
+            return
+
+        batch: asyncio.Future[None] | None = None
+        try:
+            try:
+                await asyncio.sleep(0)
+            finally:
+                # Even if this send is cancelled, the others' frames must go out
+                data = b"".join(self._pending_frames)
+                self._pending_frames.clear()
+                batch, self._batch = self._batch, None
+                self._process.stdin.write(data)
+            await self._process.stdin.drain()
+        except Exception as e:
+            if batch is not None:
+                batch.set_exception(e)
+            raise
+        finally:
+            # Cancelled after the write: the frames still went out
+            if batch is not None and not batch.done():
+                batch.set_result(None)
 
     async def receive(self) -> AsyncIterator[dict[str, Any]]:
         """Receive messages from the process stdout."""
@@ -172,19 +373,14 @@ class ProcessTransport(MCPTransport):
         if self._process is None or self._process.stdout is None:
             raise RuntimeError("Process stdout not available")
 
-        while not self._closed:
-            try:
-                line = await self._process.stdout.readline()
-                if not line:
+        try:
+            async for frame in read_frames(self._process.stdout):
+                if self._closed:
                     break
-
-                line_str = line.decode('utf-8').strip()
-                if line_str:
-                    yield json.loads(line_str)
-            except Exception as e:
-                sys.stderr.write(f"Error receiving from process: {e}\n")
-                sys.stderr.flush()
-                break
+                yield decode_json(frame)
+        except Exception as e:
+            sys.stderr.write(f"Error receiving from process: {e}\n")
+            sys.stderr.flush()
 
     async def close(self) -> None:
         """Close the transport and terminate the process."""
@@ -213,23 +409,42 @@ class HTTPTransport(MCPTransport):
     via POST receives an SSE (Server-Sent Events) response on the same connection.
     """
 
-    def __init__(self, url: str, headers: dict[str, str] | None = None):
-        if not HAS_AIOHTTP:
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        session: "aiohttp.ClientSession | None" = None,
+    ):
+        """Initialize the transport.
+
+        Args:
+            url: MCP endpoint URL
+            headers: Headers sent with every request
+            session: Optional shared session, so several transports can reuse
+                connections; it is left open when this transport is closed
+        """
+        try:
+            import aiohttp
+        except ImportError:
             raise RuntimeError(
                 "aiohttp is required for HTTP transport. "
                 "Install it with: pip install aiohttp"
             )
 
+        self._aiohttp = aiohttp
         self.url = url
         self.headers = headers or {}
-        self._session: aiohttp.ClientSession | None = None
+        self._session: "aiohttp.ClientSession | None" = session
+        self._owns_session = session is None
+        self._request_headers = {**self.headers, "Content-Type": "application/json"}
         self._closed = False
-        self._receive_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._closed_event = asyncio.Event()
+        self._receive_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(MAX_QUEUED_MESSAGES)
 
-    async def _ensure_session(self) -> aiohttp.ClientSession:
+    async def _ensure_session(self) -> "aiohttp.ClientSession":
         """Ensure the aiohttp session is created."""
         if self._session is None:
-            self._session = aiohttp.ClientSession(headers=self.headers)
+            self._session = self._aiohttp.ClientSession()
         return self._session
 
     async def send(self, message: dict[str, Any]) -> None:
@@ -246,8 +461,8 @@ class HTTPTransport(MCPTransport):
         try:
             async with session.post(
                 self.url,
-                json=message,
-                headers={"Content-Type": "application/json"},
+                data=encode_frame(message),
+                headers=self._request_headers,
             ) as response:
                 # 200 = successful request with response
                 # 202 = successful notification (no response expected)
@@ -262,46 +477,39 @@ class HTTPTransport(MCPTransport):
                     return
                 
                 # Read SSE response from the POST connection
-                async for line in response.content:
-                    if self._closed:
+                async with aclosing(read_frames(response.content)) as lines:
+                    async for line in lines:
+                        if self._closed:
+                            break
+
+                        # SSE format: "data: <json>"; ignore "event:" lines
+                        if not line.startswith(b'data: '):
+                            continue
+
+                        data = line[6:]  # Remove "data: " prefix
+                        try:
+                            response_message = decode_json(data)
+                        except ValueError:
+                            sys.stderr.write(f"Failed to decode SSE message: {data!r}\n")
+                            sys.stderr.flush()
+                            continue
+
+                        await self._receive_queue.put(response_message)
+                        # For request/response pattern, we only expect one response per request
                         break
 
-                    line_str = line.decode('utf-8').strip()
-
-                    # SSE format: "data: <json>"
-                    if line_str.startswith('data: '):
-                        data_str = line_str[6:]  # Remove "data: " prefix
-                        if data_str:
-                            try:
-                                response_message = json.loads(data_str)
-                                await self._receive_queue.put(response_message)
-                                # For request/response pattern, we only expect one response per request
-                                break
-                            except json.JSONDecodeError:
-                                sys.stderr.write(f"Failed to decode SSE message: {data_str}\n")
-                                sys.stderr.flush()
-                    # Ignore "event:" lines and empty lines
-                    
-        except aiohttp.ClientError as e:
+        except self._aiohttp.ClientError as e:
             raise RuntimeError(f"Failed to send message: {e}")
 
     async def receive(self) -> AsyncIterator[dict[str, Any]]:
         """Receive messages from the queue (populated by send() method)."""
-        while not self._closed:
-            try:
-                message = await asyncio.wait_for(
-                    self._receive_queue.get(),
-                    timeout=1.0
-                )
-                yield message
-            except asyncio.TimeoutError:
-                continue
-            except Exception:
-                break
+        async for message in _queued_messages(self._receive_queue, self._closed_event):
+            yield message
 
     async def close(self) -> None:
         """Close the transport and cleanup resources."""
         self._closed = True
+        self._closed_event.set()
 
-        if self._session:
+        if self._session and self._owns_session:
             await self._session.close()
@@ -1,6 +1,8 @@
 """Plan mode for loco - multi-step task planning and execution."""
 
+import atexit
 import json
+import threading
 import uuid
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
@@ -126,13 +128,86 @@ def get_plans_dir() -> Path:
     return plans_dir
 
 
-def save_plan(plan: Plan) -> None:
-    """Save a plan to disk."""
+def _write_plan_data(plan_id: str, data: dict[str, Any]) -> None:
+    """Write serialized plan data to the plan's file."""
     plans_dir = get_plans_dir()
-    plan_file = plans_dir / f"{plan.id}.json"
+    plan_file = plans_dir / f"{plan_id}.json"
 
     with open(plan_file, "w", encoding="utf-8") as f:
-        json.dump(plan.to_dict(), f, indent=2)
+        json.dump(data, f, indent=2)
+
+
+def save_plan(plan: Plan) -> None:
+    """Save a plan to disk."""
+    _write_plan_data(plan.id, plan.to_dict())
+
+
+class AsyncPlanWriter:
+    """Saves plans on a background thread, coalescing rapid updates.
+
+    Each enqueue() snapshots the plan; if several snapshots of the same plan
+    are queued before the writer gets to them, only the latest is written.
+    Call flush() to wait until everything queued so far is on disk.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._cond = threading.Condition()
+        self._writing = False
+        self._error: Exception | None = None
+        self._thread: threading.Thread | None = None
+
+    def enqueue(self, plan: Plan) -> None:
+        """Queue the plan's current state to be written."""
+        data = plan.to_dict()
+        with self._cond:
+            self._pending[plan.id] = data
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="loco-plan-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until all queued plans are written.
+
+        Raises:
+            Exception: The first error hit by the writer since the last flush
+        """
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        """Writer thread loop."""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch, self._pending = self._pending, {}
+                self._writing = True
+
+            for plan_id, data in batch.items():
+                try:
+                    _write_plan_data(plan_id, data)
+                except Exception as e:
+                    with self._cond:
+                        if self._error is None:
+                            self._error = e
+
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+# Global writer used for plan status updates during execution
+plan_writer = AsyncPlanWriter()
+# Its thread is a daemon, so write anything still queued before exiting
+atexit.register(plan_writer.flush)
 
 
 def load_plan(plan_id: str) -> Plan | None:
@@ -6,13 +6,21 @@ tracking file changes across conversation turns and enabling rollback.
 
 import hashlib
 import os
+import shutil
+import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
 from loco.git import is_git_repo, get_current_branch, run_git_command
+# hash_path is defined with the storage that names files by it
+from loco.snapshots import hash_path
 
 
 class ChangeType(Enum):
@@ -30,6 +38,10 @@ class FileChange:
     content_before: str | None       # None if file was created
     content_after: str | None        # None if file was deleted
 
+    def __post_init__(self) -> None:
+        # The same paths recur across turns; share one string per path
+        self.path = sys.intern(self.path)
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -50,24 +62,67 @@ class FileChange:
         )
 
 
+def datetime_to_ns(value: datetime) -> int:
+    """Convert a datetime to epoch nanoseconds, keeping its microseconds exactly."""
+    seconds = int(value.replace(microsecond=0).timestamp())
+    return seconds * 1_000_000_000 + value.microsecond * 1000
+
+
+def timestamp_ns_from_dict(data: dict[str, Any]) -> int:
+    """Read a turn's end time from its serialized form, in epoch nanoseconds."""
+    if "timestamp_ns" in data:
+        return data["timestamp_ns"]
+    # Written as an ISO string before timestamps were stored as nanoseconds
+    return datetime_to_ns(datetime.fromisoformat(data["timestamp"]))
+
+
 @dataclass
 class TurnCheckpoint:
     """Snapshot of state at end of a conversation turn."""
     turn_number: int
     message_index: int               # Index in conversation.messages where turn ends
-    timestamp: datetime
     file_changes: list[FileChange] = field(default_factory=list)
     summary: str | None = None       # Auto-generated from assistant response
+    timestamp_ns: int = field(default_factory=time.time_ns)  # When the turn ended (epoch ns)
+    _timestamp: datetime | None = field(default=None, init=False, repr=False, compare=False)
+    _file_changes_paths: frozenset[str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_datetime(cls, timestamp: datetime, **kwargs: Any) -> "TurnCheckpoint":
+        """Create a checkpoint that ended at the given datetime."""
+        checkpoint = cls(timestamp_ns=datetime_to_ns(timestamp), **kwargs)
+        checkpoint._timestamp = timestamp
+        return checkpoint
+
+    @property
+    def timestamp(self) -> datetime:
+        """When the turn ended, as a local datetime built on first access."""
+        if self._timestamp is None:
+            seconds, nanoseconds = divmod(self.timestamp_ns, 1_000_000_000)
+            self._timestamp = datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000)
+        return self._timestamp
+
+    @property
+    def file_changes_paths(self) -> frozenset[str]:
+        """Paths of the files changed in this turn (computed once)."""
+        if self._file_changes_paths is None:
+            self._file_changes_paths = frozenset(fc.path for fc in self.file_changes)
+        return self._file_changes_paths
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
+        data: dict[str, Any] = {
             "turn_number": self.turn_number,
             "message_index": self.message_index,
-            "timestamp": self.timestamp.isoformat(),
-            "file_changes": [fc.to_dict() for fc in self.file_changes],
+            "timestamp_ns": self.timestamp_ns,
             "summary": self.summary,
         }
+        # Most turns change no files; from_dict defaults the list to empty
+        if self.file_changes:
+            data["file_changes"] = [fc.to_dict() for fc in self.file_changes]
+        return data
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "TurnCheckpoint":
@@ -75,9 +130,9 @@ class TurnCheckpoint:
         return cls(
             turn_number=data["turn_number"],
             message_index=data["message_index"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
             file_changes=[FileChange.from_dict(fc) for fc in data.get("file_changes", [])],
             summary=data.get("summary"),
+            timestamp_ns=timestamp_ns_from_dict(data),
         )
 
 
@@ -89,7 +144,7 @@ class RewindState:
     git_branch: str | None = None           # Branch at session start (if git repo)
     git_head: str | None = None             # Commit hash at session start
     current_turn: int = 0
-    checkpoints: list[TurnCheckpoint] = field(default_factory=list)
+    checkpoints: list[TurnCheckpoint] = field(default_factory=list)  # In turn order
     # Track original file states (first time loco touches each file)
     originals: dict[str, str | None] = field(default_factory=dict)
 
@@ -127,11 +182,6 @@ class Conflict:
     actual_content: str | None     # What the file actually contains
 
 
-def hash_path(path: str) -> str:
-    """Generate a short hash for a file path (for storage filenames)."""
-    return hashlib.sha256(path.encode()).hexdigest()[:16]
-
-
 def read_file_safe(path: str, max_size: int = 10 * 1024 * 1024) -> str | None:
     """Safely read a file, returning None if it doesn't exist or is too large.
 
@@ -142,16 +192,95 @@ def read_file_safe(path: str, max_size: int = 10 * 1024 * 1024) -> str | None:
     Returns:
         File content as string, or None if file doesn't exist or exceeds size limit
     """
+    # One open and fstat instead of separate exists/stat/read calls
     try:
-        p = Path(path)
-        if not p.exists():
-            return None
-        if p.stat().st_size > max_size:
-            return None  # Skip files that are too large
-        return p.read_text(encoding="utf-8")
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > max_size:
+                return None  # Skip files that are too large
+            data = f.read()
+        content = data.decode("utf-8")
     except (OSError, UnicodeDecodeError):
         return None
 
+    # Same newline handling as reading in text mode
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+# Bytes at the start of a file covered by its fingerprint
+FINGERPRINT_PREFIX_SIZE = 4096
+
+# (size, mtime_ns, hash of the first FINGERPRINT_PREFIX_SIZE bytes)
+Fingerprint = tuple[int, int, bytes]
+
+
+def _prefix_hash(prefix: bytes) -> bytes:
+    """Hash the leading bytes of a file for its fingerprint."""
+    return hashlib.blake2b(prefix, digest_size=8).digest()
+
+
+def read_fingerprint(path: str) -> Fingerprint | None:
+    """Fingerprint a file from its metadata and first bytes, without reading it all.
+
+    Returns:
+        The fingerprint, or None if the file can't be read
+    """
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            prefix = f.read(FINGERPRINT_PREFIX_SIZE)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, _prefix_hash(prefix)
+
+
+# Most threads used to restore files in one rewind
+RESTORE_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+
+def _restore_file(path: str, content: str | None, source: Path | None = None) -> str | None:
+    """Restore one file for a rewind, deleting it if content is None.
+
+    If source is a stored file already holding the content as UTF-8, it is
+    copied instead (in the kernel, with sendfile, where available), so the
+    content isn't encoded and written from Python.
+
+    Returns:
+        A line for the list of restored files, or None if there was
+        nothing to do (a file to delete is already gone)
+    """
+    try:
+        if content is None:
+            # File should not exist
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                return None
+            return f"Deleted: {path}"
+
+        if source is not None:
+            try:
+                shutil.copyfile(source, path)
+                return f"Restored: {path}"
+            except OSError:
+                pass  # Write the content instead
+
+        # File should exist with this content; its directory is only
+        # recreated if the first attempt finds it missing
+        data = content.encode("utf-8")
+        try:
+            f = open(path, "wb")
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(path, "wb")
+        with f:
+            f.write(data)
+        return f"Restored: {path}"
+    except OSError as e:
+        # Report the error but carry on with the other files
+        return f"Error restoring {path}: {e}"
+
 
 def get_git_context() -> dict[str, str | None]:
     """Get git context for the current directory.
@@ -190,6 +319,13 @@ class RewindManager:
         self.storage = storage
         self._current_turn_changes: dict[str, FileChange] = {}
         self._turn_in_progress = False
+        # Content last written through loco per file, with the file's
+        # fingerprint right after the write: path -> (fingerprint, content)
+        self._fingerprints: dict[str, tuple[Fingerprint, str]] = {}
+        # Resolved form of each path passed to capture_before/after this turn
+        self._resolved_paths: dict[str, str] = {}
+        # Checkpoints by turn number, for the checkpoint list it was built from
+        self._turn_index: tuple[list[TurnCheckpoint], int, dict[int, TurnCheckpoint]] | None = None
 
     @classmethod
     def initialize(
@@ -254,6 +390,18 @@ class RewindManager:
         """
         self._turn_in_progress = True
         self._current_turn_changes = {}
+        self._resolved_paths = {}
+
+    def _resolve_path(self, path: str) -> str:
+        """Normalize a path, resolving each path given only once per turn.
+
+        The result is interned, as it keys the turn's changes and the originals.
+        """
+        resolved = self._resolved_paths.get(path)
+        if resolved is None:
+            resolved = sys.intern(str(Path(path).resolve()))
+            self._resolved_paths[path] = resolved
+        return resolved
 
     def capture_before(self, path: str, max_size: int = 10 * 1024 * 1024) -> None:
         """Capture file state before a write/edit operation.
@@ -267,15 +415,21 @@ class RewindManager:
         if not self._turn_in_progress:
             return
 
-        # Normalize path
-        path = str(Path(path).resolve())
+        path = self._resolve_path(path)
 
         # Only capture if we haven't already captured this file this turn
         if path in self._current_turn_changes:
             return
 
-        # Read current content (or None if file doesn't exist)
-        content = read_file_safe(path, max_size)
+        # Read current content (or None if file doesn't exist). If the file
+        # still matches the fingerprint taken when loco last wrote it, that
+        # content is current and the file doesn't need to be read.
+        known = self._fingerprints.get(path)
+        fingerprint = read_fingerprint(path) if known is not None else None
+        if fingerprint is not None and fingerprint == known[0] and fingerprint[0] <= max_size:
+            content = known[1]
+        else:
+            content = read_file_safe(path, max_size)
 
         # Track original if this is the first time we're touching this file
         if path not in self.state.originals:
@@ -308,8 +462,7 @@ class RewindManager:
         if not self._turn_in_progress:
             return
 
-        # Normalize path
-        path = str(Path(path).resolve())
+        path = self._resolve_path(path)
 
         # Get or create the change entry
         if path not in self._current_turn_changes:
@@ -323,6 +476,7 @@ class RewindManager:
 
         change = self._current_turn_changes[path]
         change.content_after = content
+        self._remember_content(path, content)
 
         # Auto-detect change type if not specified
         if change_type is not None:
@@ -334,6 +488,22 @@ class RewindManager:
         else:
             change.change_type = ChangeType.MODIFIED
 
+    def _remember_content(self, path: str, content: str | None) -> None:
+        """Record the content just written to a file with the file's fingerprint.
+
+        The prefix hash comes from the content itself, so the file is only
+        stat'ed; a write that didn't produce this content won't match later.
+        """
+        self._fingerprints.pop(path, None)
+        if content is None:
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        prefix = content[:FINGERPRINT_PREFIX_SIZE].encode("utf-8")[:FINGERPRINT_PREFIX_SIZE]
+        self._fingerprints[path] = ((st.st_size, st.st_mtime_ns, _prefix_hash(prefix)), content)
+
     def end_turn(self, message_index: int, summary: str | None = None) -> TurnCheckpoint:
         """Mark the end of a conversation turn.
 
@@ -352,7 +522,6 @@ class RewindManager:
         checkpoint = TurnCheckpoint(
             turn_number=self.state.current_turn,
             message_index=message_index,
-            timestamp=datetime.now(),
             file_changes=list(self._current_turn_changes.values()),
             summary=summary,
         )
@@ -377,10 +546,31 @@ class RewindManager:
         Returns:
             Summary string or None
         """
-        for checkpoint in self.state.checkpoints:
-            if checkpoint.turn_number == turn_number:
-                return checkpoint.summary
-        return None
+        checkpoint = self._checkpoints_by_turn().get(turn_number)
+        return checkpoint.summary if checkpoint is not None else None
+
+    def _checkpoints_by_turn(self) -> dict[int, TurnCheckpoint]:
+        """Get the checkpoints keyed by turn number.
+
+        The index is extended as end_turn appends checkpoints and rebuilt when
+        the checkpoint list is replaced or shrinks (after a rewind).
+        """
+        checkpoints = self.state.checkpoints
+        cached = self._turn_index
+        if cached is not None and cached[0] is checkpoints and cached[1] <= len(checkpoints):
+            index = cached[2]
+            for checkpoint in checkpoints[cached[1]:]:
+                index[checkpoint.turn_number] = checkpoint
+        else:
+            index = {checkpoint.turn_number: checkpoint for checkpoint in checkpoints}
+        self._turn_index = (checkpoints, len(checkpoints), index)
+        return index
+
+    def _checkpoints_after_turn(self, turn_number: int) -> list[TurnCheckpoint]:
+        """Get the checkpoints of turns after a turn, found by bisecting the turn order."""
+        checkpoints = self.state.checkpoints
+        start = bisect_right(checkpoints, turn_number, key=attrgetter("turn_number"))
+        return checkpoints[start:]
 
     def get_files_modified_after_turn(self, turn_number: int) -> list[FileChange]:
         """Get all file changes made after a specific turn.
@@ -392,11 +582,24 @@ class RewindManager:
             List of FileChange objects for all changes after the turn
         """
         changes = []
-        for checkpoint in self.state.checkpoints:
-            if checkpoint.turn_number > turn_number:
-                changes.extend(checkpoint.file_changes)
+        for checkpoint in self._checkpoints_after_turn(turn_number):
+            changes.extend(checkpoint.file_changes)
         return changes
 
+    def get_paths_modified_after_turn(self, turn_number: int) -> frozenset[str]:
+        """Get the paths of all files changed after a specific turn.
+
+        Args:
+            turn_number: Turn number to get changed paths after
+
+        Returns:
+            Set of file paths
+        """
+        return frozenset().union(*(
+            checkpoint.file_changes_paths
+            for checkpoint in self._checkpoints_after_turn(turn_number)
+        ))
+
     def validate_before_rewind(self, target_turn: int) -> list[Conflict]:
         """Check for conflicts before rewinding.
 
@@ -411,13 +614,26 @@ class RewindManager:
         """
         conflicts = []
 
-        # Get all changes after target turn
-        changes_to_revert = self.get_files_modified_after_turn(target_turn)
+        # Only the latest change to each file says what it should contain now
+        latest_changes: dict[str, FileChange] = {}
+        for change in self.get_files_modified_after_turn(target_turn):
+            latest_changes[change.path] = change
 
-        # Check each file for unexpected changes
-        for change in changes_to_revert:
-            current = read_file_safe(change.path)
+        # Check each file once for unexpected changes. A file still matching
+        # the fingerprint taken when loco wrote the expected content is
+        # unchanged without reading it.
+        for change in latest_changes.values():
             expected = change.content_after
+            known = self._fingerprints.get(change.path)
+            if (
+                expected is not None
+                and known is not None
+                and known[1] == expected
+                and read_fingerprint(change.path) == known[0]
+            ):
+                continue
+
+            current = read_file_safe(change.path)
 
             if current != expected:
                 conflicts.append(Conflict(
@@ -437,7 +653,8 @@ class RewindManager:
 
         Args:
             turn_number: Turn number to rewind to (0 means before any changes)
-            force: If True, overwrite even if conflicts detected
+            force: If True, overwrite files without checking for conflicts
+                (callers that already ran validate_before_rewind use this)
 
         Returns:
             Tuple of (success, list of restored files, list of conflicts)
@@ -446,8 +663,8 @@ class RewindManager:
             return False, [], []
 
         # Check for conflicts
-        conflicts = self.validate_before_rewind(turn_number)
-        if conflicts and not force:
+        conflicts = [] if force else self.validate_before_rewind(turn_number)
+        if conflicts:
             return False, [], conflicts
 
         restored_files: list[str] = []
@@ -465,24 +682,19 @@ class RewindManager:
                 # First time seeing this file - restore to state before first change
                 file_restore_map[change.path] = change.content_before
 
-        # Now apply the restorations
-        for path, content in file_restore_map.items():
-            try:
-                p = Path(path)
-
-                if content is None:
-                    # File should not exist
-                    if p.exists():
-                        p.unlink()
-                        restored_files.append(f"Deleted: {path}")
-                else:
-                    # File should exist with this content
-                    p.parent.mkdir(parents=True, exist_ok=True)
-                    p.write_text(content, encoding="utf-8")
-                    restored_files.append(f"Restored: {path}")
-            except OSError as e:
-                # Log error but continue
-                restored_files.append(f"Error restoring {path}: {e}")
+        # Now apply the restorations, overlapping the writes when there are
+        # several files (the GIL is released during file I/O)
+        items = [
+            (path, content, self.storage.original_blob_file(path, content))
+            for path, content in file_restore_map.items()
+        ]
+        if len(items) > 1:
+            workers = min(RESTORE_WORKERS, len(items))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_restore_file, *zip(*items)))
+        else:
+            results = [_restore_file(*item) for item in items]
+        restored_files.extend(result for result in results if result is not None)
 
         # Update state
         self.state.checkpoints = [
@@ -490,6 +702,7 @@ class RewindManager:
             if cp.turn_number <= turn_number
         ]
         self.state.current_turn = turn_number
+        self.storage.discard_turns_after(turn_number)
 
         # Persist updated state
         self.persist()
@@ -519,6 +732,7 @@ class RewindManager:
             if cp.turn_number <= turn_number
         ]
         self.state.current_turn = turn_number
+        self.storage.discard_turns_after(turn_number)
 
         # Persist updated state
         self.persist()
@@ -534,10 +748,8 @@ class RewindManager:
         Returns:
             Message index or None if turn not found
         """
-        for checkpoint in self.state.checkpoints:
-            if checkpoint.turn_number == turn_number:
-                return checkpoint.message_index
-        return None
+        checkpoint = self._checkpoints_by_turn().get(turn_number)
+        return checkpoint.message_index if checkpoint is not None else None
 
     def persist(self) -> None:
         """Save the current rewind state to disk."""
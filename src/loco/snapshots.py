@@ -8,15 +8,35 @@ Directory structure:
     ├── session.json              # Existing: conversation, usage
     ├── rewind.json               # RewindState metadata
     └── snapshots/
+        ├── blobs/
+        │   └── {sha256}                # File contents, stored once per session
         ├── originals/
-        │   ├── {path_hash}.snapshot    # Original file content
-        │   └── {path_hash}.meta        # {"path": "/abs/path", "existed": true}
+        │   └── {path_hash}.meta        # {"path": "/abs/path", "existed": true, "blob": "..."}
         └── turns/
             └── turn-{NNN}/
-                ├── {path_hash}.snapshot  # Content after this turn
+                ├── {path_hash}.ref       # Blob holding the content after this turn, or
+                ├── {path_hash}.delta     # Line delta against an earlier version
                 └── manifest.json         # List of FileChanges for this turn
+
+Full file contents are content-addressed: each distinct content is written
+once under blobs/, named by its SHA-256, and referenced from originals, turns
+and rewind.json, so a file that returns to an earlier content (or is the same
+in several places) costs no extra space.
+
+Per-turn contents are stored as deltas against the previous stored version of
+the same file (the original, or an earlier turn). A full snapshot is stored
+instead when there is no usable base, when the delta would not be smaller, or
+every FULL_SNAPSHOT_INTERVAL versions so that delta chains stay short.
+
+Sessions written before blobs were introduced keep their contents in
+{path_hash}.snapshot files and rewind.json; those are still read. Path hashes
+were once truncated SHA-256 rather than BLAKE2b; files named that way are
+found by falling back to the older hash.
 """
 
+import difflib
+import functools
+import hashlib
 import json
 import shutil
 from pathlib import Path
@@ -24,18 +44,96 @@ from typing import Any
 
 from loco.config import get_config_dir
 
+# Maximum number of consecutive deltas before a full snapshot is stored again
+FULL_SNAPSHOT_INTERVAL = 10
+
+# Files larger than this are always stored as full snapshots (diffing is quadratic)
+MAX_DELTA_SIZE = 1024 * 1024
+
+# Snapshot metadata is only read by loco, so it is written without whitespace,
+# and with non-ASCII text as UTF-8 rather than \uXXXX escapes. Documents are
+# encoded in one call and written at once, rather than streamed with
+# json.dump() in many small writes.
+_json_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def _write_text(path: Path, text: str) -> None:
+    """Write text to a file as UTF-8, encoded once and written in one call."""
+    with open(path, "wb") as f:
+        f.write(text.encode("utf-8"))
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON document, parsing the raw bytes without a text decoding layer.
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If it isn't valid UTF-8 JSON
+    """
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
 
 def get_sessions_dir() -> Path:
     """Get the sessions directory path."""
     return get_config_dir() / "sessions"
 
 
+@functools.lru_cache(maxsize=4096)
 def hash_path(path: str) -> str:
-    """Generate a short hash for a file path (for storage filenames)."""
-    import hashlib
+    """Generate a short hash for a file path (for storage filenames).
+
+    Cached, as the same paths are hashed again on every save and load.
+    """
+    return hashlib.blake2b(path.encode(), digest_size=8).hexdigest()
+
+
+def _legacy_hash_path(path: str) -> str:
+    """Get the path hash used for storage filenames before hash_path used BLAKE2b."""
     return hashlib.sha256(path.encode()).hexdigest()[:16]
 
 
+def hash_content(content: str) -> str:
+    """Get the blob ID of file content (its SHA-256)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _hash_bytes(data: bytes) -> str:
+    """Get the blob ID of UTF-8 encoded file content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_delta(base: str, content: str) -> list[Any]:
+    """Compute a line-based delta that turns base into content.
+
+    The delta is a list of operations: ``[start, end]`` copies lines
+    ``start:end`` from base, and a string inserts that text verbatim.
+    """
+    base_lines = base.splitlines(keepends=True)
+    new_lines = content.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, new_lines, autojunk=False)
+
+    ops: list[Any] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j1 != j2:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(base: str, ops: list[Any]) -> str:
+    """Rebuild content from a base version and a delta from make_delta()."""
+    base_lines = base.splitlines(keepends=True)
+    parts: list[str] = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
 class SnapshotStorage:
     """Handles file I/O for storing and retrieving file snapshots."""
 
@@ -50,13 +148,67 @@ class SnapshotStorage:
         self.snapshots_dir = self.session_dir / "snapshots"
         self.originals_dir = self.snapshots_dir / "originals"
         self.turns_dir = self.snapshots_dir / "turns"
+        self.blobs_dir = self.snapshots_dir / "blobs"
+        # Whether ensure_dirs() has created the directories (until a cleanup)
+        self._dirs_ensured = False
+        # Blobs known to be on disk, so storing one again needs no filesystem check
+        self._stored_blobs: set[str] = set()
+        # Blob of each original: path -> (content, blob ID)
+        self._original_blobs: dict[str, tuple[str, str]] = {}
+        # Latest stored version of each file: path -> (turn, content, delta chain length).
+        # Turn 0 is the original snapshot.
+        self._versions: dict[str, tuple[int, str, int]] = {}
+        # Every turn version saved or loaded: (path, turn) -> (content, delta
+        # chain length), so resolving a delta reuses its already-known base
+        # instead of replaying the chain from disk
+        self._turn_contents: dict[tuple[str, int], tuple[str, int]] = {}
+        # rewind.json as last written by this storage
+        self._saved_rewind_state: str | None = None
 
     def ensure_dirs(self) -> None:
-        """Ensure all required directories exist."""
+        """Ensure all required directories exist.
+
+        The directories are only created once per storage, not on every save.
+        """
+        if self._dirs_ensured:
+            return
         self.session_dir.mkdir(parents=True, exist_ok=True)
         self.snapshots_dir.mkdir(exist_ok=True)
         self.originals_dir.mkdir(exist_ok=True)
         self.turns_dir.mkdir(exist_ok=True)
+        self.blobs_dir.mkdir(exist_ok=True)
+        self._dirs_ensured = True
+
+    def store_blob(self, content: str) -> str:
+        """Store file content as a blob, unless it is already stored.
+
+        Returns:
+            The blob ID
+        """
+        # Encoded once: the same bytes are hashed and written
+        data = content.encode("utf-8")
+        blob_id = _hash_bytes(data)
+        if blob_id not in self._stored_blobs:
+            blob_file = self.blobs_dir / blob_id
+            if not blob_file.exists():
+                self.ensure_dirs()
+                # Write under a temporary name so a blob is never seen half-written
+                tmp_file = blob_file.with_suffix(".tmp")
+                with open(tmp_file, "wb") as f:
+                    f.write(data)
+                tmp_file.replace(blob_file)
+            self._stored_blobs.add(blob_id)
+        return blob_id
+
+    def load_blob(self, blob_id: str) -> str | None:
+        """Load the content of a blob, or None if it is missing or unreadable."""
+        try:
+            with open(self.blobs_dir / blob_id, "rb") as f:
+                content = f.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        self._stored_blobs.add(blob_id)
+        return content
 
     def save_original(self, path: str, content: str | None) -> None:
         """Save the original state of a file (first time it's touched).
@@ -68,20 +220,23 @@ class SnapshotStorage:
         self.ensure_dirs()
         path_hash = hash_path(path)
 
-        # Save metadata
-        meta_file = self.originals_dir / f"{path_hash}.meta"
-        meta_data = {
+        meta_data: dict[str, Any] = {
             "path": path,
             "existed": content is not None,
         }
-        with open(meta_file, "w", encoding="utf-8") as f:
-            json.dump(meta_data, f)
 
         # Save content if file existed
         if content is not None:
-            snapshot_file = self.originals_dir / f"{path_hash}.snapshot"
-            with open(snapshot_file, "w", encoding="utf-8") as f:
-                f.write(content)
+            blob_id = self.store_blob(content)
+            if self._original_blobs.get(path, (None, None))[1] == blob_id:
+                return  # Already recorded as this file's original
+            meta_data["blob"] = blob_id
+            self._original_blobs[path] = (content, blob_id)
+            self._versions.setdefault(path, (0, content, 0))
+
+        # Save metadata
+        meta_file = self.originals_dir / f"{path_hash}.meta"
+        _write_text(meta_file, _json_encode(meta_data))
 
     def load_original(self, path: str) -> tuple[bool, str | None]:
         """Load the original state of a file.
@@ -99,12 +254,14 @@ class SnapshotStorage:
         # Load metadata
         meta_file = self.originals_dir / f"{path_hash}.meta"
         if not meta_file.exists():
-            return False, None
+            path_hash = _legacy_hash_path(path)
+            meta_file = self.originals_dir / f"{path_hash}.meta"
+            if not meta_file.exists():
+                return False, None
 
         try:
-            with open(meta_file, encoding="utf-8") as f:
-                meta_data = json.load(f)
-        except (OSError, json.JSONDecodeError):
+            meta_data = _read_json(meta_file)
+        except (OSError, ValueError):
             return False, None
 
         existed = meta_data.get("existed", False)
@@ -112,6 +269,9 @@ class SnapshotStorage:
             return False, None
 
         # Load content
+        if "blob" in meta_data:
+            return True, self.load_blob(meta_data["blob"])
+
         snapshot_file = self.originals_dir / f"{path_hash}.snapshot"
         if not snapshot_file.exists():
             return True, None
@@ -122,6 +282,17 @@ class SnapshotStorage:
         except (OSError, UnicodeDecodeError):
             return True, None
 
+    def original_blob_file(self, path: str, content: str | None) -> Path | None:
+        """Get the blob file holding content, if it is the file's stored original.
+
+        Restoring a file to its original can then copy this file rather than
+        write the content.
+        """
+        known = self._original_blobs.get(path)
+        if content is None or known is None or known[0] != content:
+            return None
+        return self.blobs_dir / known[1]
+
     def save_turn(self, checkpoint: "TurnCheckpoint") -> None:
         """Save a turn checkpoint with all its file changes.
 
@@ -132,18 +303,24 @@ class SnapshotStorage:
 
         self.ensure_dirs()
         turn_dir = self.turns_dir / f"turn-{checkpoint.turn_number:03d}"
-        turn_dir.mkdir(exist_ok=True)
+        # Files of an earlier save of this turn can only exist if its
+        # directory did; a new directory needs no per-file cleanup
+        try:
+            turn_dir.mkdir()
+            replacing = False
+        except FileExistsError:
+            replacing = True
 
         # Save manifest with change metadata
         manifest_data = {
             "turn_number": checkpoint.turn_number,
             "message_index": checkpoint.message_index,
-            "timestamp": checkpoint.timestamp.isoformat(),
+            "timestamp_ns": checkpoint.timestamp_ns,
             "summary": checkpoint.summary,
-            "changes": [],
         }
 
-        # Save each file's after-state
+        # Save each file's after-state; turns without changes omit the list
+        changes = []
         for change in checkpoint.file_changes:
             path_hash = hash_path(change.path)
 
@@ -152,18 +329,158 @@ class SnapshotStorage:
                 "path_hash": path_hash,
                 "change_type": change.change_type.value,
             }
-            manifest_data["changes"].append(change_entry)
+            changes.append(change_entry)
 
             # Save content_after if not None (deleted files have None)
             if change.content_after is not None:
-                snapshot_file = turn_dir / f"{path_hash}.snapshot"
-                with open(snapshot_file, "w", encoding="utf-8") as f:
-                    f.write(change.content_after)
+                self._save_turn_content(
+                    turn_dir, checkpoint.turn_number, change.path, path_hash, change.content_after,
+                    replacing,
+                )
+            else:
+                self._versions.pop(change.path, None)
+
+        if changes:
+            manifest_data["changes"] = changes
 
         # Save manifest
         manifest_file = turn_dir / "manifest.json"
-        with open(manifest_file, "w", encoding="utf-8") as f:
-            json.dump(manifest_data, f, indent=2)
+        _write_text(manifest_file, _json_encode(manifest_data))
+
+    def _save_turn_content(
+        self,
+        turn_dir: Path,
+        turn_number: int,
+        path: str,
+        path_hash: str,
+        content: str,
+        replacing: bool = True,
+    ) -> None:
+        """Write a file's after-state for a turn as a delta or a blob reference.
+
+        Unless replacing is False (the turn directory is new), a file left
+        by an earlier save of the turn in another form is removed.
+        """
+        ref_file = turn_dir / f"{path_hash}.ref"
+        delta_file = turn_dir / f"{path_hash}.delta"
+        if replacing:
+            (turn_dir / f"{path_hash}.snapshot").unlink(missing_ok=True)
+
+        base = self._versions.get(path)
+        delta_json: str | None = None
+        if (
+            base is not None
+            and base[0] < turn_number
+            and base[2] < FULL_SNAPSHOT_INTERVAL
+            and len(base[1]) <= MAX_DELTA_SIZE
+            and len(content) <= MAX_DELTA_SIZE
+        ):
+            delta_data = {"base_turn": base[0], "ops": make_delta(base[1], content)}
+            delta_json = _json_encode(delta_data)
+            if len(delta_json) >= len(content):
+                delta_json = None
+
+        if delta_json is not None:
+            _write_text(delta_file, delta_json)
+            if replacing:
+                ref_file.unlink(missing_ok=True)
+            self._versions[path] = (turn_number, content, base[2] + 1)
+            self._turn_contents[(path, turn_number)] = (content, base[2] + 1)
+        else:
+            _write_text(ref_file, self.store_blob(content))
+            if replacing:
+                delta_file.unlink(missing_ok=True)
+            self._versions[path] = (turn_number, content, 0)
+            self._turn_contents[(path, turn_number)] = (content, 0)
+
+    def _load_turn_content(
+        self,
+        turn_number: int,
+        path: str,
+        path_hash: str,
+    ) -> tuple[str | None, int]:
+        """Load a file's after-state for a turn, resolving deltas.
+
+        Returns:
+            Tuple of (content, delta chain length); content is None if missing
+        """
+        if turn_number == 0:
+            _, content = self.load_original(path)
+            return content, 0
+
+        known = self._turn_contents.get((path, turn_number))
+        if known is not None:
+            return known
+
+        content, chain = self._read_turn_content(turn_number, path, path_hash)
+        if content is not None:
+            self._turn_contents[(path, turn_number)] = (content, chain)
+        return content, chain
+
+    def _read_turn_content(
+        self,
+        turn_number: int,
+        path: str,
+        path_hash: str,
+    ) -> tuple[str | None, int]:
+        """Read a file's after-state for a turn from disk (see _load_turn_content)."""
+        turn_dir = self.turns_dir / f"turn-{turn_number:03d}"
+
+        ref_file = turn_dir / f"{path_hash}.ref"
+        if ref_file.exists():
+            try:
+                blob_id = ref_file.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None, 0
+            return self.load_blob(blob_id), 0
+
+        # Full snapshot from before blobs were introduced
+        snapshot_file = turn_dir / f"{path_hash}.snapshot"
+        if snapshot_file.exists():
+            try:
+                with open(snapshot_file, encoding="utf-8") as f:
+                    return f.read(), 0
+            except (OSError, UnicodeDecodeError):
+                return None, 0
+
+        delta_file = turn_dir / f"{path_hash}.delta"
+        if not delta_file.exists():
+            # A delta base stored before the switch to BLAKE2b path hashes
+            legacy_hash = _legacy_hash_path(path)
+            if legacy_hash != path_hash:
+                return self._read_turn_content(turn_number, path, legacy_hash)
+            return None, 0
+
+        try:
+            delta_data = _read_json(delta_file)
+        except (OSError, ValueError):
+            return None, 0
+
+        base_turn = delta_data["base_turn"]
+        if base_turn >= turn_number:
+            return None, 0
+        base, chain = self._load_turn_content(base_turn, path, path_hash)
+        if base is None:
+            return None, 0
+        return apply_delta(base, delta_data["ops"]), chain + 1
+
+    def discard_turns_after(self, turn_number: int) -> None:
+        """Remove stored turns after turn_number (e.g. after a rewind).
+
+        Later turns will reuse those turn numbers, so their snapshots must not
+        be used as delta bases.
+        """
+        self._versions = {
+            path: version for path, version in self._versions.items()
+            if version[0] <= turn_number
+        }
+        self._turn_contents = {
+            key: version for key, version in self._turn_contents.items()
+            if key[1] <= turn_number
+        }
+        for turn in self.list_turns():
+            if turn > turn_number:
+                shutil.rmtree(self.turns_dir / f"turn-{turn:03d}", ignore_errors=True)
 
     def load_turn(self, turn_number: int) -> "TurnCheckpoint | None":
         """Load a turn checkpoint.
@@ -174,19 +491,15 @@ class SnapshotStorage:
         Returns:
             TurnCheckpoint if found, None otherwise
         """
-        from loco.rewind import TurnCheckpoint, FileChange, ChangeType
-        from datetime import datetime
+        from loco.rewind import TurnCheckpoint, FileChange, ChangeType, timestamp_ns_from_dict
 
         turn_dir = self.turns_dir / f"turn-{turn_number:03d}"
         manifest_file = turn_dir / "manifest.json"
 
-        if not manifest_file.exists():
-            return None
-
+        # A missing manifest is an OSError too
         try:
-            with open(manifest_file, encoding="utf-8") as f:
-                manifest_data = json.load(f)
-        except (OSError, json.JSONDecodeError):
+            manifest_data = _read_json(manifest_file)
+        except (OSError, ValueError):
             return None
 
         # Reconstruct file changes
@@ -196,15 +509,12 @@ class SnapshotStorage:
             path_hash = change_entry["path_hash"]
             change_type = ChangeType(change_entry["change_type"])
 
-            # Load content_after from snapshot file
-            snapshot_file = turn_dir / f"{path_hash}.snapshot"
-            content_after = None
-            if snapshot_file.exists():
-                try:
-                    with open(snapshot_file, encoding="utf-8") as f:
-                        content_after = f.read()
-                except (OSError, UnicodeDecodeError):
-                    pass
+            # Load content_after from snapshot or delta file
+            content_after, chain = self._load_turn_content(turn_number, path, path_hash)
+            if content_after is not None:
+                current = self._versions.get(path)
+                if current is None or current[0] <= turn_number:
+                    self._versions[path] = (turn_number, content_after, chain)
 
             # Load content_before from original or previous turn
             existed, content_before = self.load_original(path)
@@ -221,33 +531,56 @@ class SnapshotStorage:
         return TurnCheckpoint(
             turn_number=manifest_data["turn_number"],
             message_index=manifest_data["message_index"],
-            timestamp=datetime.fromisoformat(manifest_data["timestamp"]),
             file_changes=file_changes,
             summary=manifest_data.get("summary"),
+            timestamp_ns=timestamp_ns_from_dict(manifest_data),
         )
 
     def save_rewind_state(self, state: "RewindState") -> None:
         """Save the rewind state to disk.
 
+        Turns are stored by save_turn(), so this only writes a small index;
+        it is skipped when that hasn't changed since the last save (the
+        state is persisted with every conversation save, but only changes
+        when a turn ends or is rewound).
+
         Args:
             state: RewindState to save
         """
-        self.ensure_dirs()
         rewind_file = self.session_dir / "rewind.json"
 
-        # Convert state to dict (without full file contents in checkpoints)
+        # Convert state to dict (file contents are referenced by blob ID)
         state_data = {
             "session_id": state.session_id,
             "working_directory": state.working_directory,
             "git_branch": state.git_branch,
             "git_head": state.git_head,
             "current_turn": state.current_turn,
-            "originals": state.originals,
+            "original_blobs": {
+                path: self._original_blob_id(path, content)
+                for path, content in state.originals.items()
+            },
             "checkpoint_turns": [cp.turn_number for cp in state.checkpoints],
         }
 
-        with open(rewind_file, "w", encoding="utf-8") as f:
-            json.dump(state_data, f, indent=2)
+        serialized = _json_encode(state_data)
+        if serialized == self._saved_rewind_state and rewind_file.exists():
+            return
+
+        self.ensure_dirs()
+        _write_text(rewind_file, serialized)
+        self._saved_rewind_state = serialized
+
+    def _original_blob_id(self, path: str, content: str | None) -> str | None:
+        """Get the blob ID of a file's original content, storing it if needed."""
+        if content is None:
+            return None
+        known = self._original_blobs.get(path)
+        if known is not None and known[0] is content:
+            return known[1]
+        blob_id = self.store_blob(content)
+        self._original_blobs[path] = (content, blob_id)
+        return blob_id
 
     def load_rewind_state(self) -> "RewindState | None":
         """Load the rewind state from disk.
@@ -259,13 +592,10 @@ class SnapshotStorage:
 
         rewind_file = self.session_dir / "rewind.json"
 
-        if not rewind_file.exists():
-            return None
-
+        # A missing file is an OSError too
         try:
-            with open(rewind_file, encoding="utf-8") as f:
-                state_data = json.load(f)
-        except (OSError, json.JSONDecodeError):
+            state_data = _read_json(rewind_file)
+        except (OSError, ValueError):
             return None
 
         # Load checkpoints from turn files
@@ -275,6 +605,22 @@ class SnapshotStorage:
             if checkpoint:
                 checkpoints.append(checkpoint)
 
+        if "original_blobs" in state_data:
+            originals: dict[str, str | None] = {}
+            for path, blob_id in state_data["original_blobs"].items():
+                if blob_id is None:
+                    originals[path] = None
+                    continue
+                content = self.load_blob(blob_id)
+                if content is not None:
+                    # A lost blob leaves the file untracked rather than
+                    # recorded as not having existed
+                    originals[path] = content
+                    self._original_blobs[path] = (content, blob_id)
+        else:
+            # Written before blobs: contents are inline
+            originals = state_data.get("originals", {})
+
         return RewindState(
             session_id=state_data["session_id"],
             working_directory=state_data["working_directory"],
@@ -282,18 +628,30 @@ class SnapshotStorage:
             git_head=state_data.get("git_head"),
             current_turn=state_data.get("current_turn", 0),
             checkpoints=checkpoints,
-            originals=state_data.get("originals", {}),
+            originals=originals,
         )
 
     def cleanup(self) -> None:
         """Remove all stored snapshots for this session."""
         if self.snapshots_dir.exists():
             shutil.rmtree(self.snapshots_dir)
+        self._forget_stored()
+
+    def _forget_stored(self) -> None:
+        """Drop what this storage knows to be on disk, after removing it."""
+        self._dirs_ensured = False
+        self._stored_blobs.clear()
+        self._original_blobs.clear()
+        # Their files are gone, so they can't be delta bases or be loaded
+        self._versions.clear()
+        self._turn_contents.clear()
 
     def cleanup_full(self) -> None:
         """Remove the entire session directory including snapshots and rewind state."""
         if self.session_dir.exists():
             shutil.rmtree(self.session_dir)
+        self._forget_stored()
+        self._saved_rewind_state = None
 
     def get_storage_size(self) -> int:
         """Get the total size of stored snapshots in bytes.
@@ -320,10 +678,8 @@ class SnapshotStorage:
 
         for meta_file in self.originals_dir.glob("*.meta"):
             try:
-                with open(meta_file, encoding="utf-8") as f:
-                    meta_data = json.load(f)
-                    paths.append(meta_data["path"])
-            except (OSError, json.JSONDecodeError, KeyError):
+                paths.append(_read_json(meta_file)["path"])
+            except (OSError, ValueError, KeyError):
                 continue
 
         return paths
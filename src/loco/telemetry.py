@@ -90,6 +90,11 @@ class CostProfile:
     start_time: datetime
     calls: list[TrackedCall] = field(default_factory=list)
     files_read: dict[str, int] = field(default_factory=dict)  # path -> read count
+    _file_read_count: int = field(default=0, init=False, repr=False, compare=False)
+    _aggregates_key: tuple[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _aggregates: tuple[dict[str, float], dict[str, float], list[tuple[str, int]]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def add_call(self, call: TrackedCall) -> None:
         """Add a tracked call to the profile."""
@@ -98,6 +103,7 @@ class CostProfile:
     def record_file_read(self, path: str) -> None:
         """Record a file read for duplicate detection."""
         self.files_read[path] = self.files_read.get(path, 0) + 1
+        self._file_read_count += 1
 
     @property
     def total_cost(self) -> float:
@@ -152,6 +158,35 @@ class CostProfile:
         duplicates = [(path, count) for path, count in self.files_read.items() if count > 1]
         return sorted(duplicates, key=lambda x: x[1], reverse=True)
 
+    def compute_aggregates(
+        self,
+    ) -> tuple[dict[str, float], dict[str, float], list[tuple[str, int]]]:
+        """Get cost by operation, cost by agent, and duplicate reads in one pass.
+
+        Equivalent to calling cost_by_operation(), cost_by_agent() and
+        duplicate_file_reads(), but walks self.calls only once. The result is
+        cached until a call or file read is recorded.
+        """
+        key = (len(self.calls), self._file_read_count)
+        if self._aggregates is not None and self._aggregates_key == key:
+            return self._aggregates
+
+        by_operation: dict[str, float] = {}
+        by_agent: dict[str, float] = {}
+        for call in self.calls:
+            op = call.operation_type.value
+            by_operation[op] = by_operation.get(op, 0) + call.cost
+            agent = call.agent_name or "main"
+            by_agent[agent] = by_agent.get(agent, 0) + call.cost
+
+        self._aggregates = (
+            dict(sorted(by_operation.items(), key=lambda x: x[1], reverse=True)),
+            dict(sorted(by_agent.items(), key=lambda x: x[1], reverse=True)),
+            self.duplicate_file_reads(),
+        )
+        self._aggregates_key = key
+        return self._aggregates
+
     def to_dict(self) -> dict:
         """Serialize to dictionary."""
         return {
@@ -356,7 +391,8 @@ def generate_report(profile: CostProfile) -> str:
     ]
 
     total = profile.total_cost or 1
-    for op, cost in profile.cost_by_operation().items():
+    op_costs, agent_costs, duplicates = profile.compute_aggregates()
+    for op, cost in op_costs.items():
         pct = (cost / total) * 100
         lines.append(f"| {op} | ${cost:.4f} | {pct:.1f}% |")
 
@@ -368,12 +404,11 @@ def generate_report(profile: CostProfile) -> str:
         "|-------|------|------------|",
     ])
 
-    for agent, cost in profile.cost_by_agent().items():
+    for agent, cost in agent_costs.items():
         pct = (cost / total) * 100
         lines.append(f"| {agent} | ${cost:.4f} | {pct:.1f}% |")
 
     # Optimization opportunities
-    duplicates = profile.duplicate_file_reads()
     if duplicates:
         lines.extend([
             "",
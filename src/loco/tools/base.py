@@ -53,10 +53,13 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self._tools: dict[str, Tool] = {}
+        # Bumped whenever the set of tools changes, for caches of tool listings
+        self.version = 0
 
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self.version += 1
 
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -1,6 +1,9 @@
 """Edit file tool for loco."""
 
 import difflib
+import functools
+import os
+import stat
 from pathlib import Path
 from typing import Any
 
@@ -29,6 +32,15 @@ def generate_diff(old_string: str, new_string: str, context_lines: int = 3) -> s
     return ''.join(diff)
 
 
+@functools.lru_cache(maxsize=1024)
+def _resolve_path(cwd: str, file_path: str) -> Path:
+    """Resolve a file path argument against a working directory (cached per pair)."""
+    path = Path(file_path).expanduser()
+    if not path.is_absolute():
+        path = Path(cwd) / path
+    return path
+
+
 class EditTool(Tool):
     """Tool for editing files via string replacement."""
 
@@ -78,14 +90,15 @@ class EditTool(Tool):
     ) -> str:
         """Edit a file by string replacement."""
         # Resolve path
-        path = Path(file_path).expanduser()
-        if not path.is_absolute():
-            path = Path.cwd() / path
+        path = _resolve_path(os.getcwd(), file_path)
 
-        if not path.exists():
+        # One stat answers both whether the file exists and whether it's a file
+        try:
+            st = os.stat(path)
+        except OSError:
             return f"Error: File not found: {path}"
 
-        if not path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             return f"Error: Not a file: {path}"
 
         # Capture state before edit for REWIND
@@ -1,6 +1,7 @@
 """Glob tool for finding files by pattern."""
 
 import os
+import stat
 from pathlib import Path
 from typing import Any
 
@@ -53,21 +54,29 @@ class GlobTool(Tool):
         """Find files matching the glob pattern."""
         search_path = Path(path) if path else Path.cwd()
 
-        if not search_path.exists():
+        try:
+            is_dir = stat.S_ISDIR(os.stat(search_path).st_mode)
+        except OSError:
             return f"Error: Directory does not exist: {search_path}"
 
-        if not search_path.is_dir():
+        if not is_dir:
             return f"Error: Not a directory: {search_path}"
 
         try:
-            # Find matching files
-            matches = list(search_path.glob(pattern))
-
-            # Filter to files only (not directories)
-            files = [m for m in matches if m.is_file()]
+            # Find matching files (not directories), with one stat per match
+            # giving both the file type and the modification time
+            timed_files = []
+            for match in search_path.glob(pattern):
+                try:
+                    st = os.stat(match)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    timed_files.append((st.st_mtime, match))
 
             # Sort by modification time (newest first)
-            files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+            timed_files.sort(key=lambda item: item[0], reverse=True)
+            files = [match for _, match in timed_files]
 
             # Apply limit
             if len(files) > limit:
@@ -1,5 +1,7 @@
 """UI components for loco - minimal Claude Code-inspired output."""
 
+import threading
+import time
 from contextlib import contextmanager
 from typing import Any, Generator
 
@@ -193,6 +195,59 @@ class StreamingMarkdown:
             self._live.update(Markdown(self.content))
 
 
+class StreamingText:
+    """Helper for streaming plain text with batched terminal writes.
+
+    Chunks are buffered and written at most once per flush interval, without
+    markup parsing, instead of one console write per token. Buffered text is
+    written within one interval even if no further chunk arrives.
+    """
+
+    def __init__(self, console: Console, flush_interval: float = 0.016) -> None:
+        self.console = console
+        self.flush_interval = flush_interval
+        self._parts: list[str] = []
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def __enter__(self) -> "StreamingText":
+        self._last_flush = time.monotonic()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.flush()
+
+    def append(self, chunk: str) -> None:
+        """Append a chunk, writing the buffer if the flush interval has passed."""
+        with self._lock:
+            self._parts.append(chunk)
+            elapsed = time.monotonic() - self._last_flush
+            if elapsed >= self.flush_interval:
+                self._flush_locked()
+            elif self._timer is None:
+                # Write it when the interval ends, in case the model pauses here
+                self._timer = threading.Timer(self.flush_interval - elapsed, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write any buffered text to the console."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Write the buffer and cancel any pending timed write (lock held)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._last_flush = time.monotonic()
+        if self._parts:
+            text = "".join(self._parts)
+            self._parts.clear()
+            self.console.out(text, end="", highlight=False)
+
+
 @contextmanager
 def thinking_spinner(console: Console) -> Generator[Spinner, None, None]:
     """Context manager for a thinking spinner."""
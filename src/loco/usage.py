@@ -113,8 +113,7 @@ def estimate_conversation_tokens(conversation: Any) -> int:
 
         # Tool calls add overhead
         if msg.tool_calls:
-            import json
-            total_chars += len(json.dumps(msg.tool_calls))
+            total_chars += len(msg.tool_calls_json())
 
     # Rough estimate: ~4 characters per token (conservative for English)
     # This varies by model and language
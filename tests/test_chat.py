@@ -0,0 +1,60 @@
+"""Tests for conversation message handling."""
+
+from loco.chat import Conversation, Message
+
+
+class TestConversationSystemMessage:
+    """Tests for system message bookkeeping."""
+
+    def test_add_system_message_replaces_in_place(self):
+        """Test that updating the system prompt keeps it at index 0."""
+        conversation = Conversation()
+        conversation.add_user_message("hello")
+        conversation.add_system_message("first")
+        conversation.add_system_message("second")
+
+        assert [m.role for m in conversation.messages] == ["system", "user"]
+        assert conversation.system_message.content == "second"
+        assert conversation.non_system_count == 1
+
+    def test_truncate_keeps_system_message(self):
+        """Test truncating history at various indexes."""
+        conversation = Conversation()
+        conversation.add_system_message("system")
+        for i in range(4):
+            conversation.add_user_message(f"message {i}")
+
+        conversation.truncate(3)
+        assert [m.content for m in conversation.messages] == ["system", "message 0", "message 1"]
+
+        conversation.truncate(0)
+        assert [m.content for m in conversation.messages] == ["system"]
+
+    def test_clear_without_system_message(self):
+        """Test clearing a conversation that has no system message."""
+        conversation = Conversation()
+        conversation.add_user_message("hello")
+
+        assert conversation.system_message is None
+        conversation.clear()
+        assert conversation.messages == []
+
+
+class TestMessageToolCalls:
+    """Tests for tool call serialization."""
+
+    def test_tool_calls_json_follows_changes(self):
+        """Test that changing tool_calls after serializing is reflected."""
+        call = {"id": "1", "type": "function", "function": {"name": "read", "arguments": "{}"}}
+        message = Message(role="assistant", tool_calls=[call])
+        assert message.to_dict()["tool_calls"] == [call]
+        assert '"read"' in message.tool_calls_json()
+
+        other = {"id": "2", "type": "function", "function": {"name": "bash", "arguments": "{}"}}
+        message.tool_calls.append(other)
+        assert message.to_dict()["tool_calls"] == [call, other]
+        assert '"bash"' in message.tool_calls_json()
+
+        message.tool_calls = [other]
+        assert message.to_dict()["tool_calls"] == [other]
+        assert '"read"' not in message.tool_calls_json()
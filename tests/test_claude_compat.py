@@ -141,6 +141,41 @@ description: From .loco
         assert "Loco Version" in agent.system_prompt
 
 
+def test_agents_rediscovery_reparses_only_changed_files():
+    """Test that discover() again reuses agents whose files are unchanged."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+
+        loco_agents_dir = project_dir / ".loco" / "agents"
+        loco_agents_dir.mkdir(parents=True)
+        (loco_agents_dir / "first.md").write_text("""---
+description: First agent
+---
+# First
+""")
+        second_file = loco_agents_dir / "second.md"
+        second_file.write_text("""---
+description: Second agent
+---
+# Second
+""")
+
+        registry = AgentRegistry()
+        registry.discover(project_dir)
+        first = registry.get("first")
+
+        second_file.write_text("""---
+description: Second agent, edited
+---
+# Second
+""")
+        registry.discover(project_dir)
+
+        # The unchanged file isn't re-parsed; the edited one is
+        assert registry.get("first") is first
+        assert registry.get("second").description == "Second agent, edited"
+
+
 def test_both_directories_can_coexist():
     """Test that skills/agents from both directories can coexist."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -1,13 +1,22 @@
 """Tests for the commands system."""
 
+import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from loco.commands import Command, CommandRegistry
 
 
+@pytest.fixture(autouse=True)
+def isolated_config_dir(tmp_path):
+    """Keep discover() away from the real user commands and command index."""
+    with patch("loco.commands.get_config_dir", return_value=tmp_path / "config"):
+        yield
+
+
 def test_command_creation():
     """Test creating a Command object."""
     cmd = Command(
@@ -47,7 +56,29 @@ Create a commit message following conventional commits.
         cmd = registry.commands["commit"]
         assert cmd.name == "commit"
         assert cmd.description == "Create a git commit"
-        assert "Create a commit message" in cmd.content
+        assert "Create a commit message" in cmd.load_content()
+
+
+def test_command_body_loaded_lazily():
+    """Test that discovery reads only the frontmatter and content loads on first use."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        commands_dir = Path(tmpdir) / "commands"
+        commands_dir.mkdir()
+
+        command_file = commands_dir / "deploy.md"
+        command_file.write_text("""---
+description: Deploy the app
+---
+
+Run the deploy script.
+""")
+
+        registry = CommandRegistry()
+        registry._load_commands_from_dir(commands_dir)
+
+        cmd = registry.commands["deploy"]
+        assert cmd.content is None
+        assert cmd.load_content() == "Run the deploy script."
 
 
 def test_subdirectory_command_loading():
@@ -271,6 +302,96 @@ def test_command_discovery_precedence():
             loco.commands.get_config_dir = original_get_config_dir
 
 
+def test_get_all_cached_until_directory_changes():
+    """Test that get_all is memoized and refreshed when a search dir changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        loco_dir = project_dir / ".loco" / "commands"
+        loco_dir.mkdir(parents=True)
+        (loco_dir / "first.md").write_text("---\ndescription: First\n---\n\nFirst")
+
+        import loco.commands
+        original_get_config_dir = loco.commands.get_config_dir
+        loco.commands.get_config_dir = lambda: project_dir / ".config" / "loco"
+
+        try:
+            registry = CommandRegistry()
+            registry.discover(project_dir)
+
+            commands = registry.get_all()
+            assert [c.name for c in commands] == ["first"]
+            assert registry.get_all() is commands
+            assert registry.get_user_invocable() is registry.get_user_invocable()
+
+            (loco_dir / "second.md").write_text("---\ndescription: Second\n---\n\nSecond")
+            st = loco_dir.stat()
+            os.utime(loco_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+            assert sorted(c.name for c in registry.get_all()) == ["first", "second"]
+        finally:
+            loco.commands.get_config_dir = original_get_config_dir
+
+
+def test_discover_reuses_command_index():
+    """Test that unchanged command files are loaded from the index without parsing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        loco_dir = project_dir / ".loco" / "commands"
+        loco_dir.mkdir(parents=True)
+        (loco_dir / "first.md").write_text("---\ndescription: First\nmodel: fast\n---\n\nFirst body")
+
+        import loco.commands
+        original_get_config_dir = loco.commands.get_config_dir
+        loco.commands.get_config_dir = lambda: project_dir / ".config" / "loco"
+
+        try:
+            CommandRegistry().discover(project_dir)
+            assert loco.commands.get_command_index_path().exists()
+
+            registry = CommandRegistry()
+            with patch.object(CommandRegistry, "_parse_command_file") as mock_parse:
+                registry.discover(project_dir)
+                mock_parse.assert_not_called()
+
+            cmd = registry.commands["first"]
+            assert cmd.description == "First"
+            assert cmd.model == "fast"
+            assert cmd.load_content() == "First body"
+
+            # A modified file is parsed again
+            (loco_dir / "first.md").write_text("---\ndescription: Changed\n---\n\nNew body")
+            registry.discover(project_dir)
+            assert registry.commands["first"].description == "Changed"
+        finally:
+            loco.commands.get_config_dir = original_get_config_dir
+
+
+def test_command_index_keeps_other_projects():
+    """Test that discovering one project keeps the index entries of another."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first_dir = Path(tmpdir) / "first" / ".loco" / "commands"
+        second_dir = Path(tmpdir) / "second" / ".loco" / "commands"
+        first_dir.mkdir(parents=True)
+        second_dir.mkdir(parents=True)
+        (first_dir / "build.md").write_text("---\ndescription: Build\n---\n\nBody")
+        (first_dir / "old.md").write_text("---\ndescription: Old\n---\n\nBody")
+        (second_dir / "test.md").write_text("---\ndescription: Test\n---\n\nBody")
+
+        import loco.commands
+        CommandRegistry().discover(Path(tmpdir) / "first")
+        CommandRegistry().discover(Path(tmpdir) / "second")
+        index = loco.commands._load_command_index()
+        assert {str(first_dir / "build.md"), str(first_dir / "old.md"), str(second_dir / "test.md")} <= set(index)
+
+        # Deleted files drop out when their project is discovered again
+        (first_dir / "old.md").unlink()
+        CommandRegistry().discover(Path(tmpdir) / "first")
+        index = loco.commands._load_command_index()
+        assert str(first_dir / "old.md") not in index
+        assert str(first_dir / "build.md") in index
+        assert str(second_dir / "test.md") in index
+
+
 def test_get_system_prompt_addition():
     """Test command system prompt generation."""
     cmd = Command(
@@ -303,5 +424,42 @@ def test_command_match_by_name():
         assert matches[0].name == "commit"
 
 
+def test_command_match_by_task_keywords():
+    """Test command matching by shared task keyword categories."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        commands_dir = Path(tmpdir) / ".loco" / "commands"
+        commands_dir.mkdir(parents=True)
+
+        (commands_dir / "lint.md").write_text("---\ndescription: Audit style problems\n---\n\nContent")
+        (commands_dir / "docs.md").write_text("---\ndescription: Write a README\n---\n\nContent")
+
+        registry = CommandRegistry()
+        registry.discover(Path(tmpdir))
+
+        # "review" and "audit" share a category; "readme" matches as a substring
+        assert [c.name for c in registry.match_commands("please review this")] == ["lint"]
+        assert [c.name for c in registry.match_commands("update readmes")] == ["docs"]
+        assert registry.match_commands("hello there") == []
+
+
+def test_command_match_ranks_by_description_words():
+    """Test that shared description words rank commands, ties keeping discovery order."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        commands_dir = Path(tmpdir) / ".loco" / "commands"
+        commands_dir.mkdir(parents=True)
+
+        (commands_dir / "a-deploy.md").write_text("---\ndescription: Ship the staging build\n---\n\nContent")
+        (commands_dir / "b-release.md").write_text("---\ndescription: Tag and ship a release build\n---\n\nContent")
+        (commands_dir / "c-bump.md").write_text("---\ndescription: Ship it\n---\n\nContent")
+
+        registry = CommandRegistry()
+        registry.discover(Path(tmpdir))
+        order = [c.name for c in registry.commands.values()]
+
+        matches = [c.name for c in registry.match_commands("ship a release build")]
+        assert matches == ["b-release", "a-deploy", "c-bump"]
+        assert [c.name for c in registry.match_commands("ship", limit=2)] == order[:2]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+"""Tests for loco configuration loading."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from loco import config as config_module
+from loco.config import Config, load_config, save_config
+
+
+class TestLoadConfigCache:
+    """Tests for cached config loading."""
+
+    def test_load_config_cached_until_file_changes(self):
+        """Test that the config file is only re-parsed after it changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.config.get_config_dir", return_value=Path(tmpdir)):
+                save_config(Config(default_model="openai/gpt-4o-mini"))
+
+                misses = config_module._load_config_file.cache_info().misses
+                first = load_config()
+                second = load_config()
+                assert config_module._load_config_file.cache_info().misses == misses + 1
+
+                assert first.default_model == "openai/gpt-4o-mini"
+                # Callers get independent copies
+                first.default_model = "changed"
+                assert second.default_model == "openai/gpt-4o-mini"
+                assert load_config().default_model == "openai/gpt-4o-mini"
+
+                # Editing the file outside save_config invalidates the cache
+                config_path = Path(tmpdir) / "config.json"
+                config_path.write_text(json.dumps({"default_model": "ollama/llama3"}))
+                os.utime(config_path, ns=(0, 0))
+                assert load_config().default_model == "ollama/llama3"
+
+    def test_load_config_nested_values_not_shared(self):
+        """Test that modifying nested values of a loaded config leaves the cache intact."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.config.get_config_dir", return_value=Path(tmpdir)):
+                save_config(Config(
+                    hooks={"PreToolUse": [{"command": "echo pre"}]},
+                    mcp_servers={"files": {"command": ["server"], "env": {"MODE": "ro"}}},
+                ))
+
+                first = load_config()
+                first.hooks["PreToolUse"].append({"command": "echo extra"})
+                first.mcp_servers["files"]["env"]["MODE"] = "rw"
+
+                second = load_config()
+                assert second.hooks["PreToolUse"] == [{"command": "echo pre"}]
+                assert second.mcp_servers["files"]["env"] == {"MODE": "ro"}
+
+
+class TestConfigDir:
+    """Tests for locating the configuration directory."""
+
+    def test_config_dir_follows_xdg_config_home(self):
+        """Test that changing XDG_CONFIG_HOME redirects the config directory."""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            with patch.dict(os.environ, {"XDG_CONFIG_HOME": first}):
+                assert config_module.get_config_dir() == Path(first) / "loco"
+            with patch.dict(os.environ, {"XDG_CONFIG_HOME": second}):
+                assert config_module.get_config_dir() == Path(second) / "loco"
+
+
+class TestExpandEnvVars:
+    """Tests for environment variable expansion in config values."""
+
+    def test_expands_nested_values(self):
+        """Test that both syntaxes expand and unknown variables are left as-is."""
+        with patch.dict(os.environ, {"LOCO_TEST_KEY": "secret"}):
+            expanded = config_module.expand_env_vars({
+                "api_key": "${LOCO_TEST_KEY}",
+                "args": ["--key=$LOCO_TEST_KEY", "$LOCO_TEST_MISSING", 3],
+                "plain": "no variables",
+            })
+
+        assert expanded == {
+            "api_key": "secret",
+            "args": ["--key=secret", "$LOCO_TEST_MISSING", 3],
+            "plain": "no variables",
+        }
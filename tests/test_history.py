@@ -0,0 +1,191 @@
+"""Tests for conversation history persistence."""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from loco.chat import Conversation
+from loco.history import (
+    _read_session_metadata,
+    delete_session,
+    get_session_index_path,
+    list_sessions,
+    load_conversation,
+    save_conversation,
+)
+
+
+class TestSaveLoadConversation:
+    """Tests for saving and loading conversations."""
+
+    def test_round_trip(self):
+        """Test that messages survive a save/load round trip."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.history.get_history_dir", return_value=Path(tmpdir)), \
+                 patch("loco.history.get_rewind_manager", return_value=None):
+                conversation = Conversation(model="test-model")
+                conversation.add_system_message("system")
+                conversation.add_user_message("hello")
+                conversation.add_assistant_message(
+                    tool_calls=[{"id": "call_1", "type": "function",
+                                 "function": {"name": "read", "arguments": "{}"}}],
+                )
+                conversation.add_tool_result("call_1", "read", "contents")
+                save_conversation(conversation, "20240101_000000")
+
+                loaded = load_conversation("20240101_000000")
+                assert loaded is not None
+                assert loaded.model == "test-model"
+                assert loaded.get_messages() == conversation.get_messages()
+
+    def test_save_appends_new_messages(self):
+        """Test that re-saving appends new messages and rewrites after a truncation."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.history.get_history_dir", return_value=Path(tmpdir)), \
+                 patch("loco.history.get_rewind_manager", return_value=None):
+                messages_file = Path(tmpdir) / "20240101_000000" / "messages.jsonl"
+                conversation = Conversation(model="test-model")
+                conversation.add_user_message("one")
+                save_conversation(conversation, "20240101_000000")
+
+                # Mark the saved line; an append leaves it in place
+                messages_file.write_text(messages_file.read_text().replace("one", "ONE"))
+                loaded = load_conversation("20240101_000000")
+                conversation.messages = loaded.messages
+                conversation.add_user_message("two")
+                save_conversation(conversation, "20240101_000000")
+                assert [m.content for m in load_conversation("20240101_000000").messages] == ["ONE", "two"]
+
+                conversation.truncate(1)
+                conversation.add_user_message("three")
+                save_conversation(conversation, "20240101_000000")
+                loaded = load_conversation("20240101_000000")
+                assert [m.content for m in loaded.messages] == ["ONE", "three"]
+                assert len(messages_file.read_text().splitlines()) == 2
+
+    def test_load_single_file_session(self):
+        """Test that sessions saved in the older single-file format still load."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.history.get_history_dir", return_value=Path(tmpdir)):
+                (Path(tmpdir) / "20240101_000000.json").write_text(json.dumps({
+                    "session_id": "20240101_000000",
+                    "model": "test-model",
+                    "messages": [{"role": "user", "content": "hello"}],
+                }))
+
+                loaded = load_conversation("20240101_000000")
+                assert loaded is not None
+                assert loaded.model == "test-model"
+                assert [m.content for m in loaded.messages] == ["hello"]
+
+
+class TestListSessions:
+    """Tests for list_sessions and its metadata index."""
+
+    def test_list_sessions_uses_index(self):
+        """Test that unchanged session files are served from the index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.history.get_history_dir", return_value=Path(tmpdir)), \
+                 patch("loco.history.get_rewind_manager", return_value=None):
+                conversation = Conversation(model="test-model")
+                conversation.add_user_message("hello")
+                save_conversation(conversation, "20240101_000000", "first")
+
+                sessions = list_sessions()
+                assert len(sessions) == 1
+                assert sessions[0]["name"] == "first"
+                assert sessions[0]["message_count"] == 1
+                assert get_session_index_path().exists()
+
+                with patch("loco.history._read_session_metadata") as mock_read:
+                    assert list_sessions() == sessions
+                    mock_read.assert_not_called()
+
+    def test_list_sessions_refreshes_changed_and_deleted(self):
+        """Test that modified files are re-parsed and deleted ones pruned."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            history_dir = Path(tmpdir)
+            with patch("loco.history.get_history_dir", return_value=history_dir), \
+                 patch("loco.history.get_rewind_manager", return_value=None):
+                conversation = Conversation(model="test-model")
+                save_conversation(conversation, "20240101_000000")
+                save_conversation(conversation, "20240102_000000")
+                assert len(list_sessions()) == 2
+
+                conversation.add_user_message("hello")
+                save_conversation(conversation, "20240101_000000")
+                header_file = history_dir / "20240101_000000" / "header.json"
+                st = header_file.stat()
+                os.utime(header_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+                shutil.rmtree(history_dir / "20240102_000000")
+
+                sessions = list_sessions()
+                assert [s["session_id"] for s in sessions] == ["20240101_000000"]
+                assert sessions[0]["message_count"] == 1
+
+                index = json.loads(get_session_index_path().read_text())
+                assert list(index) == ["20240101_000000/header.json"]
+
+    def test_save_and_delete_write_through_index(self):
+        """Test that saving and deleting keep the index current without re-parsing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.history.get_history_dir", return_value=Path(tmpdir)), \
+                 patch("loco.history.get_rewind_manager", return_value=None):
+                conversation = Conversation(model="test-model")
+                conversation.add_user_message("hello")
+                save_conversation(conversation, "20240101_000000", "first")
+                save_conversation(conversation, "20240102_000000", "second")
+
+                with patch("loco.history._read_session_metadata") as mock_read:
+                    sessions = list_sessions()
+                    mock_read.assert_not_called()
+                assert [s["name"] for s in sessions] == ["second", "first"]
+                assert sessions[0]["message_count"] == 1
+
+                assert delete_session("20240102_000000")
+                index = json.loads(get_session_index_path().read_text())
+                assert list(index) == ["20240101_000000/header.json"]
+
+
+class TestReadSessionMetadata:
+    """Tests for extracting listing metadata from session files."""
+
+    def test_reads_header_without_messages(self):
+        """Test that metadata comes from the session header alone."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.history.get_history_dir", return_value=Path(tmpdir)), \
+                 patch("loco.history.get_rewind_manager", return_value=None):
+                conversation = Conversation(model="test-model")
+                conversation.add_user_message("hello")
+                conversation.add_user_message("again")
+                save_conversation(conversation, "20240101_000000", "first")
+
+                session_dir = Path(tmpdir) / "20240101_000000"
+                # Corrupt the messages; the header alone must be enough
+                (session_dir / "messages.jsonl").write_text("garbage")
+
+                metadata = _read_session_metadata(session_dir / "header.json")
+                assert metadata is not None
+                assert metadata["session_id"] == "20240101_000000"
+                assert metadata["name"] == "first"
+                assert metadata["model"] == "test-model"
+                assert metadata["message_count"] == 2
+
+    def test_reads_single_file_sessions(self):
+        """Test that sessions in the older single-file format are counted by parsing messages."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_file = Path(tmpdir) / "20240101_000000.json"
+            session_file.write_text(json.dumps({
+                "session_id": "20240101_000000",
+                "name": None,
+                "model": "test-model",
+                "created_at": "2024-01-01T00:00:00",
+                "messages": [{"role": "user", "content": "hello"}],
+            }, indent=2))
+
+            metadata = _read_session_metadata(session_file)
+            assert metadata is not None
+            assert metadata["message_count"] == 1
@@ -143,6 +143,12 @@ async def test_protocol():
     )
     assert not result.isError
     print("✓ ToolResult works")
+
+    # Server-built tool results must keep ToolResult's serialized shape
+    from loco.mcp.server import _tool_result
+    for built in (_tool_result("output"), _tool_result("Error: boom", is_error=True)):
+        assert ToolResult.model_validate(built).model_dump() == built
+    print("✓ Server tool results match ToolResult")
     
     print("\n✅ MCP Protocol tests passed!\n")
 
@@ -189,6 +195,156 @@ async def test_client_server_integration():
     print("\n✅ MCP Integration tests passed!\n")
 
 
+class FakeMCPClient:
+    """Stand-in for MCPClient that connects without a server process."""
+
+    def __init__(self, tool_names, error=None, hang=False):
+        from loco.mcp.protocol import ToolInfo
+
+        self._tools = {
+            name: ToolInfo(name=name, description=name, inputSchema={"type": "object"})
+            for name in tool_names
+        }
+        self.error = error
+        self.hang = hang
+        self.listed = False
+        self.closed = False
+
+    async def initialize(self):
+        if self.hang:
+            await asyncio.Event().wait()
+        if self.error is not None:
+            raise self.error
+        return {}
+
+    async def list_tools(self):
+        self.listed = True
+        return list(self._tools.values())
+
+    async def close(self):
+        self.closed = True
+
+
+def _connect_fake_clients(clients, **kwargs):
+    """Run load_mcp_clients_async over the given fake clients."""
+    from unittest.mock import patch
+    from loco.config import Config
+    from loco.mcp.loader import load_mcp_clients_async
+
+    with patch("loco.mcp.loader.load_mcp_clients", return_value=clients):
+        return asyncio.run(load_mcp_clients_async(Config(), **kwargs))
+
+
+def test_load_mcp_clients_async_drops_failed_clients():
+    """A server that fails to connect is closed and left out of the result."""
+    broken = FakeMCPClient(["read"], error=RuntimeError("no such command"))
+    working = FakeMCPClient(["read", "write"])
+
+    connected = _connect_fake_clients({"broken": broken, "working": working})
+
+    assert connected == {"working": working}
+    assert broken.closed
+    assert not working.closed
+    # The working server's tools were listed; the broken server's were not
+    assert working.listed
+    assert not broken.listed
+
+
+def test_load_mcp_clients_async_drops_hung_clients():
+    """A server that doesn't answer in time is closed without holding up the others."""
+    hung = FakeMCPClient(["read"], hang=True)
+    working = FakeMCPClient(["write"])
+
+    connected = _connect_fake_clients({"hung": hung, "working": working}, timeout=0.05)
+
+    assert connected == {"working": working}
+    assert hung.closed
+    assert not working.closed
+
+
+def test_process_transport_batch_errors_reach_every_sender():
+    """A failed write of coalesced frames is raised in every send of the batch."""
+
+    class BrokenStdin:
+        def __init__(self):
+            self.written = []
+
+        def write(self, data):
+            self.written.append(data)
+
+        async def drain(self):
+            raise BrokenPipeError("server exited")
+
+    class FakeProcess:
+        stdin = BrokenStdin()
+
+    async def send_batch():
+        transport = ProcessTransport(["unused"])
+        transport._process = FakeProcess()
+        return await asyncio.gather(
+            *(transport.send({"jsonrpc": "2.0", "id": i, "method": "ping"}) for i in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(send_batch())
+
+    assert len(FakeProcess.stdin.written) == 1
+    assert all(isinstance(result, BrokenPipeError) for result in results)
+
+
+def test_server_answers_failed_cached_request_with_error():
+    """A tools/list result that can't be encoded gets an error response, not a crash."""
+    from unittest.mock import patch
+    from loco.tools import Tool, ToolRegistry
+    from loco.mcp.transport import decode_json
+
+    class BadSchemaTool(Tool):
+        name = "bad"
+        description = "Tool whose schema isn't JSON"
+        parameters = {"type": "object", "default": object()}
+
+        def execute(self, **kwargs):
+            return ""
+
+    registry = ToolRegistry()
+    registry.register(BadSchemaTool())
+    server = MCPServer(name="test-loco")
+
+    async def request(request_id, method):
+        frame = json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": {}})
+        return decode_json(await server._handle_frame(frame.encode()))
+
+    async def exchange():
+        return await request(1, "initialize"), await request(2, "tools/list")
+
+    with patch("loco.mcp.server.tool_registry", registry):
+        init_response, list_response = asyncio.run(exchange())
+
+    assert init_response["result"]["serverInfo"]["name"] == "test-loco"
+    assert list_response["id"] == 2
+    assert list_response["error"]["code"] == -32603
+    assert "tools/list" not in server._result_cache
+
+
+def test_run_sync_from_mcp_loop_raises():
+    """Calling run_sync on the MCP loop's own thread fails instead of hanging."""
+    from loco.mcp.loop import run_sync
+
+    async def inner():
+        return "inner"
+
+    async def outer():
+        return run_sync(inner())
+
+    try:
+        run_sync(outer(), timeout=5)
+    except RuntimeError as e:
+        assert "MCP event loop" in str(e)
+    else:
+        raise AssertionError("run_sync did not raise")
+    assert run_sync(inner(), timeout=5) == "inner"
+
+
 async def main():
     """Run all tests."""
     print("=" * 60)
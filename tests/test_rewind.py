@@ -1,8 +1,10 @@
 """Tests for the REWIND feature core functionality."""
 
+import shutil
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -81,7 +83,7 @@ class TestTurnCheckpoint:
     def test_checkpoint_creation(self):
         """Test creating a TurnCheckpoint object."""
         now = datetime.now()
-        checkpoint = TurnCheckpoint(
+        checkpoint = TurnCheckpoint.from_datetime(
             turn_number=1,
             message_index=5,
             timestamp=now,
@@ -102,7 +104,7 @@ class TestTurnCheckpoint:
             content_before=None,
             content_after="content",
         )
-        checkpoint = TurnCheckpoint(
+        checkpoint = TurnCheckpoint.from_datetime(
             turn_number=1,
             message_index=3,
             timestamp=datetime(2025, 1, 1, 12, 0, 0),
@@ -112,9 +114,28 @@ class TestTurnCheckpoint:
         data = checkpoint.to_dict()
         assert data["turn_number"] == 1
         assert data["message_index"] == 3
-        assert "2025-01-01" in data["timestamp"]
+        assert data["timestamp_ns"] == checkpoint.timestamp_ns
         assert len(data["file_changes"]) == 1
         assert data["summary"] == "Test"
+        assert TurnCheckpoint.from_dict(data).timestamp == datetime(2025, 1, 1, 12, 0, 0)
+
+    def test_checkpoint_timestamp_defaults_to_now(self):
+        """Test that a checkpoint without a timestamp records the current time in nanoseconds."""
+        before = datetime.now().replace(microsecond=0)
+        checkpoint = TurnCheckpoint(turn_number=1, message_index=3)
+        assert isinstance(checkpoint.timestamp_ns, int)
+        assert before <= checkpoint.timestamp <= datetime.now()
+
+    def test_checkpoint_without_changes_omits_file_changes(self):
+        """Test that a turn with no file changes round-trips without the list."""
+        checkpoint = TurnCheckpoint.from_datetime(
+            turn_number=1,
+            message_index=3,
+            timestamp=datetime(2025, 1, 1, 12, 0, 0),
+        )
+        data = checkpoint.to_dict()
+        assert "file_changes" not in data
+        assert TurnCheckpoint.from_dict(data).file_changes == []
 
     def test_checkpoint_from_dict(self):
         """Test TurnCheckpoint deserialization."""
@@ -139,6 +160,26 @@ class TestTurnCheckpoint:
         assert len(checkpoint.file_changes) == 1
         assert checkpoint.file_changes[0].change_type == ChangeType.MODIFIED
 
+    def test_checkpoint_file_changes_paths(self):
+        """Test that changed paths are collected once into a frozenset."""
+        checkpoint = TurnCheckpoint.from_datetime(
+            turn_number=1,
+            message_index=3,
+            timestamp=datetime.now(),
+            file_changes=[
+                FileChange("/a.py", ChangeType.MODIFIED, "a", "b"),
+                FileChange("/b.py", ChangeType.CREATED, None, "c"),
+            ],
+        )
+        assert checkpoint.file_changes_paths == frozenset({"/a.py", "/b.py"})
+        assert checkpoint.file_changes_paths is checkpoint.file_changes_paths
+
+
+    def test_file_change_paths_interned(self):
+        """Test that equal paths built separately share one string."""
+        first = FileChange("".join(["/src/", "a.py"]), ChangeType.MODIFIED, "a", "b")
+        second = FileChange("".join(["/src/", "a.py"]), ChangeType.MODIFIED, "b", "c")
+        assert first.path is second.path
 
 class TestRewindState:
     """Tests for RewindState dataclass."""
@@ -396,6 +437,88 @@ class TestRewindManager:
             assert not test_file.exists()  # File should be deleted
             assert manager.state.current_turn == 0
 
+    def test_rewind_restores_many_files(self):
+        """Test that a rewind restores and deletes several files, reporting them in order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = [Path(tmpdir) / f"file{i}.py" for i in range(5)]
+            for path in paths[:3]:
+                path.write_text(f"original {path.name}")
+
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=tmpdir,
+            )
+
+            manager.begin_turn()
+            for path in paths:
+                manager.capture_before(str(path))
+                path.write_text("changed")
+                manager.capture_after(str(path), "changed")
+            manager.end_turn(message_index=2)
+
+            success, restored, _ = manager.rewind_to_turn(0)
+
+            assert success
+            for path in paths[:3]:
+                assert path.read_text() == f"original {path.name}"
+            assert not paths[3].exists() and not paths[4].exists()
+            assert restored == [
+                f"{'Restored' if i < 3 else 'Deleted'}: {path.resolve()}"
+                for i, path in enumerate(paths)
+            ]
+
+    def test_rewind_copies_stored_original(self):
+        """Test that restoring a file's original copies its stored blob."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = Path(tmpdir) / "test.py"
+            test_file.write_text("original\n")
+
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=tmpdir,
+            )
+
+            manager.begin_turn()
+            manager.capture_before(str(test_file))
+            test_file.write_text("turn1\n")
+            manager.capture_after(str(test_file), "turn1\n", ChangeType.MODIFIED)
+            manager.end_turn(message_index=2)
+
+            with patch("loco.rewind.shutil.copyfile", wraps=shutil.copyfile) as mock_copy:
+                success, _, _ = manager.rewind_to_turn(0)
+
+            assert success
+            assert mock_copy.call_count == 1
+            assert test_file.read_text() == "original\n"
+
+    def test_rewind_recreates_missing_directory(self):
+        """Test that a forced rewind restores a file whose directory was removed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sub_dir = Path(tmpdir) / "sub"
+            sub_dir.mkdir()
+            test_file = sub_dir / "test.py"
+            test_file.write_text("original")
+
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=tmpdir,
+            )
+
+            manager.begin_turn()
+            manager.capture_before(str(test_file))
+            test_file.write_text("turn1")
+            manager.capture_after(str(test_file), "turn1", ChangeType.MODIFIED)
+            manager.end_turn(message_index=2)
+
+            test_file.unlink()
+            sub_dir.rmdir()
+
+            success, restored, _ = manager.rewind_to_turn(0, force=True)
+
+            assert success
+            assert test_file.read_text() == "original"
+            assert restored == [f"Restored: {test_file.resolve()}"]
+
     def test_conflict_detection(self):
         """Test detection of external file modifications."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -426,6 +549,112 @@ class TestRewindManager:
             assert conflicts[0].expected_content == "turn1"
             assert conflicts[0].actual_content == "external change"
 
+    def test_no_conflict_for_file_changed_in_several_turns(self):
+        """Test that only a file's latest change is compared with disk."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = (Path(tmpdir) / "test.py").resolve()
+            test_file.write_text("original")
+
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=str(Path(tmpdir).resolve()),
+            )
+
+            for turn, content in enumerate(["turn1", "turn2"], start=1):
+                manager.begin_turn()
+                manager.capture_before(str(test_file))
+                test_file.write_text(content)
+                manager.capture_after(str(test_file), content, ChangeType.MODIFIED)
+                manager.end_turn(message_index=turn * 2)
+
+            assert manager.get_paths_modified_after_turn(0) == frozenset({str(test_file)})
+            assert manager.get_paths_modified_after_turn(2) == frozenset()
+            assert manager.validate_before_rewind(0) == []
+
+    def test_validate_skips_read_of_files_loco_wrote(self):
+        """Test that files unchanged since loco wrote them aren't read to check for conflicts."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = (Path(tmpdir) / "test.py").resolve()
+            test_file.write_text("original")
+
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=str(Path(tmpdir).resolve()),
+            )
+
+            manager.begin_turn()
+            manager.capture_before(str(test_file))
+            test_file.write_text("turn1")
+            manager.capture_after(str(test_file), "turn1", ChangeType.MODIFIED)
+            manager.end_turn(message_index=2)
+
+            with patch("loco.rewind.read_file_safe") as mock_read:
+                assert manager.validate_before_rewind(0) == []
+                mock_read.assert_not_called()
+
+            test_file.write_text("edited by hand")
+            conflicts = manager.validate_before_rewind(0)
+            assert [c.actual_content for c in conflicts] == ["edited by hand"]
+
+    def test_paths_resolved_once_per_turn(self):
+        """Test that a path captured repeatedly in a turn is resolved once, and again next turn."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = Path(tmpdir) / "test.py"
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=tmpdir,
+            )
+
+            with patch("loco.rewind.Path.resolve", autospec=True, side_effect=Path.resolve) as mock_resolve:
+                manager.begin_turn()
+                manager.capture_before(str(test_file))
+                manager.capture_after(str(test_file), "one")
+                manager.capture_before(str(test_file))
+                manager.capture_after(str(test_file), "two")
+                checkpoint = manager.end_turn(message_index=2)
+                assert mock_resolve.call_count == 1
+
+                manager.begin_turn()
+                manager.capture_before(str(test_file))
+                manager.end_turn(message_index=4)
+                assert mock_resolve.call_count == 2
+
+            assert checkpoint.file_changes[0].path == str(test_file.resolve())
+            assert checkpoint.file_changes[0].content_after == "two"
+
+    def test_capture_before_skips_read_of_unchanged_file(self):
+        """Test that a file loco last wrote is not re-read unless it changed since."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = (Path(tmpdir) / "test.py").resolve()
+            test_file.write_text("original")
+
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=str(Path(tmpdir).resolve()),
+            )
+
+            manager.begin_turn()
+            manager.capture_before(str(test_file))
+            test_file.write_text("turn1")
+            manager.capture_after(str(test_file), "turn1", ChangeType.MODIFIED)
+            manager.end_turn(message_index=2)
+
+            with patch("loco.rewind.read_file_safe") as mock_read:
+                manager.begin_turn()
+                manager.capture_before(str(test_file))
+                mock_read.assert_not_called()
+                test_file.write_text("turn2")
+                manager.capture_after(str(test_file), "turn2", ChangeType.MODIFIED)
+                checkpoint = manager.end_turn(message_index=4)
+            assert checkpoint.file_changes[0].content_before == "turn1"
+
+            # Changed outside loco: the fingerprint no longer matches
+            test_file.write_text("edited by hand")
+            manager.begin_turn()
+            manager.capture_before(str(test_file))
+            checkpoint = manager.end_turn(message_index=6)
+            assert checkpoint.file_changes[0].content_before == "edited by hand"
+
     def test_get_message_index_for_turn(self):
         """Test getting message index for a specific turn."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -444,6 +673,36 @@ class TestRewindManager:
             assert manager.get_message_index_for_turn(2) == 7
             assert manager.get_message_index_for_turn(3) is None
 
+    def test_turn_lookups_follow_rewind(self):
+        """Test that turn lookups reflect checkpoints added and dropped by a rewind."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = Path(tmpdir) / "test.py"
+            manager = RewindManager.initialize(
+                session_id="test_session",
+                working_directory=tmpdir,
+            )
+
+            for turn in range(1, 4):
+                manager.begin_turn()
+                manager.capture_before(str(test_file))
+                test_file.write_text(f"turn{turn}")
+                manager.capture_after(str(test_file), f"turn{turn}")
+                manager.end_turn(message_index=turn * 2, summary=f"Turn {turn}")
+                assert manager.get_turn_summary(turn) == f"Turn {turn}"
+
+            after = manager.get_files_modified_after_turn(1)
+            assert [change.content_after for change in after] == ["turn2", "turn3"]
+
+            success, _, _ = manager.rewind_to_turn(1)
+            assert success
+            assert manager.get_message_index_for_turn(2) is None
+            assert manager.get_files_modified_after_turn(1) == []
+
+            manager.begin_turn()
+            manager.end_turn(message_index=9, summary="Turn 2 again")
+            assert manager.get_turn_summary(2) == "Turn 2 again"
+            assert manager.get_message_index_for_turn(2) == 9
+
 
 class TestGlobalRewindManager:
     """Tests for global rewind manager functions."""
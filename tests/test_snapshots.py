@@ -1,5 +1,6 @@
 """Tests for snapshot storage functionality."""
 
+import hashlib
 import tempfile
 from datetime import datetime
 from pathlib import Path
@@ -7,7 +8,7 @@ from unittest.mock import patch
 
 import pytest
 
-from loco.snapshots import SnapshotStorage, hash_path, get_sessions_dir
+from loco.snapshots import SnapshotStorage, apply_delta, hash_path, get_sessions_dir
 from loco.rewind import (
     ChangeType,
     FileChange,
@@ -120,7 +121,7 @@ class TestSnapshotStorage:
                 storage.save_original(test_path, "original content")
 
                 # Create checkpoint with changes
-                checkpoint = TurnCheckpoint(
+                checkpoint = TurnCheckpoint.from_datetime(
                     turn_number=1,
                     message_index=5,
                     timestamp=datetime(2025, 1, 15, 10, 30, 0),
@@ -160,7 +161,7 @@ class TestSnapshotStorage:
                 storage.save_original("/test2.py", None)
 
                 # Save a turn
-                checkpoint = TurnCheckpoint(
+                checkpoint = TurnCheckpoint.from_datetime(
                     turn_number=1,
                     message_index=3,
                     timestamp=datetime.now(),
@@ -191,6 +192,28 @@ class TestSnapshotStorage:
                 assert loaded.current_turn == 1
                 assert len(loaded.checkpoints) == 1
 
+    def test_unchanged_rewind_state_not_rewritten(self):
+        """Test that saving an unchanged rewind state skips the write."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+                state = RewindState(
+                    session_id="test_session",
+                    working_directory="/test/dir",
+                    originals={"/test1.py": "content1"},
+                )
+                rewind_file = storage.session_dir / "rewind.json"
+
+                storage.save_rewind_state(state)
+                rewind_file.write_text("marker")
+                storage.save_rewind_state(state)
+                assert rewind_file.read_text() == "marker"
+
+                state.current_turn = 1
+                storage.save_rewind_state(state)
+                assert storage.load_rewind_state().current_turn == 1
+
     def test_load_nonexistent_turn(self):
         """Test loading a turn that doesn't exist."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -202,6 +225,22 @@ class TestSnapshotStorage:
                 loaded = storage.load_turn(999)
                 assert loaded is None
 
+    def test_load_corrupt_metadata(self):
+        """Test that unreadable rewind state and manifests load as missing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+                storage.ensure_dirs()
+
+                (storage.session_dir / "rewind.json").write_bytes(b"\xff\xfe{")
+                turn_dir = storage.turns_dir / "turn-001"
+                turn_dir.mkdir()
+                (turn_dir / "manifest.json").write_bytes(b'{"turn_number": 1')
+
+                assert storage.load_rewind_state() is None
+                assert storage.load_turn(1) is None
+
     def test_load_nonexistent_original(self):
         """Test loading an original that wasn't saved."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -233,6 +272,54 @@ class TestSnapshotStorage:
                 assert not storage.snapshots_dir.exists()
                 assert storage.session_dir.exists()  # Session dir should remain
 
+    def test_save_after_cleanup(self):
+        """Test that saving after a cleanup writes the directories and blobs again."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+
+                storage.save_original("/test.py", "content")
+                meta_file = storage.originals_dir / f"{hash_path('/test.py')}.meta"
+                mtime = meta_file.stat().st_mtime_ns
+                # Saving the same original again doesn't rewrite it
+                storage.save_original("/test.py", "content")
+                assert meta_file.stat().st_mtime_ns == mtime
+
+                storage.cleanup()
+                storage.save_original("/test.py", "content")
+                assert SnapshotStorage("test_session").load_original("/test.py") == (True, "content")
+
+    def test_turn_saved_after_cleanup_loads(self):
+        """Test that a turn saved after a cleanup doesn't build on removed turns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+
+                original = "".join(f"line {i}\n" for i in range(50))
+                turn1 = original.replace("line 0\n", "first\n")
+                turn2 = turn1.replace("line 49\n", "last\n")
+
+                def checkpoint(turn: int, before: str, after: str) -> TurnCheckpoint:
+                    return TurnCheckpoint.from_datetime(
+                        turn_number=turn,
+                        message_index=turn,
+                        timestamp=datetime.now(),
+                        file_changes=[FileChange("/test.py", ChangeType.MODIFIED, before, after)],
+                    )
+
+                storage.save_original("/test.py", original)
+                storage.save_turn(checkpoint(1, original, turn1))
+                storage.cleanup()
+                storage.save_turn(checkpoint(2, turn1, turn2))
+
+                fresh = SnapshotStorage("test_session")
+                assert fresh.load_turn(2).file_changes[0].content_after == turn2
+                # Nothing is served from memory for the removed turn
+                assert storage.load_turn(1) is None
+                assert storage._load_turn_content(1, "/test.py", hash_path("/test.py")) == (None, 0)
+
     def test_cleanup_full(self):
         """Test full cleanup removes entire session directory."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -296,7 +383,7 @@ class TestSnapshotStorage:
 
                 # Save some turns
                 for i in [1, 3, 5]:
-                    checkpoint = TurnCheckpoint(
+                    checkpoint = TurnCheckpoint.from_datetime(
                         turn_number=i,
                         message_index=i * 2,
                         timestamp=datetime.now(),
@@ -319,7 +406,7 @@ class TestSnapshotStorage:
                 storage.save_original("/test.py", "original content")
 
                 # Create checkpoint with deletion
-                checkpoint = TurnCheckpoint(
+                checkpoint = TurnCheckpoint.from_datetime(
                     turn_number=1,
                     message_index=2,
                     timestamp=datetime.now(),
@@ -359,7 +446,7 @@ class TestMultipleTurns:
                 storage.save_original("/test.py", "original")
 
                 # Turn 1
-                checkpoint1 = TurnCheckpoint(
+                checkpoint1 = TurnCheckpoint.from_datetime(
                     turn_number=1,
                     message_index=2,
                     timestamp=datetime.now(),
@@ -375,7 +462,7 @@ class TestMultipleTurns:
                 storage.save_turn(checkpoint1)
 
                 # Turn 2
-                checkpoint2 = TurnCheckpoint(
+                checkpoint2 = TurnCheckpoint.from_datetime(
                     turn_number=2,
                     message_index=4,
                     timestamp=datetime.now(),
@@ -397,6 +484,169 @@ class TestMultipleTurns:
                 assert loaded1.file_changes[0].content_after == "version1"
                 assert loaded2.file_changes[0].content_after == "version2"
 
+    def test_turns_stored_as_deltas(self):
+        """Test that later turns store deltas and reconstruct from a fresh storage."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+
+                lines = [f"line {i}\n" for i in range(200)]
+                versions = ["".join(lines)]
+                storage.save_original("/test.py", versions[0])
+
+                for turn in range(1, 13):
+                    lines[turn] = f"changed in turn {turn}\n"
+                    versions.append("".join(lines))
+                    storage.save_turn(TurnCheckpoint.from_datetime(
+                        turn_number=turn,
+                        message_index=turn * 2,
+                        timestamp=datetime.now(),
+                        file_changes=[
+                            FileChange(
+                                path="/test.py",
+                                change_type=ChangeType.MODIFIED,
+                                content_before=versions[turn - 1],
+                                content_after=versions[turn],
+                            )
+                        ],
+                    ))
+
+                path_hash = hash_path("/test.py")
+                assert (storage.turns_dir / "turn-001" / f"{path_hash}.delta").exists()
+                assert not (storage.turns_dir / "turn-001" / f"{path_hash}.ref").exists()
+                # Chains are capped, so a full snapshot appears periodically
+                assert any(
+                    (storage.turns_dir / f"turn-{turn:03d}" / f"{path_hash}.ref").exists()
+                    for turn in range(1, 13)
+                )
+
+                fresh = SnapshotStorage("test_session")
+                with patch("loco.snapshots.apply_delta", wraps=apply_delta) as mock_apply:
+                    for turn in range(1, 13):
+                        loaded = fresh.load_turn(turn)
+                        assert loaded.file_changes[0].content_after == versions[turn]
+                # Each delta is applied once; chains aren't replayed per turn
+                assert mock_apply.call_count <= 12
+
+    def test_identical_contents_stored_once(self):
+        """Test that the same content is stored as one blob wherever it appears."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+
+                original = "x" * 100
+                storage.save_original("/a.py", original)
+                storage.save_original("/b.py", original)
+
+                # Unrelated content each turn, so no deltas; turn 2 restores the original
+                for turn, content in enumerate(["y" * 100, original], start=1):
+                    storage.save_turn(TurnCheckpoint.from_datetime(
+                        turn_number=turn,
+                        message_index=turn,
+                        timestamp=datetime.now(),
+                        file_changes=[
+                            FileChange(
+                                path="/a.py",
+                                change_type=ChangeType.MODIFIED,
+                                content_before=None,
+                                content_after=content,
+                            )
+                        ],
+                    ))
+                storage.save_rewind_state(RewindState(
+                    session_id="test_session",
+                    working_directory="/",
+                    originals={"/a.py": original, "/b.py": original},
+                ))
+
+                assert len(list(storage.blobs_dir.iterdir())) == 2
+
+                fresh = SnapshotStorage("test_session")
+                assert fresh.load_original("/b.py") == (True, original)
+                assert fresh.load_turn(2).file_changes[0].content_after == original
+                assert fresh.load_rewind_state().originals == {"/a.py": original, "/b.py": original}
+
+
+    def test_resaved_turn_replaces_earlier_form(self):
+        """Test that only re-saving an existing turn removes its earlier files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+
+                original = "".join(f"line {i}\n" for i in range(50))
+                storage.save_original("/test.py", original)
+
+                def checkpoint(content: str) -> TurnCheckpoint:
+                    return TurnCheckpoint.from_datetime(
+                        turn_number=1,
+                        message_index=1,
+                        timestamp=datetime.now(),
+                        file_changes=[FileChange("/test.py", ChangeType.MODIFIED, original, content)],
+                    )
+
+                # A new turn directory: nothing to clean up
+                edited = original.replace("line 0\n", "first\n")
+                with patch("loco.snapshots.Path.unlink") as mock_unlink:
+                    storage.save_turn(checkpoint(edited))
+                    mock_unlink.assert_not_called()
+                turn_dir = storage.turns_dir / "turn-001"
+                path_hash = hash_path("/test.py")
+                assert (turn_dir / f"{path_hash}.delta").exists()
+
+                # Saved again in full, the delta is dropped
+                storage.save_turn(checkpoint("unrelated\n"))
+                assert (turn_dir / f"{path_hash}.ref").exists()
+                assert not (turn_dir / f"{path_hash}.delta").exists()
+                fresh = SnapshotStorage("test_session")
+                assert fresh.load_turn(1).file_changes[0].content_after == "unrelated\n"
+
+    def test_files_named_with_legacy_path_hash_still_load(self):
+        """Test that originals and delta bases stored under SHA-256 path hashes are found."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("loco.snapshots.get_sessions_dir") as mock_dir:
+                mock_dir.return_value = Path(tmpdir)
+                storage = SnapshotStorage("test_session")
+
+                lines = [f"line {i}\n" for i in range(50)]
+                original = "".join(lines)
+                storage.save_original("/test.py", original)
+
+                def change(turn: int, content: str) -> TurnCheckpoint:
+                    return TurnCheckpoint.from_datetime(
+                        turn_number=turn,
+                        message_index=turn,
+                        timestamp=datetime.now(),
+                        file_changes=[FileChange("/test.py", ChangeType.MODIFIED, None, content)],
+                    )
+
+                # Turn 1 is stored, then renamed as an older version would have
+                turn1 = original.replace("line 0\n", "first\n")
+                storage.save_turn(change(1, turn1))
+                new_hash = hash_path("/test.py")
+                legacy_hash = hashlib.sha256(b"/test.py").hexdigest()[:16]
+                (storage.originals_dir / f"{new_hash}.meta").rename(
+                    storage.originals_dir / f"{legacy_hash}.meta"
+                )
+                turn_dir = storage.turns_dir / "turn-001"
+                for stored in turn_dir.glob(f"{new_hash}.*"):
+                    stored.rename(turn_dir / f"{legacy_hash}{stored.suffix}")
+                manifest = turn_dir / "manifest.json"
+                manifest.write_text(manifest.read_text().replace(new_hash, legacy_hash))
+
+                resumed = SnapshotStorage("test_session")
+                assert resumed.load_original("/test.py") == (True, original)
+                assert resumed.load_turn(1).file_changes[0].content_after == turn1
+
+                # Turn 2 is a delta whose base is the legacy-named turn 1
+                turn2 = turn1.replace("line 49\n", "last\n")
+                resumed.save_turn(change(2, turn2))
+                assert (storage.turns_dir / "turn-002" / f"{new_hash}.delta").exists()
+                fresh = SnapshotStorage("test_session")
+                assert fresh.load_turn(2).file_changes[0].content_after == turn2
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
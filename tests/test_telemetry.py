@@ -111,6 +111,48 @@ class TestCostProfile:
         assert len(duplicates) == 1
         assert duplicates[0] == ("src/main.py", 2)
 
+    def test_compute_aggregates(self):
+        profile = CostProfile(
+            session_id="test123",
+            start_time=datetime.now(),
+        )
+
+        profile.add_call(TrackedCall(
+            timestamp=datetime.now(),
+            model="claude-3-sonnet",
+            operation_type=OperationType.SEARCH_GREP,
+            input_tokens=100,
+            output_tokens=50,
+            cache_read_tokens=0,
+            cache_write_tokens=0,
+            cost=0.001,
+        ))
+        profile.record_file_read("src/main.py")
+        profile.record_file_read("src/main.py")
+
+        op_costs, agent_costs, duplicates = profile.compute_aggregates()
+        assert op_costs == profile.cost_by_operation()
+        assert agent_costs == profile.cost_by_agent()
+        assert duplicates == profile.duplicate_file_reads()
+
+        # Cached until new data arrives
+        assert profile.compute_aggregates() is profile.compute_aggregates()
+
+        profile.add_call(TrackedCall(
+            timestamp=datetime.now(),
+            model="claude-3-sonnet",
+            operation_type=OperationType.READ_FILE,
+            input_tokens=200,
+            output_tokens=100,
+            cache_read_tokens=0,
+            cache_write_tokens=0,
+            cost=0.002,
+            agent_name="explore",
+        ))
+        op_costs, agent_costs, _ = profile.compute_aggregates()
+        assert op_costs["read:file"] == 0.002
+        assert agent_costs == {"explore": 0.002, "main": 0.001}
+
 
 class TestCostTracker:
     def test_singleton(self):